@@ -0,0 +1,71 @@
+"""Benchmark of CSV point bounds: geopandas vs. the chunked reader.
+
+Usage:
+
+    python benchmarks/csv_bounds.py --rows 2000000
+
+Writes a synthetic CSV of random longitude/latitude points to a temporary directory and reports time and peak Python memory (tracemalloc) of building every geometry with geopandas versus `get_csv_bounds()`. Requires `landfire[geospatial]`.
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from landfire.geospatial import get_csv_bounds
+
+
+def write_points(path: Path, rows: int) -> None:
+    """Write a CSV of random points with an id and a name column."""
+    rng = np.random.default_rng(0)
+    pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "name": [f"plot {i}" for i in range(rows)],
+            "longitude": rng.uniform(-124, -67, rows).round(6),
+            "latitude": rng.uniform(25, 49, rows).round(6),
+        }
+    ).to_csv(path, index=False)
+
+
+def geopandas_bounds(path: Path) -> object:
+    """Bounds of the points as geometries."""
+    df = pd.read_csv(path)
+    gdf = gpd.GeoDataFrame(
+        df, geometry=gpd.points_from_xy(df.longitude, df.latitude), crs=4326
+    )
+    return gdf.total_bounds
+
+
+def main() -> None:
+    """Run the benchmark."""
+    # Reuse the timing helper of the GeoJSON benchmark
+    from geojson_bounds import measure
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=250_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "plots.csv"
+        write_points(path, args.rows)
+        size = path.stat().st_size / 1e6
+        print(f"{path.name}: {args.rows} rows, {size:.1f} MB")
+
+        methods = {
+            "geopandas": lambda: geopandas_bounds(path),
+            "chunked": lambda: get_csv_bounds(str(path), chunk_rows=args.chunk_rows),
+        }
+        for name, func in methods.items():
+            seconds, peak = measure(func)
+            print(
+                f"{name:>10}: {seconds:6.2f} s {size / seconds:7.1f} MB/s"
+                f" peak {peak:7.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
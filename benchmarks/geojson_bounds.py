@@ -0,0 +1,85 @@
+"""Throughput benchmark of GeoJSON bounds: geopandas vs. the streaming reader.
+
+Usage:
+
+    python benchmarks/geojson_bounds.py --features 200000
+
+Writes a synthetic feature collection of random polygons to a temporary directory and reports time, throughput and peak Python memory (tracemalloc, which includes NumPy buffers but not GDAL allocations) of each method. Requires `landfire[geospatial]`.
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+import geopandas as gpd
+
+from landfire.geospatial import get_geojson_bounds
+
+
+def write_feature_collection(path: Path, features: int, vertices: int) -> None:
+    """Write a feature collection of random polygons, one feature at a time."""
+    rng = random.Random(0)  # noqa: S311
+    with open(path, "w", encoding="utf-8") as fd:
+        fd.write('{"type": "FeatureCollection", "features": [\n')
+        for i in range(features):
+            x, y = rng.uniform(-124, -67), rng.uniform(25, 49)
+            ring = [
+                [round(x + rng.uniform(0, 0.1), 8), round(y + rng.uniform(0, 0.1), 8)]
+                for _ in range(vertices)
+            ]
+            ring.append(ring[0])
+            feature = {
+                "type": "Feature",
+                "properties": {"id": i, "name": f"perimeter {i}"},
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+            fd.write(("," if i else "") + json.dumps(feature) + "\n")
+        fd.write("]}\n")
+
+
+def measure(func: Callable[[], object]) -> Tuple[float, float]:
+    """Run func twice, returning seconds taken and peak traced memory in MB.
+
+    Memory is traced in a separate run since tracing slows down Python code considerably.
+    """
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--features", type=int, default=50_000)
+    parser.add_argument("--vertices", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "perimeters.geojson"
+        write_feature_collection(path, args.features, args.vertices)
+        size = path.stat().st_size / 1e6
+        print(f"{path.name}: {args.features} features, {size:.1f} MB")
+
+        methods = {
+            "geopandas": lambda: gpd.read_file(path).to_crs(4326).total_bounds,
+            "streaming": lambda: get_geojson_bounds(str(path)),
+        }
+        for name, func in methods.items():
+            seconds, peak = measure(func)
+            print(
+                f"{name:>10}: {seconds:6.2f} s {size / seconds:7.1f} MB/s"
+                f" peak {peak:7.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -149,7 +149,7 @@ def safety(session: Session) -> None:
 def mypy(session: Session) -> None:
     """Type-check using mypy."""
     args = session.posargs or ["src", "tests", "docs/conf.py"]
-    session.install(".[geospatial]")
+    session.install(".[geospatial,raster]")
     session.install("mypy", "pytest", "types-requests")
     session.run("mypy", *args)
     if not session.posargs:
@@ -159,7 +159,7 @@ def mypy(session: Session) -> None:
 @session(python=python_versions)
 def tests(session: Session) -> None:
     """Run the test suite."""
-    session.install(".[geospatial]")
+    session.install(".[geospatial,raster]")
     session.install("coverage[toml]", "pytest", "pygments")
     try:
         session.run("coverage", "run", "--parallel", "-m", "pytest", *session.posargs)
@@ -184,7 +184,7 @@ def coverage(session: Session) -> None:
 @session(python=python_versions[0])
 def typeguard(session: Session) -> None:
     """Runtime type checking using Typeguard."""
-    session.install(".[geospatial]")
+    session.install(".[geospatial,raster]")
     session.install("pytest", "typeguard", "pygments")
     session.run("pytest", f"--typeguard-packages={package}", *session.posargs)
 
@@ -211,7 +211,7 @@ def docs_build(session: Session) -> None:
     if not session.posargs and "FORCE_COLOR" in os.environ:
         args.insert(0, "--color")
 
-    session.install(".[geospatial]")
+    session.install(".[geospatial,raster]")
     session.install(
         "sphinx",
         "sphinx-autobuild",
@@ -232,7 +232,7 @@ def docs_build(session: Session) -> None:
 def docs(session: Session) -> None:
     """Build and serve the documentation with live reloading on file changes."""
     args = session.posargs or ["--open-browser", "docs", "docs/_build"]
-    session.install(".[geospatial]")
+    session.install(".[geospatial,raster]")
     session.install(
         "sphinx",
         "sphinx-autobuild",
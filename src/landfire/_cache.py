@@ -0,0 +1,161 @@
+"""On-disk cache for LANDFIRE service metadata with HTTP conditional revalidation."""
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import requests
+
+
+# Environment variable overriding the default cache directory
+CACHE_DIR_ENV = "LANDFIRE_CACHE_DIR"
+
+# Seconds after which a lock file is considered left behind by a crashed process
+LOCK_STALE_AFTER = 60.0
+
+
+def get_cache_dir(cache_dir: Optional[str] = None) -> Path:
+    """Resolve the directory used to cache LANDFIRE metadata.
+
+    Args:
+        cache_dir: Explicit cache directory. If not provided, `$LANDFIRE_CACHE_DIR` is used, falling back to `$XDG_CACHE_HOME/landfire` or `~/.cache/landfire`.
+
+    Returns:
+        Cache directory as a Path object. It is created if it doesn't exist.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is None:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+        path = Path(xdg_cache) / "landfire"
+    else:
+        path = Path(cache_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _meta_path(path: Path) -> Path:
+    """Path of the validator metadata stored next to a cached payload."""
+    return path.with_name(path.name + ".meta")
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Atomically write JSON to path.
+
+    Every writer uses its own temporary file, so concurrent writers never interleave and the last replace wins.
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as fd:
+        json.dump(data, fd, separators=(",", ":"))
+    os.replace(fd.name, path)
+
+
+@contextmanager
+def _file_lock(path: Path, timeout: float = 30.0) -> Iterator[None]:
+    """Hold an exclusive lock between processes, using a lock file next to path.
+
+    The lock file is created exclusively, which is atomic on local file systems on every platform. Lock files older than `LOCK_STALE_AFTER` seconds are taken over.
+
+    Args:
+        path: File to lock. The lock file is `<path>.lock`.
+        timeout: Seconds to wait for the lock.
+
+    Raises:
+        RuntimeError: If the lock can't be acquired within timeout.
+    """
+    lock = path.with_name(path.name + ".lock")
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime > LOCK_STALE_AFTER:
+                    lock.unlink()
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise RuntimeError(
+                    f"Timed out waiting for {lock}. Remove it if no other process is using the cache."
+                )
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        lock.unlink(missing_ok=True)
+
+
+def _read_json(path: Path) -> Any:
+    """Read JSON from path, returning None if missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as fd:
+            return json.load(fd)
+    except (OSError, ValueError):
+        return None
+
+
+def fetch_cached_json(
+    url: str,
+    path: Path,
+    *,
+    ttl: float,
+    params: Optional[Dict[str, Any]] = None,
+    transform: Optional[Callable[[Any], Any]] = None,
+    timeout: float = 60,
+) -> Any:
+    """Fetch a JSON document through an on-disk cache.
+
+    While the cached copy is younger than `ttl` seconds no request is made at all. Once it is stale the document is revalidated with `If-None-Match`/`If-Modified-Since` using the validators from the last response, so an unchanged document only costs a `304 Not Modified`.
+
+    Args:
+        url: URL of the JSON document.
+        path: File to keep the (transformed) document in.
+        ttl: Seconds a cached copy is used without revalidation.
+        params: Request query parameters.
+        transform: Optional function applied to a freshly downloaded document before it is cached. The cached value is the transformed one.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        The cached or freshly downloaded (and transformed) document.
+    """
+    meta_path = _meta_path(path)
+    meta: Dict[str, Any] = _read_json(meta_path) or {}
+    cached = _read_json(path) if meta.get("url") == url else None
+
+    if cached is not None and time.time() - meta.get("fetched_at", 0) < ttl:
+        return cached
+
+    headers = {}
+    if cached is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    resp = requests.get(url=url, params=params, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and cached is not None:
+        meta["fetched_at"] = time.time()
+        _write_json(meta_path, meta)
+        return cached
+    resp.raise_for_status()
+
+    data = resp.json()
+    if transform is not None:
+        data = transform(data)
+    _write_json(path, data)
+    _write_json(
+        meta_path,
+        {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        },
+    )
+    return data
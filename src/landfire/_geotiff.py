@@ -0,0 +1,149 @@
+"""Minimal GeoTIFF header reader for raster extents.
+
+Only the first image file directory (IFD) and the GeoKey directory are read, so the cost is the same for a tiny raster and a multi-GB mosaic. Both classic TIFF and BigTIFF in either byte order are supported.
+"""
+import struct
+from typing import BinaryIO, Dict, Optional, Tuple
+
+
+# TIFF field type -> (struct format, item size in bytes) for the numeric types used by GeoTIFF tags
+_TYPES = {
+    1: ("B", 1),
+    3: ("H", 2),
+    4: ("I", 4),
+    8: ("h", 2),
+    9: ("i", 4),
+    11: ("f", 4),
+    12: ("d", 8),
+    16: ("Q", 8),
+    17: ("q", 8),
+}
+
+# TIFF tags
+IMAGE_WIDTH = 256
+IMAGE_LENGTH = 257
+MODEL_PIXEL_SCALE = 33550
+MODEL_TIEPOINT = 33922
+MODEL_TRANSFORMATION = 34264
+GEO_KEY_DIRECTORY = 34735
+_TAGS = (
+    IMAGE_WIDTH,
+    IMAGE_LENGTH,
+    MODEL_PIXEL_SCALE,
+    MODEL_TIEPOINT,
+    MODEL_TRANSFORMATION,
+    GEO_KEY_DIRECTORY,
+)
+
+# GeoKeys
+GT_RASTER_TYPE = 1025
+GEOGRAPHIC_TYPE = 2048
+PROJECTED_CS_TYPE = 3072
+RASTER_PIXEL_IS_POINT = 2
+USER_DEFINED = 32767
+
+
+def _read_ifd(
+    fd: BinaryIO, order: str, bigtiff: bool, offset: int
+) -> Dict[int, Tuple[float, ...]]:
+    """Read the GeoTIFF related tags of the IFD at offset."""
+    fd.seek(offset)
+    if bigtiff:
+        (count,) = struct.unpack(order + "Q", fd.read(8))
+        entry_format, entry_size = order + "HHQ8s", 20
+    else:
+        (count,) = struct.unpack(order + "H", fd.read(2))
+        entry_format, entry_size = order + "HHI4s", 12
+    entries = fd.read(count * entry_size)
+
+    tags = {}
+    for k in range(count):
+        tag, field_type, n, value = struct.unpack_from(
+            entry_format, entries, k * entry_size
+        )
+        if tag not in _TAGS or field_type not in _TYPES:
+            continue
+        item_format, item_size = _TYPES[field_type]
+        size = n * item_size
+        if size > len(value):
+            # Values that don't fit in the entry are stored at an offset
+            (value_offset,) = struct.unpack(order + ("Q" if bigtiff else "I"), value)
+            fd.seek(value_offset)
+            value = fd.read(size)
+        tags[tag] = struct.unpack(f"{order}{n}{item_format}", value[:size])
+    return tags
+
+
+def _read_geokeys(directory: Tuple[float, ...]) -> Dict[int, int]:
+    """Get the SHORT valued keys of a GeoKey directory."""
+    keys = {}
+    count = int(directory[3])
+    for k in range(1, count + 1):
+        key, location, _, value = directory[4 * k : 4 * k + 4]
+        if location == 0:
+            keys[int(key)] = int(value)
+    return keys
+
+
+def _get_affine(
+    tags: Dict[int, Tuple[float, ...]]
+) -> Optional[Tuple[float, float, float, float, float, float]]:
+    """Get the pixel to model transform `x = a*i + b*j + c, y = d*i + e*j + f`."""
+    if MODEL_TRANSFORMATION in tags:
+        m = tags[MODEL_TRANSFORMATION]
+        return m[0], m[1], m[3], m[4], m[5], m[7]
+    if MODEL_PIXEL_SCALE in tags and MODEL_TIEPOINT in tags:
+        scale_x, scale_y = tags[MODEL_PIXEL_SCALE][:2]
+        i, j, _, x, y, _ = tags[MODEL_TIEPOINT][:6]
+        return scale_x, 0.0, x - i * scale_x, 0.0, -scale_y, y + j * scale_y
+    return None
+
+
+def read_geotiff_extent(
+    path: str,
+) -> Optional[Tuple[Tuple[float, float, float, float], str]]:
+    """Read the extent and CRS of a GeoTIFF from its header.
+
+    Args:
+        path: Path to a GeoTIFF file.
+
+    Returns:
+        Bounds `(min_x, min_y, max_x, max_y)` and CRS (`EPSG:<code>`), or None if the file isn't a GeoTIFF this reader understands (i.e. a user defined CRS or missing tags), in which case a full GeoTIFF implementation such as rasterio is needed.
+    """
+    try:
+        with open(path, "rb") as fd:
+            header = fd.read(16)
+            order = {b"II": "<", b"MM": ">"}.get(header[:2])
+            if order is None:
+                return None
+            (magic,) = struct.unpack(order + "H", header[2:4])
+            if magic == 42:
+                (offset,) = struct.unpack(order + "I", header[4:8])
+            elif magic == 43:
+                (offset,) = struct.unpack(order + "Q", header[8:16])
+            else:
+                return None
+            tags = _read_ifd(fd, order, magic == 43, offset)
+    except struct.error:
+        return None
+
+    affine = _get_affine(tags)
+    if affine is None or any(
+        tag not in tags for tag in (IMAGE_WIDTH, IMAGE_LENGTH, GEO_KEY_DIRECTORY)
+    ):
+        return None
+    keys = _read_geokeys(tags[GEO_KEY_DIRECTORY])
+    epsg = keys.get(PROJECTED_CS_TYPE) or keys.get(GEOGRAPHIC_TYPE)
+    if not epsg or epsg == USER_DEFINED:
+        return None
+
+    width, height = tags[IMAGE_WIDTH][0], tags[IMAGE_LENGTH][0]
+    # Model coordinates of point rasters refer to pixel centers
+    shift = 0.5 if keys.get(GT_RASTER_TYPE) == RASTER_PIXEL_IS_POINT else 0.0
+    a, b, c, d, e, f = affine
+    xs = []
+    ys = []
+    for i, j in ((0, 0), (width, 0), (0, height), (width, height)):
+        xs.append(a * (i - shift) + b * (j - shift) + c)
+        ys.append(d * (i - shift) + e * (j - shift) + f)
+    return (min(xs), min(ys), max(xs), max(ys)), f"EPSG:{epsg}"
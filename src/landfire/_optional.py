@@ -0,0 +1,27 @@
+"""Helpers for importing optional dependencies on demand."""
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+def import_optional(name: str, extra: Optional[str] = "geospatial") -> ModuleType:
+    """Import an optional dependency, failing with an installation hint if it is missing.
+
+    Args:
+        name: Fully qualified module name to import.
+        extra: Name of the `landfire` extra that provides the dependency. If None, the module itself is suggested for installation.
+
+    Returns:
+        The imported module.
+
+    Raises:
+        RuntimeError: If the module cannot be imported.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError as exc:
+        package = exc.name if extra is None else f"landfire[{extra}]"
+        raise RuntimeError(
+            f"Failed to import `{exc.name}`. "
+            f"Please install `{package}` in order to use this functionality."
+        )
@@ -0,0 +1,404 @@
+"""Batch requests of many areas of interest with a pipelined, bounded job queue.
+
+`request_many()` runs every request spec through three stages, each with its own worker pool:
+
+1. submit: validate the spec and submit a job,
+2. poll: check the status of submitted jobs with a per-job linear backoff, retrying status checks that fail with a network error,
+3. download: fetch the finished zip file.
+
+At most `max_in_flight` jobs are between submission and the end of their download at any time and specs are only read from the input iterable when a slot frees up, so thousands of specs run in constant memory. Results are yielded as soon as each job finishes, in completion order.
+"""
+import heapq
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import requests
+from attrs import define, field, frozen
+
+from landfire.core import _check_job, _download_job, _submit_job
+from landfire.task import validate_requests
+
+
+__all__ = ["BatchResult", "PipelineStats", "StageStats", "request_many"]
+
+# Request spec as a mapping (see `validate_requests()`) or a (bbox, layers, output_crs, resample_res) tuple
+Spec = Union[Mapping[str, Any], Sequence[Any]]
+
+
+@define
+class StageStats:
+    """Counters of one pipeline stage.
+
+    Args:
+        calls: Number of completed calls.
+        errors: Number of calls that failed.
+        seconds: Total time spent in calls, summed over workers.
+        bytes: Bytes transferred (downloads only).
+    """
+
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    bytes: int = 0
+
+
+@define
+class PipelineStats:
+    """Per-stage throughput of a `request_many()` run, updated while it runs.
+
+    Args:
+        submit: Submission stage counters.
+        poll: Status polling stage counters.
+        download: Download stage counters.
+        started: `time.monotonic()` when the run started.
+    """
+
+    submit: StageStats = field(factory=StageStats)
+    poll: StageStats = field(factory=StageStats)
+    download: StageStats = field(factory=StageStats)
+    started: float = field(factory=time.monotonic)
+    _lock: threading.Lock = field(factory=threading.Lock, repr=False)
+
+    def record(self, stage: str, seconds: float, ok: bool, nbytes: int = 0) -> None:
+        """Record a finished call of a stage (thread safe).
+
+        Args:
+            stage: `submit`, `poll` or `download`.
+            seconds: Duration of the call.
+            ok: Whether the call succeeded.
+            nbytes: Bytes transferred by the call.
+        """
+        with self._lock:
+            stats: StageStats = getattr(self, stage)
+            stats.calls += 1
+            stats.errors += not ok
+            stats.seconds += seconds
+            stats.bytes += nbytes
+
+    def throughput(self) -> Dict[str, float]:
+        """Calls per second of wall time for each stage, and downloaded bytes per second.
+
+        Returns:
+            Mapping of `submit`, `poll`, `download` and `download_bytes` to rates per second.
+        """
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "submit": self.submit.calls / elapsed,
+            "poll": self.poll.calls / elapsed,
+            "download": self.download.calls / elapsed,
+            "download_bytes": self.download.bytes / elapsed,
+        }
+
+
+@frozen
+class BatchResult:
+    """Outcome of one request spec.
+
+    Args:
+        index: Position of the spec in the input.
+        params: Normalized `submitJob` parameters. None if the spec is invalid.
+        output_path: Path the zip file was (or would have been) written to.
+        job_id: LANDFIRE job ID. None if no job was submitted.
+        error: Error message. None if the data was downloaded.
+        seconds: Time from reading the spec until the result was ready.
+    """
+
+    index: int
+    params: Optional[Dict[str, Any]]
+    output_path: Optional[Path]
+    job_id: Optional[str]
+    error: Optional[str]
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        """Whether the data was downloaded."""
+        return self.error is None
+
+
+@define
+class _Job:
+    """State of an in-flight job."""
+
+    index: int
+    params: Dict[str, Any]
+    output_path: Path
+    started: float
+    job_id: Optional[str] = None
+    polls: int = 0
+    # Consecutive status checks that failed with a network error
+    poll_errors: int = 0
+
+
+def _to_mapping(spec: Spec) -> Mapping[str, Any]:
+    """Convert a (bbox, layers, output_crs, resample_res) tuple to a spec mapping."""
+    if isinstance(spec, Mapping):
+        return spec
+    keys = ("bbox", "layers", "output_crs", "resample_res")
+    if len(spec) > len(keys):
+        raise ValueError(
+            f"Request spec `{spec}` must be (bbox, layers[, output_crs[, resample_res]])."
+        )
+    return {keys[i]: spec[i] for i in range(len(spec)) if spec[i] is not None or i == 0}
+
+
+def _submit(job: _Job) -> str:
+    """Submit a job, returning its job ID."""
+    return _submit_job(job.params)
+
+
+def _poll(job: _Job) -> Optional[str]:
+    """Check a job, returning the relative URL of its result once it succeeded or None while it is pending."""
+    return _check_job(str(job.job_id))[0]
+
+
+def _download(job: _Job, result_url: str) -> int:
+    """Download the zip file of a finished job, returning its size in bytes."""
+    return _download_job(str(job.job_id), result_url, job.output_path)
+
+
+def _timed(
+    stats: PipelineStats, stage: str, func: Callable[..., Any], *args: Any
+) -> Any:
+    """Run a stage function, recording its duration and outcome."""
+    start = time.monotonic()
+    try:
+        value = func(*args)
+    except Exception:
+        stats.record(stage, time.monotonic() - start, ok=False)
+        raise
+    nbytes = value if stage == "download" else 0
+    stats.record(stage, time.monotonic() - start, ok=True, nbytes=nbytes)
+    return value
+
+
+def _result(job: _Job, error: Optional[str] = None) -> BatchResult:
+    """Build the result of a job."""
+    return BatchResult(
+        index=job.index,
+        params=job.params,
+        output_path=job.output_path,
+        job_id=job.job_id,
+        error=error,
+        seconds=time.monotonic() - job.started,
+    )
+
+
+@define
+class _Pipeline:
+    """Scheduler moving jobs between the submit, poll and download worker pools."""
+
+    specs: Iterator[Tuple[int, Spec]]
+    output_dir: Path
+    max_in_flight: int
+    backoff_base_value: float
+    max_backoff: float
+    max_poll_retries: int
+    stats: PipelineStats
+    pools: Dict[str, ThreadPoolExecutor]
+    in_flight: int = 0
+    exhausted: bool = False
+    # future -> (stage, job)
+    futures: Dict["Future[Any]", Tuple[str, _Job]] = field(factory=dict)
+    # (due time, sequence, job) of jobs waiting for their next poll
+    waiting: List[Tuple[float, int, _Job]] = field(factory=list)
+    sequence: int = 0
+
+    def start(
+        self, stage: str, job: _Job, func: Callable[..., Any], *args: Any
+    ) -> None:
+        """Run a stage of a job on the stage's worker pool."""
+        future = self.pools[stage].submit(_timed, self.stats, stage, func, *args)
+        self.futures[future] = (stage, job)
+
+    def schedule_poll(self, job: _Job) -> None:
+        """Poll a job again after a linear backoff."""
+        job.polls += 1
+        delay = min(self.backoff_base_value * job.polls, self.max_backoff)
+        self.sequence += 1
+        heapq.heappush(self.waiting, (time.monotonic() + delay, self.sequence, job))
+
+    def fill(self) -> List[BatchResult]:
+        """Read specs until max_in_flight jobs are in flight, returning invalid specs."""
+        invalid = []
+        while not self.exhausted and self.in_flight < self.max_in_flight:
+            try:
+                index, spec = next(self.specs)
+            except StopIteration:
+                self.exhausted = True
+                break
+            started = time.monotonic()
+            try:
+                mapping = _to_mapping(spec)
+            except ValueError as exc:
+                invalid.append(BatchResult(index, None, None, None, str(exc), 0.0))
+                continue
+            validation = validate_requests([mapping])[0]
+            output_path = Path(
+                mapping.get("output_path") or self.output_dir / f"landfire_{index}.zip"
+            )
+            if not validation.ok or validation.params is None:
+                invalid.append(
+                    BatchResult(
+                        index,
+                        None,
+                        output_path,
+                        None,
+                        " ".join(validation.errors),
+                        time.monotonic() - started,
+                    )
+                )
+                continue
+            job = _Job(index, validation.params, output_path, started)
+            self.in_flight += 1
+            self.start("submit", job, _submit, job)
+        return invalid
+
+    def release_due(self) -> None:
+        """Start polls of jobs whose backoff elapsed."""
+        now = time.monotonic()
+        while self.waiting and self.waiting[0][0] <= now:
+            _, _, job = heapq.heappop(self.waiting)
+            self.start("poll", job, _poll, job)
+
+    def retry_poll(self, stage: str, job: _Job, exc: BaseException) -> bool:
+        """Schedule another status check after a network error, returning whether the job is retried."""
+        if stage != "poll" or not isinstance(exc, requests.RequestException):
+            return False
+        if job.poll_errors >= self.max_poll_retries:
+            return False
+        job.poll_errors += 1
+        self.schedule_poll(job)
+        return True
+
+    def advance(self, future: "Future[Any]") -> Optional[BatchResult]:
+        """Move a job to its next stage after a stage finished, returning its result if it is done."""
+        stage, job = self.futures.pop(future)
+        exc = future.exception()
+        if exc is not None:
+            if self.retry_poll(stage, job, exc):
+                return None
+            self.in_flight -= 1
+            return _result(job, str(exc))
+        if stage == "submit":
+            job.job_id = future.result()
+            self.schedule_poll(job)
+        elif stage == "poll":
+            job.poll_errors = 0
+            result_url = future.result()
+            if result_url is None:
+                self.schedule_poll(job)
+            else:
+                self.start("download", job, _download, job, result_url)
+        else:
+            self.in_flight -= 1
+            return _result(job)
+        return None
+
+    def run(self) -> Iterator[BatchResult]:
+        """Run the pipeline, yielding results as jobs finish and shutting the worker pools down when done."""
+        try:
+            yield from self._run()
+        finally:
+            for pool in self.pools.values():
+                pool.shutdown(wait=False)
+
+    def _run(self) -> Iterator[BatchResult]:
+        """Move jobs through the stages, yielding results as jobs finish."""
+        while True:
+            yield from self.fill()
+            self.release_due()
+            if not self.futures and not self.waiting:
+                if self.exhausted:
+                    return
+                continue
+            timeout = None
+            if self.waiting:
+                timeout = max(self.waiting[0][0] - time.monotonic(), 0.0)
+            done: Set["Future[Any]"] = set()
+            if self.futures:
+                done, _ = wait(
+                    list(self.futures), timeout=timeout, return_when=FIRST_COMPLETED
+                )
+            elif timeout:
+                time.sleep(timeout)
+            for future in done:
+                result = self.advance(future)
+                if result is not None:
+                    yield result
+
+
+def request_many(
+    specs: Iterable[Spec],
+    output_dir: str = ".",
+    max_in_flight: int = 8,
+    submit_workers: int = 2,
+    poll_workers: int = 4,
+    download_workers: int = 2,
+    backoff_base_value: float = 5,
+    max_backoff: float = 60,
+    max_poll_retries: int = 3,
+    stats: Optional[PipelineStats] = None,
+) -> Iterator[BatchResult]:
+    """Request data for many areas of interest with pipelined, bounded concurrency.
+
+    Each spec is either a mapping with the keys accepted by `validate_requests()` (`bbox`, `layers` and optionally `output_crs`, `resample_res` and `output_path`) or a tuple `(bbox, layers, output_crs, resample_res)` where trailing items may be omitted. Specs are validated locally (see `validate_requests()`) and invalid ones are yielded as failed results without submitting a job.
+
+    Submission, polling and downloads run on separate worker pools, so slow downloads don't hold up polling and vice versa. A job is polled `backoff_base_value * n` seconds (capped at `max_backoff`) after its n-th status check, like `Landfire.request_data()`. Status checks failing with a network error are retried after the same backoff, up to `max_poll_retries` times in a row, before the spec fails. Please be courteous with the LANDFIRE API when raising the concurrency limits!
+
+    Args:
+        specs: Request specs, read lazily.
+        output_dir: Directory for zip files of specs without `output_path`, named `landfire_<index>.zip`. Created if it doesn't exist.
+        max_in_flight: Maximum number of jobs between submission and the end of their download.
+        submit_workers: Concurrent job submissions.
+        poll_workers: Concurrent status checks.
+        download_workers: Concurrent downloads.
+        backoff_base_value: Base time in seconds of the linear polling backoff.
+        max_backoff: Maximum time in seconds between status checks of a job.
+        max_poll_retries: Consecutive status checks of a job that may fail with a network error before the job is given up.
+        stats: PipelineStats to update with per-stage counts, busy time and transferred bytes while running.
+
+    Returns:
+        Iterator of one BatchResult per spec, in completion order. Failed jobs carry an error message instead of raising.
+
+    Raises:
+        ValueError: If max_in_flight or a number of workers is less than 1, or max_poll_retries is negative.
+    """
+    # Arguments are checked here, before the first result is requested
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1.")
+    if max_poll_retries < 0:
+        raise ValueError("max_poll_retries must not be negative.")
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    pools = {
+        "submit": ThreadPoolExecutor(submit_workers, "landfire-submit"),
+        "poll": ThreadPoolExecutor(poll_workers, "landfire-poll"),
+        "download": ThreadPoolExecutor(download_workers, "landfire-download"),
+    }
+    pipeline = _Pipeline(
+        specs=enumerate(specs),
+        output_dir=Path(output_dir),
+        max_in_flight=max_in_flight,
+        backoff_base_value=backoff_base_value,
+        max_backoff=max_backoff,
+        max_poll_retries=max_poll_retries,
+        stats=stats if stats is not None else PipelineStats(),
+        pools=pools,
+    )
+    return pipeline.run()
@@ -0,0 +1,220 @@
+"""Bounding box value type for LANDFIRE requests.
+
+`Area_Of_Interest` is sent to the LANDFIRE Product Service as a string, so tiny float differences (i.e. `-107.70894965` vs. `-107.708949651`) make otherwise identical requests differ. `BBox` parses a bounding box once from any of the usual representations and can snap it outward to a canonical form, either a fixed decimal precision or a grid of about 30 m cells, so equivalent areas produce identical requests.
+"""
+import math
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from attrs import field, frozen
+
+
+__all__ = ["BBox"]
+
+# Radius of the sphere with the same surface area as the WGS84 ellipsoid
+_AUTHALIC_RADIUS = 6_371_007.2
+
+
+def _check_bounds(values: Sequence[float]) -> Tuple[float, float, float, float]:
+    """Check bounds are four finite, ordered longitude/latitude values."""
+    if len(values) != 4 or not all(math.isfinite(v) for v in values):
+        raise ValueError(
+            f"Bounding box `{values}` must be four numbers `min_x min_y max_x max_y`."
+        )
+    min_x, min_y, max_x, max_y = values
+    if not (-180 <= min_x <= 180 and -180 <= max_x <= 180):
+        raise ValueError(
+            f"Bounding box `{values}` longitudes must be within -180 and 180."
+        )
+    if not (-90 <= min_y <= 90 and -90 <= max_y <= 90):
+        raise ValueError(
+            f"Bounding box `{values}` latitudes must be within -90 and 90."
+        )
+    if min_x >= max_x or min_y >= max_y:
+        raise ValueError(
+            f"Bounding box `{values}` minimum coordinates must be less than maximum coordinates."
+        )
+    return min_x, min_y, max_x, max_y
+
+
+def _iter_positions(coordinates: Any) -> Iterator[Sequence[float]]:
+    """Iterate over the positions of nested GeoJSON coordinates."""
+    if coordinates and isinstance(coordinates[0], (int, float)):
+        yield coordinates
+        return
+    for item in coordinates:
+        yield from _iter_positions(item)
+
+
+def _iter_geometries(obj: Any) -> Iterator[Any]:
+    """Iterate over the coordinates of the geometries of a GeoJSON object."""
+    kind = obj.get("type")
+    if kind == "FeatureCollection":
+        for feature in obj.get("features", []):
+            yield from _iter_geometries(feature)
+    elif kind == "Feature":
+        if obj.get("geometry"):
+            yield from _iter_geometries(obj["geometry"])
+    elif kind == "GeometryCollection":
+        for geometry in obj.get("geometries", []):
+            yield from _iter_geometries(geometry)
+    else:
+        yield obj.get("coordinates", [])
+
+
+def _geojson_bounds(obj: Any) -> List[float]:
+    """Get the bounds of a GeoJSON object, using its `bbox` member if present."""
+    if obj.get("bbox"):
+        bbox = [float(v) for v in obj["bbox"]]
+        # 3D bounding boxes are `min_x min_y min_z max_x max_y max_z`
+        return bbox if len(bbox) != 6 else [bbox[0], bbox[1], bbox[3], bbox[4]]
+    xs: List[float] = []
+    ys: List[float] = []
+    for coordinates in _iter_geometries(obj):
+        for position in _iter_positions(coordinates):
+            xs.append(float(position[0]))
+            ys.append(float(position[1]))
+    if not xs:
+        raise ValueError(
+            "Unable to compute a bounding box, GeoJSON has no coordinates."
+        )
+    return [min(xs), min(ys), max(xs), max(ys)]
+
+
+def _to_values(value: Any) -> List[float]:
+    """Convert a supported bounding box representation to a list of floats."""
+    if isinstance(value, str):
+        try:
+            return [float(part) for part in value.replace(",", " ").split()]
+        except ValueError:
+            raise ValueError(
+                f"Bounding box `{value}` must be four numbers `min_x min_y max_x max_y`."
+            )
+    if isinstance(value, dict):
+        return _geojson_bounds(value)
+    if hasattr(value, "__geo_interface__"):
+        # geojson and shapely objects
+        return _geojson_bounds(value.__geo_interface__)
+    return [float(v) for v in value]
+
+
+def _floor(value: float, step: float) -> float:
+    """Snap value down to a multiple of step, ignoring float noise."""
+    k = value / step
+    nearest = round(k)
+    return (nearest if math.isclose(k, nearest, abs_tol=1e-9) else math.floor(k)) * step
+
+
+def _ceil(value: float, step: float) -> float:
+    """Snap value up to a multiple of step, ignoring float noise."""
+    k = value / step
+    nearest = round(k)
+    return (nearest if math.isclose(k, nearest, abs_tol=1e-9) else math.ceil(k)) * step
+
+
+@frozen
+class BBox:
+    """Longitude/latitude (EPSG:4326) bounding box of a request.
+
+    Use `BBox.parse()` to build one from a string, sequence, array or GeoJSON object. `str(bbox)` is the `Area_Of_Interest` form `min_x min_y max_x max_y` accepted by `Landfire`.
+
+    Args:
+        min_x: Minimum longitude.
+        min_y: Minimum latitude.
+        max_x: Maximum longitude.
+        max_y: Maximum latitude.
+
+    Raises:
+        ValueError: If the coordinates are not finite, out of range or not ordered.
+    """
+
+    min_x: float = field(converter=float)
+    min_y: float = field(converter=float)
+    max_x: float = field(converter=float)
+    max_y: float = field(converter=float)
+
+    def __attrs_post_init__(self) -> None:
+        """Validate bounds."""
+        _check_bounds(self.bounds)
+
+    @classmethod
+    def parse(cls, value: Union["BBox", str, Iterable[float], Any]) -> "BBox":
+        """Parse a bounding box.
+
+        Args:
+            value: A BBox, a string `min_x min_y max_x max_y` (space or comma separated), a sequence or array of four numbers, or a GeoJSON object (dict, `geojson` or `shapely` object) whose bounds are used.
+
+        Returns:
+            BBox.
+
+        Raises:
+            ValueError: If value can't be parsed to a valid bounding box.
+        """
+        if isinstance(value, BBox):
+            return value
+        return cls(*_check_bounds(_to_values(value)))
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Bounds `(min_x, min_y, max_x, max_y)`."""
+        return self.min_x, self.min_y, self.max_x, self.max_y
+
+    def __str__(self) -> str:
+        """Format as an `Area_Of_Interest` string."""
+        return " ".join(repr(v) for v in self.bounds)
+
+    @property
+    def area(self) -> float:
+        """Approximate area in square meters.
+
+        Computed on a sphere with the surface area of the WGS84 ellipsoid, which is within about half a percent of the ellipsoidal area.
+        """
+        width = math.radians(self.max_x - self.min_x)
+        height = math.sin(math.radians(self.max_y)) - math.sin(math.radians(self.min_y))
+        return _AUTHALIC_RADIUS**2 * width * height
+
+    def pixel_count(self, resolution: float = 30) -> int:
+        """Estimate the number of pixels covering the bounding box.
+
+        Args:
+            resolution: Pixel size in meters.
+
+        Returns:
+            Estimated pixel count of an equal area raster.
+        """
+        return math.ceil(self.area / resolution**2)
+
+    def _snap(self, step: float, precision: int) -> "BBox":
+        """Snap outward to multiples of step, rounded to precision decimals."""
+        return BBox(
+            round(max(_floor(self.min_x, step), -180.0), precision),
+            round(max(_floor(self.min_y, step), -90.0), precision),
+            round(min(_ceil(self.max_x, step), 180.0), precision),
+            round(min(_ceil(self.max_y, step), 90.0), precision),
+        )
+
+    def snap(self, precision: int = 6) -> "BBox":
+        """Round outward to a number of decimal places.
+
+        Six decimals (about 0.1 m) are plenty for LANDFIRE's 30 m data and collapse coordinates that only differ by float noise.
+
+        Args:
+            precision: Number of decimal places to keep.
+
+        Returns:
+            BBox containing this bounding box.
+        """
+        return self._snap(10.0**-precision, precision)
+
+    def snap_to_grid(self, resolution: float = 30, precision: int = 8) -> "BBox":
+        """Snap outward to a geographic grid with cells of about `resolution` meters, by default the 30 m grid of LANDFIRE.
+
+        LANDFIRE cells are aligned in Albers Equal Area, which is rotated against longitude/latitude away from its central meridian, so no longitude/latitude box follows them exactly (the geographic envelope of whole Albers cells is up to about 50% larger than the box). Instead the box is snapped to whole arc-seconds, the conventional geographic counterpart of a 30 m grid (one arc-second of latitude is about 31 m), scaled by `resolution / 30`. Each edge moves outward by less than one cell and every bounding box within the same cells gives the same result.
+
+        Args:
+            resolution: Approximate cell size in meters.
+            precision: Number of decimal places of the returned bounding box.
+
+        Returns:
+            BBox containing all grid cells intersecting this bounding box.
+        """
+        return self._snap(resolution / 30 / 3600, precision)
@@ -0,0 +1,579 @@
+"""Landfire data accessor and LANDFIRE Product Service (LFPS) client."""
+import os
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import requests
+from attrs import Attribute, AttrsInstance, define, field, validators
+from tqdm import tqdm
+
+from landfire.bbox import BBox
+from landfire.estimate import JobEstimate, estimate_job
+from landfire.product.enums import ProductRegion
+from landfire.product.regions import infer_regions
+from landfire.product.search import ProductSearch
+from landfire.task import _check_regions, get_task_schema, validate_params
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from landfire.batch import BatchResult
+    from landfire.mapzones import MapZoneIndex
+    from landfire.mosaic import LocalMosaic
+    from landfire.results import ResultCache
+    from landfire.tiles import TileCache
+
+__all__ = ["Landfire"]
+
+# URLs for making requests to LANDFIRE ArcGIS Rest Service
+BASE_URL = "https://lfps.usgs.gov/arcgis/rest/services/LandfireProductService/GPServer/LandfireProductService"
+REQUEST_URL = BASE_URL + "/submitJob?"
+JOB_URL = BASE_URL + "/jobs/"
+
+
+# Job statuses of jobs that are still queued or running
+PENDING_STATUSES = (
+    "esriJobNew",
+    "esriJobSubmitted",
+    "esriJobWaiting",
+    "esriJobExecuting",
+)
+
+
+def _to_aoi(bbox: Union[str, BBox]) -> str:
+    """Convert a BBox to an `Area_Of_Interest` string, leaving strings untouched."""
+    return str(bbox) if isinstance(bbox, BBox) else bbox
+
+
+def _get_json(url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """GET a JSON document from the LANDFIRE API."""
+    response = requests.get(url=url, params=params, stream=False, timeout=600)
+    response.raise_for_status()
+    return response.json()
+
+
+def _submit_job(params: Dict[str, Any]) -> str:
+    """Submit a job, returning its job ID.
+
+    Raises:
+        RuntimeError: If the API doesn't return a job ID.
+    """
+    submitted = _get_json(REQUEST_URL, params)
+    if "jobId" not in submitted:
+        raise RuntimeError(
+            "Unable to obtain job ID for request! Please verify your request parameters and try again! If this problem continues, please raise an issue at https://github.com/FireSci/landfire/issues."
+        )
+    return str(submitted["jobId"])
+
+
+def _check_job(job_id: str) -> Tuple[Optional[str], str]:
+    """Check the status of a job.
+
+    Returns:
+        Relative URL of the result once the job succeeded (None while it is pending) and its most recent message.
+
+    Raises:
+        RuntimeError: If the status can't be obtained or the job failed.
+    """
+    status = _get_json(JOB_URL + job_id, {"f": "json"})
+    if "jobStatus" not in status:
+        raise RuntimeError(
+            "Could not obtain job status for job ID. Please try again! If this problem continues, please raise an issue at https://github.com/FireSci/landfire/issues."
+        )
+    messages = status.get("messages")
+    message = messages[-1]["description"] if messages else "No message yet!"
+    if status["jobStatus"] == "esriJobSucceeded":
+        return str(status["results"]["Output_File"]["paramUrl"]), message
+    if status["jobStatus"] in PENDING_STATUSES:
+        return None, message
+    raise RuntimeError(
+        f"Encountered an error during job processing! Status was `{status['jobStatus']}` and message was `{message}`."
+    )
+
+
+def _download_job(job_id: str, result_url: str, path: Path) -> int:
+    """Download the zip file of a finished job, returning its size in bytes.
+
+    The file is written to a temporary file next to path and only moved into place once complete, so a failed download never leaves a truncated zip file at path.
+    """
+    result = _get_json(f"{JOB_URL}{job_id}/{result_url}", {"f": "json"})
+    response = requests.get(url=result["value"]["url"], stream=True, timeout=600)
+    response.raise_for_status()
+    size = 0
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name, suffix=".part", delete=False
+    ) as fd:
+        try:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                fd.write(chunk)
+                size += len(chunk)
+        except BaseException:
+            fd.close()
+            os.unlink(fd.name)
+            raise
+    os.replace(fd.name, path)
+    return size
+
+
+@define
+class Landfire:
+    """Accessor for LANDFIRE data.
+
+    Args:
+        bbox: Bounding box with form `min_x min_y max_x max_y` or a `BBox`. For example, `-107.70894965 46.56799094 -106.02718124 47.34869094`. Use `BBox.parse(...).snap()` for canonical bounding boxes that keep repeated requests identical. Use geospatial util func `get_bbox_from_polygon()` to convert a GeoJSON Polygon object or get_bbox_from_file() to convert a file to a suitable bounding box if needed.
+        output_crs: Output coordinate reference system in well-known integer ID (WKID) format (EPSG). Defaults to None to preserve localized Albers projection from LANDFIRE needed for most fire models (FlamMap, FARSITE, etc.). A commonly used value for other purposes is `4326` for WGS84. See https://epsg.io for a full list of EPSG WKIDs.
+        resample_res: Resolution in meters for resampling output data. Defaults to 30 meters. Acceptable values are 30 to 9999 meters.
+        mosaic: Optional LocalMosaic to extract data from local LANDFIRE mosaics instead of the LANDFIRE Product Service. Requires a bounding box. See `landfire.mosaic`.
+    """
+
+    bbox: str = field(converter=_to_aoi, validator=validators.instance_of(str))
+    resample_res: int = field(default=30, validator=validators.instance_of(int))
+    output_crs: Union[str, None] = field(
+        default=None,
+        validator=validators.optional(validators.instance_of(str)),
+    )
+    mosaic: Optional["LocalMosaic"] = field(default=None)
+    # Private attrs that will be set in post_init()
+    _search = field(init=False, validator=validators.instance_of(ProductSearch))
+    _all_layers = field(init=False, validator=validators.instance_of(list))
+    # Regions intersecting bbox, None if bbox is not a bounding box (i.e. a map zone)
+    _regions: Optional[Tuple[ProductRegion, ...]] = field(init=False, default=None)
+    _base_params = field(init=False, validator=validators.instance_of(dict))
+    _session = field(init=False, validator=validators.instance_of(requests.Session))
+
+    def __attrs_post_init__(self) -> None:
+        """Post initialization setup."""
+        # instantiate products for searching
+        self._search = ProductSearch()
+
+        # for validation
+        self._all_layers = self._search.get_layers()
+        try:
+            self._regions = infer_regions(BBox.parse(self.bbox).bounds)
+        except ValueError:
+            # Left to pre-flight validation
+            self._regions = None
+
+        # base param payload
+        self._base_params = {
+            "Area_Of_Interest": self.bbox,
+            "Output_Projection": self.output_crs,
+            "f": "JSON",
+        }
+
+        # api will fail if 30 is provided to Resample_Resolution. Handle here instead of confusing  user to provide None when they want 30m.
+        if self.resample_res != 30:
+            self._base_params["Resample_Resolution"] = self.resample_res
+
+    @resample_res.validator
+    def _resample_range_check(self, attribute: AttrsInstance, value: int) -> None:
+        """Ensure resampling resolution is within allowable range."""
+        if not 30 <= value <= 9999:
+            raise ValueError("resample_res must be between 30 and 9999 meters.")
+
+    @mosaic.validator
+    def _mosaic_check(self, attribute: "Attribute[Any]", value: Any) -> None:
+        """Ensure mosaic is a LocalMosaic, importing it only when one is given."""
+        if value is not None:
+            from landfire.mosaic import LocalMosaic
+
+            validators.instance_of(LocalMosaic)(self, attribute, value)
+
+    def _write_status(
+        self, msg: str, progress_bar: tqdm, show_status: bool = True
+    ) -> None:
+        """Write progress bar status.
+
+        Args:
+            msg: Message to write.
+            progress_bar: tqdm progress bar instance.
+            show_status: Whether to log message.
+        """
+        if show_status:
+            progress_bar.write(msg)
+
+    def _validate_layers(self, layers: List[str]) -> None:
+        """Validate user provided layers are available for download.
+
+        Args:
+            layers: List of user provided layers to validate.
+
+        Raises:
+            RuntimeError: If user provided layers do not match possible layers available for download, or are not available in the region(s) of the bounding box.
+
+        """
+        try:
+            assert all(layer in self._all_layers for layer in layers)
+        except AssertionError:
+            raise RuntimeError(
+                "Specified layers do not match available layers from the LANDFIRE API. Please check your layer list and try again!"
+            )
+        errors = _check_regions(self.bbox, self._regions, layers)
+        if errors:
+            raise RuntimeError(errors[0])
+
+    def _validate_user_output_path(self, output_path: str) -> Path:
+        """Validate user provided output_path is valid.
+
+        Args:
+            output_path: User provided output path.
+
+        Returns:
+            output_path as a Path object.
+
+        Raises:
+            RuntimeError: If user provided path parent directory doesn't exist or the file name doesn't have the `.zip` extension.
+        """
+        try:
+            path_obj = Path(output_path)
+            assert path_obj.suffix == ".zip"
+        except AssertionError:
+            raise RuntimeError(
+                f"{output_path} is not valid! Verify the path exists and the file name ends in `.zip`."
+            )
+        return path_obj
+
+    def _preflight(self) -> None:
+        """Validate the request payload against the cached LANDFIRE task description before submitting a job.
+
+        Raises:
+            RuntimeError: If the request parameters are not accepted by the LANDFIRE API.
+        """
+        try:
+            schema = get_task_schema(BASE_URL)
+        except requests.RequestException as exc:
+            warnings.warn(
+                f"Skipping pre-flight validation, unable to obtain the LANDFIRE task description: {exc}",
+                stacklevel=3,
+            )
+            return
+        errors = validate_params(self._base_params, schema)
+        if errors:
+            raise RuntimeError(
+                f"Request failed pre-flight validation! {' '.join(errors)}"
+            )
+
+    def estimate(self, layers: List[str]) -> JobEstimate:
+        """Estimate the size and duration of a request before submitting it.
+
+        Nothing is sent to the LANDFIRE API. See `landfire.estimate.estimate_job()` for how the estimate is made.
+
+        Args:
+            layers: List of product layers.
+
+        Returns:
+            JobEstimate with the pixel count per layer, uncompressed and compressed output size in bytes and the expected duration in seconds.
+
+        Raises:
+            RuntimeError: If provided layers are not valid or the area of interest is a map zone rather than a bounding box.
+        """
+        self._validate_layers(layers)
+        return estimate_job(
+            self.bbox,
+            layers,
+            resample_res=self.resample_res,
+            output_crs=self.output_crs,
+        )
+
+    def _serve_cached(
+        self,
+        cache: "ResultCache",
+        layers: List[str],
+        final_path: Path,
+        show_status: bool,
+    ) -> bool:
+        """Clip the request out of a cached result containing it.
+
+        Args:
+            cache: ResultCache to serve from.
+            layers: List of product layers.
+            final_path: Path object to write the zip file to.
+            show_status: Whether to write a status message.
+
+        Returns:
+            Whether the request was served from the cache.
+        """
+        hit = cache.serve(
+            self.bbox, layers, str(final_path), self.output_crs, self.resample_res
+        )
+        if hit is not None and show_status:
+            tqdm.write(
+                f"Data clipped from cached result {hit.path.name} to {final_path}!",
+                file=sys.stdout,
+            )
+        return hit is not None
+
+    def _request_tiles(
+        self,
+        tiles: "TileCache",
+        layers: List[str],
+        final_path: Path,
+        show_status: bool,
+        backoff_base_value: int,
+    ) -> None:
+        """Assemble the request from a tile cache, fetching missing tiles.
+
+        Args:
+            tiles: TileCache to assemble from.
+            layers: List of product layers.
+            final_path: Path object to write the zip file to.
+            show_status: Whether to write a status message.
+            backoff_base_value: Base time in seconds for linear backoff strategy.
+
+        Raises:
+            RuntimeError: If output_crs is set, or see `TileCache.request()`.
+        """
+        if self.output_crs is not None:
+            raise RuntimeError(
+                "Tile-grid mode requires the native LANDFIRE projection! Please use `output_crs=None`."
+            )
+        summary = tiles.request(
+            self.bbox,
+            layers,
+            str(final_path),
+            self.resample_res,
+            backoff_base_value=backoff_base_value,
+        )
+        if show_status:
+            tqdm.write(
+                f"Data assembled from {summary.tiles} tiles ({summary.cached} cached, {summary.jobs} jobs) to {final_path}!",
+                file=sys.stdout,
+            )
+
+    def request_data(
+        self,
+        layers: List[str],
+        output_path: str,
+        show_status: bool = True,
+        backoff_base_value: int = 5,
+        preflight: bool = False,
+        cache: Optional["ResultCache"] = None,
+        tiles: Optional["TileCache"] = None,
+    ) -> None:
+        """Request particular layers from Landfire to be output as a zipped .tif.
+
+        NOTE: this function has no return, data will simply be downloaded to the specified `output_path`.
+
+        NOTE: this function implements a linear backoff strategy, polling for job status every 5 seconds by default. Depending on the size of your job, it may take several seconds or minutes to process. You may change this with the `backoff_base_value`.
+
+        Args:
+            layers: List of product layers.
+            output_path: Path-like string where data will be downloaded to. Include 'empty' file name and .zip extension. For example, `~/tmp/my_landfire_data/output.zip`.
+            show_status: Whether to write (True) or suppress (False) progress bar and status update output for data request.
+            backoff_base_value: Base time in seconds for linear backoff strategy. This is used to query the job API periodically for status while avoiding making too many requests. Please be courteous with this parameter as it will directly affect the number of calls to the LANDFIRE API!
+            preflight: Whether to validate the request against the LANDFIRE task description (valid layers, projections, resampling range and area of interest) before submitting the job. Costs one extra request to the LANDFIRE API, after which the task description is cached on disk and refetched at most once a day. Defaults to False.
+            cache: Optional ResultCache. Requests within a cached result with the same projection and resolution are clipped out of it locally without submitting a job, downloaded results are added to it.
+            tiles: Optional TileCache for tile-grid mode. The request is snapped to the cache's grid in the LANDFIRE CONUS Albers projection, only missing tiles are requested and the output is assembled from cached tiles. Requires the native projection (`output_crs=None`) and a bounding box within CONUS. Can't be combined with a `mosaic`.
+
+        Raises:
+            RuntimeError: If provided layers are not valid, if output_path does not exist, if both a mosaic and tiles are given, if the request fails pre-flight validation, or if an unexpected error occurs when processing requested data.
+        """
+        # User input validation
+        if self.mosaic is not None and tiles is not None:
+            raise RuntimeError(
+                "Unable to request data from both local mosaics and a tile cache! Please provide only one of `mosaic` and `tiles`."
+            )
+        self._validate_layers(layers)
+        final_path: Path = self._validate_user_output_path(output_path)
+
+        # Add layer list to base_params
+        self._base_params["Layer_List"] = ";".join(layers)
+
+        # Serve areas within earlier downloads locally
+        if cache is not None and self._serve_cached(
+            cache, layers, final_path, show_status
+        ):
+            return
+
+        if self.mosaic is not None:
+            self.mosaic.extract(
+                self.bbox, layers, str(final_path), self.output_crs, self.resample_res
+            )
+            if show_status:
+                tqdm.write(
+                    f"Data extracted from local mosaics to {output_path}!",
+                    file=sys.stdout,
+                )
+            return
+
+        if tiles is not None:
+            self._request_tiles(
+                tiles, layers, final_path, show_status, backoff_base_value
+            )
+            return
+
+        # Fail locally instead of after waiting in the job queue
+        if preflight:
+            self._preflight()
+
+        self._run_job(final_path, output_path, show_status, backoff_base_value)
+
+        # Map zone requests have no bounding box to reuse
+        if cache is not None and self._regions is not None:
+            cache.add(
+                str(final_path), self.bbox, layers, self.output_crs, self.resample_res
+            )
+
+    def request_pyramid(
+        self,
+        layers: List[str],
+        output_path: str,
+        resolutions: Sequence[int],
+        **kwargs: Any,
+    ) -> Dict[int, Path]:
+        """Request layers once and derive coarser resolutions locally.
+
+        Data is requested at `resample_res` with `request_data()`, then every resolution in `resolutions` is aggregated from the download with `landfire.pyramid.build_pyramid()` (majority for categorical layers, mean for continuous ones), instead of one LFPS job per resolution. Requires the `raster` extra and a projected `output_crs` (or the native projection), since resolutions are in meters.
+
+        Args:
+            layers: List of product layers.
+            output_path: Path-like string where data at `resample_res` will be downloaded to. Coarser resolutions are written next to it as `<name>_<resolution>m.zip`.
+            resolutions: Coarser resolutions in meters, multiples of `resample_res`.
+            kwargs: Passed to `request_data()`.
+
+        Returns:
+            Path of the zip file per resolution, including `resample_res`.
+
+        Raises:
+            RuntimeError: If the request fails, `output_crs` is geographic or a resolution is not a multiple of `resample_res`.
+        """
+        from landfire.pyramid import _is_geographic, build_pyramid
+
+        invalid = [res for res in resolutions if res % self.resample_res]
+        if invalid:
+            raise RuntimeError(
+                f"Resolutions must be multiples of resample_res ({self.resample_res}): {', '.join(map(str, invalid))}."
+            )
+        # Fail before the download, geographic pixels aren't whole multiples of meters
+        if self.output_crs is not None and _is_geographic(self.output_crs):
+            raise RuntimeError(
+                f"Unable to build a pyramid in the geographic projection `{self.output_crs}`! Please use a projected output_crs or the native projection (None)."
+            )
+        self.request_data(layers, output_path, **kwargs)
+        coarser = [res for res in resolutions if res != self.resample_res]
+        outputs = {self.resample_res: Path(output_path)}
+        outputs.update(build_pyramid(output_path, layers, coarser))
+        return outputs
+
+    def request_by_map_zones(
+        self,
+        layers: List[str],
+        output_dir: str,
+        index: Optional["MapZoneIndex"] = None,
+        **kwargs: Any,
+    ) -> List["BatchResult"]:
+        """Split the bounding box along LANDFIRE map zones and request one job per zone concurrently.
+
+        Tiling mode for very large areas: sub-jobs line up with how LANDFIRE processes data and run in parallel with `landfire.batch.request_many()`. Zones entirely within the bounding box are requested by map zone number, the others by the bounding box of their part (see `landfire.mapzones.MapZoneIndex.split()`). Requires `landfire[geospatial]` and a map zone index, which is not shipped with the package: build it once with `MapZoneIndex.from_file(...).save()`.
+
+        Args:
+            layers: List of product layers.
+            output_dir: Directory to write one zip file per sub-job to, named `landfire_<n>.zip` in map zone order.
+            index: MapZoneIndex to split with. Defaults to the index saved in the cache directory.
+            kwargs: Passed to `request_many()` (concurrency limits and backoff).
+
+        Returns:
+            One BatchResult per sub-job in map zone order. The `Area_Of_Interest` of each is in its `params`.
+
+        Raises:
+            RuntimeError: If provided layers are not valid, the area of interest is not a bounding box, or there is no map zone index.
+        """
+        from landfire.batch import request_many
+        from landfire.mapzones import split_by_map_zones
+
+        self._validate_layers(layers)
+        if self._regions is None:
+            raise RuntimeError(
+                f"Area of interest `{self.bbox}` must be a bounding box to split it by map zones."
+            )
+        specs = [
+            {
+                "bbox": aoi,
+                "layers": layers,
+                "output_crs": self.output_crs,
+                "resample_res": self.resample_res,
+            }
+            for aoi in split_by_map_zones(self.bbox, index)
+        ]
+        results = request_many(specs, output_dir=output_dir, **kwargs)
+        return sorted(results, key=lambda result: result.index)
+
+    def _run_job(
+        self,
+        final_path: Path,
+        output_path: str,
+        show_status: bool,
+        backoff_base_value: int,
+    ) -> None:
+        """Submit the job, poll its status with linear backoff and download the result.
+
+        Args:
+            final_path: Path object to write the zip file to.
+            output_path: User provided output path, for status messages.
+            show_status: Whether to write progress bar and status update output.
+            backoff_base_value: Base time in seconds for linear backoff strategy.
+
+        Raises:
+            RuntimeError: If an unexpected error occurs when processing requested data.
+        """
+        # Init progress
+        if show_status:
+            pbar = tqdm(
+                total=100,
+                desc="Job Status",
+                file=sys.stdout,
+                bar_format="{l_bar}{bar} [Total Duration: {elapsed}]",
+            )
+        else:
+            pbar = tqdm(total=100, disable=True)
+
+        # Close the bar on failures too, an open bar left for garbage collection breaks later `tqdm.write()` calls
+        try:
+            # Submit initial request for layers
+            self._write_status("Submitting job...", pbar, show_status)
+            job_id = _submit_job(self._base_params)
+            pbar.update(25)
+            self._write_status("Job submitted! Processing layers...", pbar, show_status)
+
+            # Check status of processing with backoff
+            n = 0
+            result_url = None
+            while result_url is None:
+                # Backoff logic
+                n += 1
+                backoff_sec = backoff_base_value * n
+                self._write_status(
+                    f"Checking status of job again in {backoff_sec} seconds...",
+                    pbar,
+                    show_status,
+                )
+                time.sleep(backoff_sec)
+
+                # Still executing, display most recent processing step
+                result_url, latest_status_msg = _check_job(job_id)
+                if result_url is None:
+                    self._write_status(
+                        f"Most recent message is `{latest_status_msg}`",
+                        pbar,
+                        show_status,
+                    )
+
+            pbar.update(25)
+            self._write_status(
+                "Job complete! Getting path to .zip file...", pbar, show_status
+            )
+            pbar.update(25)
+            self._write_status("Downloading data as .zip file...", pbar, show_status)
+
+            # Write data to user path
+            _download_job(job_id, result_url, final_path)
+
+            pbar.update(25)
+            self._write_status(
+                f"Data written successfully to {output_path}!", pbar, show_status
+            )
+        finally:
+            pbar.close()
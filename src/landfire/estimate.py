@@ -0,0 +1,146 @@
+"""Pre-flight size and duration estimates of LANDFIRE Product Service jobs.
+
+Estimates are derived from the bounding box area in the output projection, the resampling resolution and the catalog's per-layer byte widths, so jobs can be ordered, disk space reserved and large areas tiled before anything is submitted. Compression ratios and service throughput are rough averages of typical LFPS jobs; the module level constants can be adjusted to match observed jobs.
+"""
+import math
+from typing import Dict, List, Optional, Union
+
+from attrs import frozen
+
+from landfire._optional import import_optional
+from landfire.bbox import BBox
+from landfire.product.enums import ProductTheme
+from landfire.product.index import get_index
+
+
+__all__ = ["JobEstimate", "estimate_job"]
+
+# Typical zip compression of a layer per theme. Categorical layers (fuel models, vegetation types) and sparse ones (disturbance, roads) compress far better than continuous topography.
+COMPRESSION_RATIOS: Dict[ProductTheme, float] = {
+    ProductTheme.disturbance: 20.0,
+    ProductTheme.fire_regime: 6.0,
+    ProductTheme.fuel: 4.0,
+    ProductTheme.topographic: 1.6,
+    ProductTheme.transportation: 20.0,
+    ProductTheme.vegetation: 4.0,
+    ProductTheme.mod_fis: 4.0,
+    ProductTheme.map_zones: 50.0,
+}
+
+# Queueing and job setup, independent of the job size
+JOB_OVERHEAD_SECONDS = 45.0
+
+# Uncompressed bytes the service extracts, reprojects and zips per second
+PROCESSING_BYTES_PER_SECOND = 20e6
+
+# Download bandwidth from the service
+DOWNLOAD_BYTES_PER_SECOND = 10e6
+
+# Native projections of LANDFIRE regions (Albers Equal Area for CONUS, Alaska and Hawaii)
+_NATIVE_CRS = {"US": "EPSG:5070", "AK": "EPSG:3338", "HI": "ESRI:102007"}
+
+
+@frozen
+class JobEstimate:
+    """Estimated size and duration of a job.
+
+    Args:
+        pixels: Pixels per layer.
+        layers: Number of layers.
+        uncompressed_bytes: Size of the extracted GeoTIFF.
+        compressed_bytes: Size of the zip file to download.
+        seconds: Expected duration from submission until the download completes.
+    """
+
+    pixels: int
+    layers: int
+    uncompressed_bytes: int
+    compressed_bytes: int
+    seconds: float
+
+
+def _native_crs(bbox: BBox) -> str:
+    """Get the native LANDFIRE projection of the region containing the center of bbox."""
+    x = (bbox.min_x + bbox.max_x) / 2
+    y = (bbox.min_y + bbox.max_y) / 2
+    if y >= 50 and x <= -129:
+        return _NATIVE_CRS["AK"]
+    if y < 24 and x < -150:
+        return _NATIVE_CRS["HI"]
+    return _NATIVE_CRS["US"]
+
+
+def _output_area(bbox: BBox, output_crs: Optional[str]) -> float:
+    """Get the area in square meters of the output raster, the envelope of bbox in the output projection.
+
+    The equal area of bbox is used for geographic output and when `pyproj` is not installed.
+    """
+    try:
+        pyproj = import_optional("pyproj")
+    except RuntimeError:
+        return bbox.area
+    crs = output_crs or _native_crs(bbox)
+    target = pyproj.CRS.from_user_input(f"EPSG:{crs}" if crs.isdigit() else crs)
+    if target.is_geographic or target.axis_info[0].unit_name not in ("metre", "meter"):
+        return bbox.area
+    transformer = pyproj.Transformer.from_crs(4326, target, always_xy=True)
+    min_x, min_y, max_x, max_y = transformer.transform_bounds(
+        *bbox.bounds, densify_pts=21
+    )
+    return float((max_x - min_x) * (max_y - min_y))
+
+
+def estimate_job(
+    bbox: Union[BBox, str],
+    layers: List[str],
+    resample_res: int = 30,
+    output_crs: Optional[str] = None,
+) -> JobEstimate:
+    """Estimate the size and duration of a job before submitting it.
+
+    The pixel count is the area of the bounding box's envelope in the output projection (the native LANDFIRE Albers projection if `output_crs` is None) divided by the squared resolution. Envelopes are computed with `pyproj` if installed, otherwise the equal area of the bounding box is used. Every layer takes its catalog byte width per pixel and is compressed by the typical ratio of its theme (`COMPRESSION_RATIOS`). The duration adds the service overhead, processing of the uncompressed bytes and the download.
+
+    Args:
+        bbox: Bounding box (`BBox` or `min_x min_y max_x max_y` string).
+        layers: List of product layers.
+        resample_res: Output resolution in meters.
+        output_crs: Output projection as an EPSG WKID, None for the native LANDFIRE projection.
+
+    Returns:
+        JobEstimate.
+
+    Raises:
+        RuntimeError: If the bounding box can't be parsed (i.e. map zone numbers) or a layer is not in the catalog.
+    """
+    try:
+        box = BBox.parse(bbox)
+    except ValueError as exc:
+        raise RuntimeError(f"Unable to estimate job size! {exc}")
+
+    index = get_index()
+    unknown = [layer for layer in layers if layer not in index.layer_products]
+    if unknown:
+        raise RuntimeError(
+            f"Unable to estimate job size for layers not in the catalog: {', '.join(unknown)}."
+        )
+
+    pixels = math.ceil(_output_area(box, output_crs) / resample_res**2)
+    uncompressed = 0.0
+    compressed = 0.0
+    for layer in layers:
+        product = index.products[index.layer_products[layer]]
+        size = pixels * product.byte_width
+        uncompressed += size
+        compressed += size / COMPRESSION_RATIOS.get(product.theme, 1.0)
+    seconds = (
+        JOB_OVERHEAD_SECONDS
+        + uncompressed / PROCESSING_BYTES_PER_SECOND
+        + compressed / DOWNLOAD_BYTES_PER_SECOND
+    )
+    return JobEstimate(
+        pixels=pixels,
+        layers=len(layers),
+        uncompressed_bytes=int(uncompressed),
+        compressed_bytes=math.ceil(compressed),
+        seconds=seconds,
+    )
@@ -1,19 +1,38 @@
-"""Landfire geospatial utilities. These exist for user convenience."""
+"""Landfire geospatial utilities. These exist for user convenience.
+
+Optional dependencies from `landfire[geospatial]` are imported when a function needs them rather than at module import.
+"""
+import json
+import math
+import os
+import re
+import warnings
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from fiona.errors import DriverError
+from landfire._geotiff import read_geotiff_extent
+from landfire._optional import import_optional
 
 
-try:
+if TYPE_CHECKING:  # pragma: no cover
     import geojson
-    import geopandas as gpd
-except ImportError as exc:  # pragma: no cover
-    raise RuntimeError(
-        f"Failed to import `{exc.name}`."
-        f"Please install `landfire[geospatial]` in order to use functions in geospatial.py."
-    )
+    import numpy as np
+
+
+# (min_x, min_y, max_x, max_y)
+Bounds = Tuple[float, float, float, float]
 
 
 class GeospatialDriver(str, Enum):
@@ -25,11 +44,70 @@ class GeospatialDriver(str, Enum):
     esrijson = "ESRIJSON"
     sqlite = "SQLite"
     flatgeobuf = "FlatGeobuf"
+    geopackage = "GPKG"
+    geotiff = "GTiff"
+
+
+def _get_polygons_bounds(polygons: Sequence["geojson.Polygon"]) -> Any:
+    """Get the bounds of many GeoJSON polygons at once.
+
+    The coordinates of all polygons are stacked into one NumPy array and reduced per polygon.
+
+    Returns:
+        Array of shape (n, 4) with `min_x, min_y, max_x, max_y` of each polygon.
+
+    Raises:
+        RuntimeError: If a polygon has no coordinates.
+    """
+    numpy = import_optional("numpy")
+    arrays = []
+    offsets = []
+    size = 0
+    for i, polygon in enumerate(polygons):
+        rings = [numpy.asarray(ring, dtype=float) for ring in polygon["coordinates"]]
+        rings = [ring[:, :2] for ring in rings if ring.size]
+        if not rings:
+            raise RuntimeError(f"Polygon {i} has no coordinates.")
+        offsets.append(size)
+        arrays.extend(rings)
+        size += sum(len(ring) for ring in rings)
+    if not arrays:
+        return numpy.empty((0, 4))
+    coords = numpy.concatenate(arrays)
+    return numpy.hstack(
+        [
+            numpy.minimum.reduceat(coords, offsets),
+            numpy.maximum.reduceat(coords, offsets),
+        ]
+    )
+
+
+def get_bboxes_from_polygons(
+    aoi_polygons: Sequence["geojson.Polygon"], crs: str = "4326"
+) -> List[str]:
+    """Given many GeoJSON polygons, convert each to a string bounding box like `get_bbox_from_polygon()`.
 
+    Bounds of all polygons are computed in one vectorized NumPy call and the densified extents of all polygons are reprojected with a single transformer call (see `reproject_bounds()`).
 
-def get_bbox_from_polygon(aoi_polygon: geojson.Polygon, crs: str = "4326") -> str:
+    Args:
+        aoi_polygons: GeoJSON Polygon objects.
+        crs: Coordinate reference system of all polygons in well-known integer ID (WKID) format (EPSG). Defaults to `4326` or WGS84.
+
+    Returns:
+        bounding box of each GeoJSON Polygon object as a string, in order.
+
+    Raises:
+        RuntimeError: If a polygon has no coordinates or a reprojected bounding box crosses the antimeridian.
+    """
+    bounds = _reproject_bounds_array(_get_polygons_bounds(aoi_polygons), crs)
+    return [_format_bbox((x0, y0, x1, y1)) for x0, y0, x1, y1 in bounds.tolist()]
+
+
+def get_bbox_from_polygon(aoi_polygon: "geojson.Polygon", crs: str = "4326") -> str:
     """Given a GeoJSON polygon, convert to a string bounding box with form `min_x, min_y, max_x, max_y` in CRS 4326 (WGS84).
 
+    Bounds are computed from the coordinate arrays with NumPy and only the extent of the polygon is reprojected (see `reproject_bounds()`), so the cost barely depends on the number of vertices. Use `get_bboxes_from_polygons()` for many polygons.
+
     Args:
         aoi_polygon: GeoJSON Polygon object representing your area of interest.
         crs: Coordinate reference system in well-known integer ID (WKID) format (EPSG). Defaults to `4326` or WGS84. See https://epsg.io for a full list of EPSG WKIDs.
@@ -37,9 +115,549 @@ def get_bbox_from_polygon(aoi_polygon: geojson.Polygon, crs: str = "4326") -> st
     Returns:
         bounding box of the GeoJSON Polygon object as a string.
     """
-    gdf = gpd.GeoDataFrame(index=[0], crs=crs, geometry=[aoi_polygon]).to_crs(4326)
+    x0, y0, x1, y1 = _get_polygons_bounds([aoi_polygon])[0].tolist()
+    return _format_bbox(reproject_bounds((x0, y0, x1, y1), crs))
+
+
+def _get_feature_bounds(features: Iterable[Any]) -> Bounds:
+    """Union the bounds of features one at a time without holding them in memory.
+
+    Args:
+        features: Iterable of GeoJSON-like features.
+
+    Returns:
+        Bounds `(min_x, min_y, max_x, max_y)` of all feature geometries.
+
+    Raises:
+        RuntimeError: If no feature has a geometry.
+    """
+    fiona = import_optional("fiona")
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+    for feature in features:
+        if feature.geometry is None:
+            continue
+        x0, y0, x1, y1 = fiona.bounds(feature.geometry)
+        min_x, min_y = min(min_x, x0), min(min_y, y0)
+        max_x, max_y = max(max_x, x1), max(max_y, y1)
+    if min_x > max_x:
+        raise RuntimeError("Unable to compute a bounding box, file has no geometries.")
+    return min_x, min_y, max_x, max_y
+
+
+def _get_layer_bounds(src: Any) -> Bounds:
+    """Get the extent of an open fiona Collection.
+
+    The extent is read from metadata where the format stores one (shapefile header, GeoPackage `gpkg_contents`/RTree, FlatGeobuf header). Other formats are scanned by OGR, and if the driver can't compute an extent at all feature bounds are streamed instead. A GeoDataFrame is never built.
+
+    Args:
+        src: Open fiona Collection.
+
+    Returns:
+        Bounds `(min_x, min_y, max_x, max_y)` in the CRS of the collection.
+    """
+    DriverError = import_optional("fiona.errors").DriverError  # noqa: N806
+    try:
+        bounds: Bounds = tuple(src.bounds)
+    except DriverError:
+        return _get_feature_bounds(src)
+    # OGR reports an inverted or non-finite extent for layers it can't summarize
+    if not all(math.isfinite(v) for v in bounds) or bounds[0] > bounds[2]:
+        return _get_feature_bounds(src)
+    return bounds
+
+
+def _get_layer_bounds_4326(src: Any) -> Bounds:
+    """Get the extent of an open fiona Collection in 4326 (needed for Landfire API).
+
+    Args:
+        src: Open fiona Collection.
+
+    Returns:
+        Bounds `(min_x, min_y, max_x, max_y)` in 4326.
+
+    Raises:
+        RuntimeError: If the collection has no CRS.
+    """
+    if not src.crs:
+        raise RuntimeError(
+            "Unable to reproject bounding box to 4326, file has no coordinate reference system."
+        )
+    return reproject_bounds(_get_layer_bounds(src), src.crs.to_wkt())
+
+
+@lru_cache(maxsize=32)
+def _get_transformer(crs: str) -> Any:
+    """Get a (cached) transformer from crs to 4326, or None if crs is 4326 already."""
+    # Bounds in 4326 are already the answer, don't import pyproj for them
+    if crs.strip().upper() in ("4326", "EPSG:4326"):
+        return None
+    pyproj = import_optional("pyproj")
+    source = pyproj.CRS.from_user_input(f"EPSG:{crs}" if crs.isdigit() else crs)
+    if source.to_epsg() == 4326:
+        return None
+    return pyproj.Transformer.from_crs(source, 4326, always_xy=True)
+
+
+def reproject_bounds(bounds: Bounds, crs: str, densify_pts: int = 21) -> Bounds:
+    """Reproject bounds to 4326 (WGS84) without touching the geometries they came from.
+
+    The boundary of the extent is densified with `densify_pts` points per edge before it is transformed, so curved edges (i.e. the parallels of a conic projection) are accounted for. Extents containing a pole extend to latitude ±90. Transformers are cached per CRS.
+
+    Args:
+        bounds: Bounds `(min_x, min_y, max_x, max_y)` in `crs`.
+        crs: Coordinate reference system of the bounds as a WKID (i.e. `3857`), authority string (`EPSG:3857`) or WKT.
+        densify_pts: Number of points to add along each edge of the extent.
+
+    Returns:
+        Bounds in 4326. If the extent crosses the antimeridian, `min_x` is greater than `max_x`.
+    """
+    transformer = _get_transformer(str(crs))
+    if transformer is None:
+        return bounds
+    x0, y0, x1, y1 = transformer.transform_bounds(*bounds, densify_pts=densify_pts)
+    return x0, y0, x1, y1
+
+
+@lru_cache(maxsize=32)
+def _get_poles(crs: str) -> Tuple[Tuple[float, float], ...]:
+    """Get the north and south pole in coordinates of crs (non-finite if not representable)."""
+    transformer = _get_transformer(crs)
+    poles = []
+    for lat in (90.0, -90.0):
+        try:
+            x, y = transformer.transform(0.0, lat, direction="INVERSE", errcheck=True)
+        except Exception:
+            x = y = math.nan
+        poles.append((x, y))
+    return tuple(poles)
+
+
+def _reproject_bounds_array(bounds: Any, crs: str, densify_pts: int = 21) -> Any:
+    """Reproject an (n, 4) array of bounds to 4326, like `reproject_bounds()` for every row.
+
+    The densified extents of all rows are transformed in one call. Rows whose result may cross the antimeridian or whose extent contains a pole are redone with `reproject_bounds()`, which handles both.
+    """
+    transformer = _get_transformer(str(crs))
+    if transformer is None or not len(bounds):
+        return bounds
+    numpy = import_optional("numpy")
+    x0, y0, x1, y1 = (bounds[:, [k]] for k in range(4))
+    t = numpy.linspace(0.0, 1.0, densify_pts + 2)
+    zeros = numpy.zeros_like(t)
+    # Bottom, right, top and left edge of every extent
+    xs = numpy.hstack([x0 + (x1 - x0) * t, x1 + zeros, x1 - (x1 - x0) * t, x0 + zeros])
+    ys = numpy.hstack([y0 + zeros, y0 + (y1 - y0) * t, y1 + zeros, y1 - (y1 - y0) * t])
+    lon, lat = transformer.transform(xs, ys)
+    result = numpy.column_stack(
+        [lon.min(axis=1), lat.min(axis=1), lon.max(axis=1), lat.max(axis=1)]
+    )
+
+    exact = ~numpy.isfinite(result).all(axis=1) | (result[:, 2] - result[:, 0] > 180)
+    for px, py in _get_poles(str(crs)):
+        exact |= (
+            (x0[:, 0] <= px) & (px <= x1[:, 0]) & (y0[:, 0] <= py) & (py <= y1[:, 0])
+        )
+    for i in numpy.flatnonzero(exact):
+        result[i] = reproject_bounds(tuple(bounds[i]), crs, densify_pts)
+    return result
+
+
+def _format_bbox(bounds: Bounds) -> str:
+    """Format 4326 bounds as a LANDFIRE bounding box string.
+
+    Raises:
+        RuntimeError: If the bounds cross the antimeridian.
+    """
+    if bounds[0] > bounds[2]:
+        raise RuntimeError(
+            "Bounding box crosses the antimeridian, which the LANDFIRE API does not support. Please split your area of interest at 180° longitude."
+        )
+    return " ".join(str(x) for x in bounds)
+
+
+# JSON tokens: a string (escapes included), a structural character or any other scalar
+_JSON_TOKEN = re.compile(r'\s*(?:("(?:[^"\\]|\\.)*")|([{}\[\]:,])|([^\s{}\[\]:,"]+))')
+# Closing bracket of a `coordinates` value, followed by the end of its object or the next key
+_GEOJSON_COORDS_END = re.compile(r'\](?=\s*(?:\}|,\s*"))')
+# First two numbers of every position (innermost array)
+_NUMBER = r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?"
+_GEOJSON_POSITION = re.compile(rf"\[\s*({_NUMBER})\s*,\s*({_NUMBER})")
+# Removes opening brackets and whitespace from `coordinates` values
+_GEOJSON_STRIP = str.maketrans(dict.fromkeys("[ \t\r\n"))
+
+# Characters read from a GeoJSON file at once
+GEOJSON_CHUNK_SIZE = 1 << 20
+
+
+class _GeoJSONScanner:
+    """Incremental reader of the positions of a GeoJSON document, keeping running bounds.
+
+    The structure of the document is followed token by token, so only `coordinates` members outside of `properties` count as geometry and only a top-level `crs` member as legacy CRS. The numeric `coordinates` values themselves are parsed in bulk.
+    """
+
+    def __init__(self) -> None:
+        """Class init."""
+        self.numpy = import_optional("numpy")
+        self.bounds = self.numpy.array([math.inf, math.inf, -math.inf, -math.inf])
+        self.has_crs = False
+        self.in_coords = False
+        self.buf = ""
+        # Open containers (`{` or `[`) and the current member name of each (None for arrays)
+        self.stack: List[str] = []
+        self.keys: List[Optional[str]] = []
+        # Last string token, the member name if a `:` follows
+        self.string: Optional[str] = None
+        # Whether the next value is the `coordinates` of a geometry
+        self.coords_next = False
+
+    def _get_positions(self, text: str) -> Any:
+        """Parse the positions in text to an (n, 2) array of x, y values."""
+        numpy = self.numpy
+        compact = text.translate(_GEOJSON_STRIP)
+        # Positions are closed by a `]` that doesn't follow another `]`. A leading `]` closes
+        # a position carried over from the previous chunk, which was counted there.
+        closes = numpy.frombuffer(compact.encode("ascii", "replace"), numpy.uint8) == 93
+        count = int(numpy.count_nonzero(closes[1:] & ~closes[:-1]))
+        values = numpy.array(compact.replace("]", " ").replace(",", " ").split(), float)
+        for dims in (2, 3):
+            if len(values) == dims * count:
+                return values.reshape(-1, dims)[:, :2]
+        # Mixed dimensions, fall back to matching every position
+        return numpy.array(_GEOJSON_POSITION.findall(text), dtype=float).reshape(-1, 2)
+
+    def update(self, text: str) -> None:
+        """Update the bounds with all positions in text (the `coordinates` values of a whole chunk)."""
+        xy = self._get_positions(text)
+        if len(xy):
+            self.bounds[:2] = self.numpy.minimum(self.bounds[:2], xy.min(axis=0))
+            self.bounds[2:] = self.numpy.maximum(self.bounds[2:], xy.max(axis=0))
+
+    def _token(self, match: "re.Match[str]") -> bool:
+        """Follow the document structure by one token.
+
+        Returns:
+            Whether the token opens the `coordinates` value of a geometry.
+        """
+        string, punct = match.group(1), match.group(2)
+        coords_next, self.coords_next = self.coords_next, False
+        if string is not None:
+            self.string = string
+        elif punct == ":" and self.keys and self.string is not None:
+            key = json.loads(self.string)
+            self.keys[-1] = key
+            self.has_crs |= key == "crs" and len(self.stack) == 1
+            self.coords_next = key == "coordinates" and "properties" not in self.keys
+        elif punct in ("{", "["):
+            if coords_next and punct == "[":
+                return True
+            self.stack.append(punct)
+            self.keys.append(None)
+        elif punct in ("}", "]") and self.stack:
+            self.stack.pop()
+            self.keys.pop()
+        return False
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of the document, keeping incomplete data for the next call."""
+        buf = self.buf + chunk
+        pos = 0
+        # `coordinates` values in this chunk, parsed together once the chunk is consumed
+        segments = []
+        while True:
+            if not self.in_coords:
+                match = _JSON_TOKEN.match(buf, pos)
+                # Strings and scalars might continue in the next chunk
+                if match is None or (match.group(3) and match.end() == len(buf)):
+                    self.buf = buf[pos:]
+                    break
+                self.in_coords = self._token(match)
+                # A `coordinates` value is parsed from its opening bracket
+                pos = match.start(2) if self.in_coords else match.end()
+                continue
+            match = _GEOJSON_COORDS_END.search(buf, pos)
+            if match is None:
+                # Positions complete so far end at the last closing bracket. It is kept in the
+                # buffer too since it might turn out to close the `coordinates` value.
+                last = buf.rfind("]", pos)
+                if last != -1:
+                    segments.append(buf[pos : last + 1])
+                    pos = last
+                self.buf = buf[pos:]
+                break
+            segments.append(buf[pos : match.end()])
+            pos = match.end()
+            self.in_coords = False
+        self.update(" ".join(segments))
+
+    def get_bounds(self) -> Optional[Bounds]:
+        """Bounds of all positions consumed so far, None if there are none."""
+        if self.bounds[0] > self.bounds[2]:
+            return None
+        x0, y0, x1, y1 = (float(v) for v in self.bounds)
+        return x0, y0, x1, y1
+
+
+def _scan_geojson(path: Path, chunk_size: int) -> Tuple[Optional[Bounds], bool]:
+    """Stream the positions of a GeoJSON file, keeping running bounds.
+
+    Returns:
+        Bounds of all positions (None if there are none) and whether the file has a top-level legacy `crs` member.
+    """
+    scanner = _GeoJSONScanner()
+    with open(path, encoding="utf-8", errors="replace") as fd:
+        for chunk in iter(lambda: fd.read(chunk_size), ""):
+            scanner.feed(chunk)
+    return scanner.get_bounds(), scanner.has_crs
 
-    return " ".join(str(x) for x in gdf.total_bounds)
+
+def get_geojson_bounds(
+    aoi_file_path: str, chunk_size: int = GEOJSON_CHUNK_SIZE
+) -> Bounds:
+    """Get the bounds of all coordinates in a GeoJSON file without loading it.
+
+    The file is read in chunks of `chunk_size` characters and tokenized to find the `coordinates` members of geometries, ignoring anything within `properties`. Their positions are parsed in bulk, keeping running minimum and maximum values with NumPy. Memory use is constant regardless of file size.
+
+    Args:
+        aoi_file_path: Path-like string to a GeoJSON file.
+        chunk_size: Number of characters read at once.
+
+    Returns:
+        Bounds `(min_x, min_y, max_x, max_y)` in the coordinates of the file, which are 4326 (WGS84) for RFC 7946 GeoJSON.
+
+    Raises:
+        RuntimeError: If the file has no coordinates.
+    """
+    bounds, _ = _scan_geojson(Path(aoi_file_path), chunk_size)
+    if bounds is None:
+        raise RuntimeError("Unable to compute a bounding box, file has no geometries.")
+    return bounds
+
+
+def _get_geojson_bbox(fpath: Path, driver: Optional[GeospatialDriver]) -> Optional[str]:
+    """Get the bounding box of a GeoJSON file with the streaming reader, if it applies.
+
+    Returns:
+        Bounding box string, or None if the file should be read with fiona instead (not GeoJSON, no geometries or a top-level legacy `crs` member).
+    """
+    if driver not in (None, GeospatialDriver.geojson):
+        return None
+    if fpath.suffix.lower() not in (".geojson", ".json") or not fpath.is_file():
+        return None
+    bounds, has_crs = _scan_geojson(fpath, GEOJSON_CHUNK_SIZE)
+    if bounds is None or has_crs:
+        return None
+    return _format_bbox(bounds)
+
+
+# Rows read from a CSV file at once
+CSV_CHUNK_ROWS = 1_000_000
+
+# Column names detected (case insensitive) if not provided, following the GDAL CSV driver
+_CSV_X_COLUMNS = ("x", "lon", "long", "longitude", "lng")
+_CSV_Y_COLUMNS = ("y", "lat", "latitude")
+_CSV_WKT_COLUMNS = ("wkt", "geometry", "geom", "the_geom")
+
+
+def _find_column(columns: Sequence[str], candidates: Sequence[str]) -> Optional[str]:
+    """Find the first column whose lower case name is one of candidates."""
+    lower = {column.lower(): column for column in columns}
+    return next((lower[name] for name in candidates if name in lower), None)
+
+
+def _get_csv_columns(
+    path: Path,
+    x_column: Optional[str],
+    y_column: Optional[str],
+    wkt_column: Optional[str],
+    delimiter: str,
+) -> Tuple[List[str], bool]:
+    """Resolve the coordinate columns of a CSV file.
+
+    Returns:
+        The x and y columns or the WKT column, and whether the columns hold WKT.
+
+    Raises:
+        RuntimeError: If the coordinate columns can't be found.
+    """
+    if wkt_column is not None:
+        return [wkt_column], True
+    if x_column is not None and y_column is not None:
+        return [x_column, y_column], False
+
+    pandas = import_optional("pandas")
+    columns = list(pandas.read_csv(path, sep=delimiter, nrows=0).columns)
+    x_column = x_column or _find_column(columns, _CSV_X_COLUMNS)
+    y_column = y_column or _find_column(columns, _CSV_Y_COLUMNS)
+    if x_column is not None and y_column is not None:
+        return [x_column, y_column], False
+    wkt_column = _find_column(columns, _CSV_WKT_COLUMNS)
+    if wkt_column is not None:
+        return [wkt_column], True
+    raise RuntimeError(
+        "Unable to find coordinate columns in CSV file. Please provide `x_column` and `y_column` or `wkt_column`."
+    )
+
+
+def _get_csv_chunk_bounds(
+    chunk: Any, columns: List[str], is_wkt: bool, path: Path
+) -> "np.ndarray":
+    """Get the bounds of each row of a chunk of CSV coordinate columns read as strings.
+
+    Raises:
+        RuntimeError: If a coordinate column has a value that isn't a number or WKT.
+    """
+    numpy = import_optional("numpy")
+    if is_wkt:
+        shapely = import_optional("shapely")
+        wkt = chunk[columns[0]].dropna().to_numpy()
+        try:
+            geometries = shapely.from_wkt(wkt)
+        except shapely.errors.ShapelyError as exc:
+            raise RuntimeError(
+                f"Unable to parse WKT in column `{columns[0]}` of {path}! {exc}"
+            )
+        bounds: "np.ndarray" = shapely.bounds(geometries)
+        return bounds
+    pandas = import_optional("pandas")
+    xy = []
+    for column in columns:
+        try:
+            xy.append(pandas.to_numeric(chunk[column], errors="raise").to_numpy(float))
+        except (TypeError, ValueError) as exc:
+            raise RuntimeError(
+                f"Unable to read coordinates in column `{column}` of {path}! {exc}"
+            )
+    bounds = numpy.column_stack(xy * 2)
+    return bounds
+
+
+def get_csv_bounds(
+    aoi_file_path: str,
+    x_column: Optional[str] = None,
+    y_column: Optional[str] = None,
+    wkt_column: Optional[str] = None,
+    delimiter: str = ",",
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> Bounds:
+    """Get the bounds of the coordinates in a CSV file without building geometries for all rows.
+
+    Only the coordinate columns are parsed, `chunk_rows` rows at a time, and running minimum and maximum values are kept with NumPy, so memory use is bounded regardless of file size. Coordinates are either separate x/y (longitude/latitude) columns or a WKT column, whose geometries are parsed one chunk at a time.
+
+    If no columns are provided, they are detected from the header like the GDAL CSV driver does: `x`, `lon`, `long`, `longitude` or `lng` and `y`, `lat` or `latitude` for coordinates, or `wkt`, `geometry`, `geom` or `the_geom` for WKT (case insensitive). Rows with missing coordinates are skipped.
+
+    Args:
+        aoi_file_path: Path-like string to a CSV file.
+        x_column: Name of the x (longitude) column.
+        y_column: Name of the y (latitude) column.
+        wkt_column: Name of a column with WKT geometries. Takes precedence over x/y columns.
+        delimiter: Field delimiter.
+        chunk_rows: Number of rows read at once.
+
+    Returns:
+        Bounds `(min_x, min_y, max_x, max_y)` in the coordinates of the file.
+
+    Raises:
+        RuntimeError: If the coordinate columns can't be found, hold values that aren't coordinates, or the file has no coordinates.
+    """
+    pandas = import_optional("pandas")
+    numpy = import_optional("numpy")
+    path = Path(aoi_file_path)
+    columns, is_wkt = _get_csv_columns(path, x_column, y_column, wkt_column, delimiter)
+
+    bounds = numpy.array([math.inf, math.inf, -math.inf, -math.inf])
+    reader = pandas.read_csv(
+        path,
+        sep=delimiter,
+        usecols=columns,
+        dtype=str,
+        chunksize=chunk_rows,
+    )
+    with reader:
+        for chunk in reader:
+            chunk_bounds = _get_csv_chunk_bounds(chunk, columns, is_wkt, path)
+            with warnings.catch_warnings():
+                # All NaN chunks
+                warnings.simplefilter("ignore", RuntimeWarning)
+                low = numpy.nanmin(chunk_bounds[:, :2], axis=0, initial=math.inf)
+                high = numpy.nanmax(chunk_bounds[:, 2:], axis=0, initial=-math.inf)
+            bounds[:2] = numpy.minimum(bounds[:2], low)
+            bounds[2:] = numpy.maximum(bounds[2:], high)
+
+    if not bounds[0] <= bounds[2]:
+        raise RuntimeError("Unable to compute a bounding box, file has no coordinates.")
+    x0, y0, x1, y1 = bounds.tolist()
+    return x0, y0, x1, y1
+
+
+def _get_csv_bbox(fpath: Path, driver: Optional[GeospatialDriver]) -> Optional[str]:
+    """Get the bounding box of a CSV file with coordinates in 4326, if the file is one.
+
+    Returns:
+        Bounding box string, or None if the file is not a CSV file.
+    """
+    if driver is None and fpath.suffix.lower() != ".csv":
+        return None
+    if driver not in (None, GeospatialDriver.csv):
+        return None
+    return _format_bbox(get_csv_bounds(str(fpath)))
+
+
+def _get_raster_bbox(fpath: Path, driver: Optional[GeospatialDriver]) -> Optional[str]:
+    """Get the bounding box of a GeoTIFF from its header, if the file is one.
+
+    The header is parsed directly, falling back to rasterio (which also only reads the header) for GeoTIFFs with a user defined CRS.
+
+    Returns:
+        Bounding box string, or None if the file is not a raster.
+
+    Raises:
+        RuntimeError: If the raster can't be read.
+    """
+    if driver is None and fpath.suffix.lower() not in (".tif", ".tiff"):
+        return None
+    if driver not in (None, GeospatialDriver.geotiff):
+        return None
+    if not fpath.is_file():
+        raise RuntimeError(
+            "Unable to read file. Are you sure the correct file path was provided?"
+        )
+
+    extent = read_geotiff_extent(str(fpath))
+    if extent is None:
+        rasterio = import_optional("rasterio", extra="raster")
+        try:
+            with rasterio.open(fpath) as src:
+                if src.crs is None:
+                    raise RuntimeError(
+                        "Unable to reproject bounding box to 4326, file has no coordinate reference system."
+                    )
+                extent = tuple(src.bounds), src.crs.to_wkt()
+        except rasterio.errors.RasterioIOError:
+            raise RuntimeError(
+                f"Unable to read file with driver `{GeospatialDriver.geotiff.value}`. Are you sure this is the correct driver for this file?"
+            )
+    bounds, crs = extent
+    return _format_bbox(reproject_bounds(bounds, crs))
+
+
+def _validate_driver(
+    driver: Optional[GeospatialDriver],
+) -> Optional[GeospatialDriver]:
+    """Validate a user provided driver.
+
+    Raises:
+        RuntimeError: If driver is not a valid member of GeospatialDriver enum.
+    """
+    if not driver:
+        return None
+    try:
+        assert driver in GeospatialDriver._value2member_map_
+    except (AssertionError, TypeError):
+        raise RuntimeError(
+            f"`{driver}` is not a valid driver type! Supported drivers are {'.'.join([e.name for e in GeospatialDriver])}."
+        )
+    return GeospatialDriver(driver)
 
 
 def get_bbox_from_file(
@@ -54,6 +672,10 @@ def get_bbox_from_file(
     - CSV
     - FlatGeobuf
     - SQLite
+    - GeoPackage
+    - GeoTIFF (raster)
+
+    The extent is read from file metadata where the format has it (shapefile header, GeoPackage `gpkg_contents`, FlatGeobuf header), otherwise feature bounds are streamed. GeoJSON files are streamed with `get_geojson_bounds()`. For GeoTIFF rasters only the header is read, so the cost doesn't depend on the raster size. CSV files are read in chunks with `get_csv_bounds()` using detected coordinate columns, and their coordinates are assumed to be longitude/latitude in 4326. Features are never loaded into a GeoDataFrame, so this is fast and memory efficient for large files. Only the extent is reprojected to 4326 (see `reproject_bounds()`).
 
     Args:
         aoi_file_path: Path-like string to area of interest file.
@@ -63,10 +685,13 @@ def get_bbox_from_file(
         bounding box of the as a string.
 
     Raises:
-        RuntimeError: If provided path is not able to be parsed as a Path object or if provided driver is not a valid member of GeospatialDriver enum.
+        RuntimeError: If provided path is not able to be parsed as a Path object, if provided driver is not a valid member of GeospatialDriver enum, if the file has no CRS or if the bounding box crosses the antimeridian.
         DriverError: If driver and file type do not match.
 
     """
+    fiona = import_optional("fiona")
+    DriverError = import_optional("fiona.errors").DriverError  # noqa: N806
+
     # Validate user provided path
     try:
         fpath = Path(aoi_file_path)
@@ -74,30 +699,275 @@ def get_bbox_from_file(
         raise RuntimeError(f"`{aoi_file_path}` is not a valid path.")
 
     # Validate user provided driver
-    if driver:
-        try:
-            assert driver in GeospatialDriver._value2member_map_
-        except (AssertionError, TypeError):
-            raise RuntimeError(
-                f"`{driver}` is not a valid driver type! Supported drivers are {'.'.join([e.name for e in GeospatialDriver])}."
-            )
+    driver = _validate_driver(driver)
 
+    # Rasters are read from their header, GeoJSON and CSV are streamed, everything else goes through OGR
+    bbox = (
+        _get_raster_bbox(fpath, driver)
+        or _get_geojson_bbox(fpath, driver)
+        or _get_csv_bbox(fpath, driver)
+    )
+    if bbox is not None:
+        return bbox
+
+    if driver:
         try:
-            # Read file into gdf, leverage user provided driver
-            gdf: gpd.GeoDataFrame = gpd.read_file(fpath, driver=driver)
+            # Open file with the user provided driver, features are not read yet
+            src = fiona.open(fpath, driver=driver.value)
         except DriverError:
             raise DriverError(
-                f"Unable to read file with driver `{driver}`. Are you sure this is the correct driver for this file?"
+                f"Unable to read file with driver `{driver.value}`. Are you sure this is the correct driver for this file?"
             )
     else:
         # Try to infer driver
         try:
-            gdf = gpd.read_file(fpath)
+            src = fiona.open(fpath)
         except DriverError:
             raise RuntimeError(
                 "Unable to read file. Are you sure the correct file path was provided?"
             )
-    # 4326 is needed for Landfire API
-    gdf = gdf.to_crs(4326)
 
-    return " ".join(str(x) for x in gdf.total_bounds)
+    with src:
+        return _format_bbox(_get_layer_bounds_4326(src))
+
+
+class BBoxResult(NamedTuple):
+    """Bounding box (or error) of one file from `get_bboxes_from_files()`.
+
+    A NamedTuple rather than an attrs class so that importing this module stays free of dependencies.
+
+    Args:
+        position: Position of the file in the input.
+        path: Path of the file.
+        bbox: Bounding box string as returned by `get_bbox_from_file()`. None if it failed.
+        error: Error message if the bounding box could not be computed.
+    """
+
+    position: int
+    path: str
+    bbox: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _get_bbox_task(task: Tuple[int, str, Optional[GeospatialDriver]]) -> BBoxResult:
+    """Compute the bounding box of one file, capturing errors. Runs in pool workers."""
+    position, path, driver = task
+    try:
+        return BBoxResult(position, path, bbox=get_bbox_from_file(path, driver=driver))
+    except Exception as exc:
+        return BBoxResult(position, path, error=f"{type(exc).__name__}: {exc}")
+
+
+def get_bboxes_from_files(
+    aoi_file_paths: Sequence[str],
+    driver: Optional[GeospatialDriver] = None,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    chunksize: Optional[int] = None,
+) -> Iterator[BBoxResult]:
+    """Compute the bounding boxes of many files in parallel with `get_bbox_from_file()`.
+
+    Files are handed to a pool of worker processes in chunks. Each worker keeps its reprojection transformers cached between files. Results are yielded as they become available, so long lists can be processed incrementally. A file that fails does not stop the batch, its error is reported in its result instead.
+
+    Args:
+        aoi_file_paths: Path-like strings of area of interest files.
+        driver: Optional file driver used for every file. See `get_bbox_from_file()`.
+        workers: Number of worker processes. Defaults to the number of CPUs. With 1 worker files are processed in the current process.
+        ordered: Whether to yield results in input order (True) or in order of completion (False).
+        chunksize: Number of files sent to a worker at once. Defaults to splitting the files into about four chunks per worker, at most 64 files each.
+
+    Yields:
+        BBoxResult for every file.
+    """
+    tasks = [(i, str(path), driver) for i, path in enumerate(aoi_file_paths)]
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if workers == 1:
+        yield from map(_get_bbox_task, tasks)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+    import multiprocessing
+
+    with multiprocessing.Pool(workers) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_get_bbox_task, tasks, chunksize=chunksize)
+
+
+def get_feature_bboxes(
+    aoi_file_path: str, driver: Optional[GeospatialDriver] = None
+) -> List[Bounds]:
+    """Get the bounding box of every feature in a file in 4326 (WGS84).
+
+    Feature bounds are computed at once with `GeoDataFrame.bounds` in the CRS of the file and only the bounds are reprojected, all in one call (see `reproject_bounds()`). Features without geometry are skipped.
+
+    Args:
+        aoi_file_path: Path-like string to area of interest file.
+        driver: Optional file driver. See `get_bbox_from_file()`.
+
+    Returns:
+        Bounds `(min_x, min_y, max_x, max_y)` of each feature, in file order.
+
+    Raises:
+        RuntimeError: If provided driver is not a valid member of GeospatialDriver enum, if the file can't be read or if it has no CRS.
+    """
+    gpd = import_optional("geopandas")
+    DriverError = import_optional("fiona.errors").DriverError  # noqa: N806
+
+    driver = _validate_driver(driver)
+    kwargs = {} if driver is None else {"driver": driver.value}
+    try:
+        gdf = gpd.read_file(Path(aoi_file_path), engine="fiona", **kwargs)
+    except DriverError:
+        raise RuntimeError(
+            "Unable to read file. Are you sure the correct file path and driver were provided?"
+        )
+    if gdf.crs is None:
+        raise RuntimeError(
+            "Unable to reproject bounding boxes to 4326, file has no coordinate reference system."
+        )
+
+    gdf = gdf[~(gdf.geometry.isna() | gdf.geometry.is_empty)]
+    bounds = _reproject_bounds_array(gdf.bounds.to_numpy(dtype=float), gdf.crs.to_wkt())
+    return [(x0, y0, x1, y1) for x0, y0, x1, y1 in bounds.tolist()]
+
+
+def _grow_bboxes(boxes: "np.ndarray", min_size: float) -> "np.ndarray":
+    """Grow boxes narrower or lower than min_size to min_size around their center."""
+    numpy = import_optional("numpy")
+    center = (boxes[:, :2] + boxes[:, 2:]) / 2
+    half = numpy.maximum(boxes[:, 2:] - boxes[:, :2], min_size) / 2
+    grown: "np.ndarray" = numpy.concatenate([center - half, center + half], axis=1)
+    return grown
+
+
+def _merge_waste(box: "np.ndarray", others: "np.ndarray") -> "np.ndarray":
+    """Get the fraction of the union of box with each of others not covered by the two boxes."""
+    numpy = import_optional("numpy")
+    union = numpy.concatenate(
+        [numpy.minimum(others[:, :2], box[:2]), numpy.maximum(others[:, 2:], box[2:])],
+        axis=1,
+    )
+    union_area = (union[:, 2] - union[:, 0]) * (union[:, 3] - union[:, 1])
+    area = (others[:, 2] - others[:, 0]) * (others[:, 3] - others[:, 1])
+    overlap = numpy.clip(
+        numpy.minimum(others[:, 2:], box[2:]) - numpy.maximum(others[:, :2], box[:2]),
+        0,
+        None,
+    )
+    # Area covered by the two boxes, counting their intersection once
+    covered = (
+        area + (box[2] - box[0]) * (box[3] - box[1]) - overlap[:, 0] * overlap[:, 1]
+    )
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        waste: "np.ndarray" = numpy.where(union_area > 0, 1 - covered / union_area, 0.0)
+    return waste
+
+
+def _cluster_pass(
+    boxes: "np.ndarray", sized: "np.ndarray", max_waste: float
+) -> Tuple[bool, "np.ndarray", "np.ndarray"]:
+    """Run one greedy merging pass over boxes, measuring waste on sized. See `cluster_bboxes()`.
+
+    Candidate pairs come from an STRtree query with a margin no qualifying pair can exceed: the gap between two boxes is at most `(w_i + w_j) * max_waste / (1 - max_waste)` along x (same for y), and w_j is at most the widest box. Boxes grown during the pass may miss candidates, later passes pick them up and the last pass, which merges nothing, is exact.
+    """
+    numpy = import_optional("numpy")
+    shapely = import_optional("shapely")
+    size = sized[:, 2:] - sized[:, :2]
+    margin = (size + size.max(axis=0)) * (max_waste / (1 - max_waste))
+    tree = shapely.STRtree(shapely.box(*sized.T))
+    left, right = tree.query(
+        shapely.box(
+            *numpy.concatenate([sized[:, :2] - margin, sized[:, 2:] + margin], axis=1).T
+        )
+    )
+    order = numpy.argsort(left, kind="stable")
+    candidates = numpy.split(
+        right[order], numpy.searchsorted(left[order], numpy.arange(1, len(boxes)))
+    )
+
+    alive = numpy.ones(len(boxes), dtype=bool)
+    merged = False
+    for i in range(len(boxes)):
+        pool = candidates[i]
+        while alive[i]:
+            pool = numpy.unique(pool[alive[pool] & (pool != i)])
+            if not len(pool):
+                break
+            waste = _merge_waste(sized[i], sized[pool])
+            best = int(numpy.argmin(waste))
+            if waste[best] > max_waste:
+                break
+            j = int(pool[best])
+            boxes[i, :2] = numpy.minimum(boxes[i, :2], boxes[j, :2])
+            boxes[i, 2:] = numpy.maximum(boxes[i, 2:], boxes[j, 2:])
+            sized[i, :2] = numpy.minimum(sized[i, :2], sized[j, :2])
+            sized[i, 2:] = numpy.maximum(sized[i, 2:], sized[j, 2:])
+            alive[j] = False
+            # Neighbours of the absorbed box are candidates of the grown one
+            pool = numpy.concatenate([pool, candidates[j]])
+            merged = True
+    return merged, boxes[alive], sized[alive]
+
+
+def cluster_bboxes(
+    bboxes: Iterable[Bounds], max_waste: float = 0.5, min_size: float = 0.01
+) -> List[Bounds]:
+    """Merge nearby bounding boxes into fewer, larger ones without covering much empty space.
+
+    Boxes are merged greedily, similar to how R-tree nodes are grown: each box is merged with the box that wastes the least area, as long as the fraction of the merged box not covered by the two boxes stays at or below `max_waste`. Merging repeats until no pair qualifies, so the result is a small set of boxes that covers every input box. Clusters of features end up as one box each while features far apart stay separate. Candidate pairs are looked up in an STRtree, so only nearby boxes are compared.
+
+    Areas are measured in the units of the bounds (square degrees for 4326), which is accurate enough for comparing nearby boxes. Boxes narrower or lower than `min_size` (points, or lines along a parallel or meridian) are measured as `min_size` wide or high so they cover some area and can merge with their neighbours; the returned bounds are not grown.
+
+    Args:
+        bboxes: Bounds `(min_x, min_y, max_x, max_y)` to merge, i.e. from `get_feature_bboxes()`.
+        max_waste: Largest fraction (0 to 1) of a merged box allowed to be outside the two boxes merged into it. 0 only merges boxes that overlap enough to cover their union, 1 merges everything into one box.
+        min_size: Smallest width and height boxes are measured with, in the units of the bounds. Defaults to 0.01 (about 1 km in EPSG:4326).
+
+    Returns:
+        Merged bounds.
+
+    Raises:
+        ValueError: If max_waste is not between 0 and 1 or min_size is negative.
+    """
+    if not 0 <= max_waste <= 1:
+        raise ValueError("max_waste must be between 0 and 1.")
+    if min_size < 0:
+        raise ValueError("min_size must not be negative.")
+    numpy = import_optional("numpy")
+    boxes = numpy.array(list(bboxes), dtype=float).reshape(-1, 4)
+    if len(boxes) == 0:
+        return []
+    if max_waste == 1:
+        # Every pair qualifies, so everything ends up in one box
+        boxes = numpy.concatenate([boxes[:, :2].min(axis=0), boxes[:, 2:].max(axis=0)])[
+            None
+        ]
+    else:
+        sized = _grow_bboxes(boxes, min_size)
+        merged = True
+        while merged:
+            merged, boxes, sized = _cluster_pass(boxes, sized, max_waste)
+
+    return [(x0, y0, x1, y1) for x0, y0, x1, y1 in boxes.tolist()]
+
+
+def get_clustered_bboxes_from_file(
+    aoi_file_path: str,
+    driver: Optional[GeospatialDriver] = None,
+    max_waste: float = 0.5,
+) -> List[str]:
+    """Given a file of scattered features, get a few bounding boxes that cover all features with little empty space.
+
+    Unlike `get_bbox_from_file()`, which returns one bounding box around all features, feature bounding boxes are merged with `cluster_bboxes()` so that each resulting bounding box can be requested as a separate, much smaller LANDFIRE job.
+
+    Args:
+        aoi_file_path: Path-like string to area of interest file.
+        driver: Optional file driver. See `get_bbox_from_file()`.
+        max_waste: Largest fraction of a bounding box allowed to be outside of features' bounding boxes. See `cluster_bboxes()`.
+
+    Returns:
+        Bounding boxes as strings, like `get_bbox_from_file()`.
+    """
+    bboxes = cluster_bboxes(get_feature_bboxes(aoi_file_path, driver), max_waste)
+    return [_format_bbox(bounds) for bounds in bboxes]
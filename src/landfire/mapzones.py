@@ -0,0 +1,243 @@
+"""Offline LANDFIRE map zone lookup and partitioning of large areas along map zone boundaries.
+
+LANDFIRE produces its data per map zone, and the LANDFIRE Product Service accepts a map zone number in place of a bounding box. A `MapZoneIndex` holds simplified map zone polygons in an STRtree, so the zones intersecting a bounding box are found offline in microseconds and large areas can be split into sub-jobs that line up with the zones.
+
+`get_map_zones()` and `split_by_map_zones()` use an index saved to the cache directory if there is one, otherwise the index packaged as `landfire/data/map_zones.npz`. Builds without the packaged index need the index built once from the LANDFIRE map zones dataset (available from https://landfire.gov) with `MapZoneIndex.from_file()` and `save()`. Requires `landfire[geospatial]`.
+"""
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Union
+
+from attrs import define, field
+
+from landfire._cache import get_cache_dir
+from landfire._optional import import_optional
+from landfire.bbox import BBox
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+
+__all__ = ["MapZoneIndex", "get_map_zones", "split_by_map_zones"]
+
+# Name of the saved index in the cache directory
+MAP_ZONES_FILE = "map_zones.npz"
+
+# Simplified index shipped as package data, used unless an index is saved to the cache directory
+PACKAGED_MAP_ZONES = Path(__file__).parent / "data" / MAP_ZONES_FILE
+
+# Fields holding the map zone number in the LANDFIRE map zones dataset, compared ignoring case
+ZONE_FIELDS = ("ZONE_NUM", "ZONE", "MAPZONE", "MAP_ZONE")
+
+
+def _find_zone_field(columns: List[str]) -> str:
+    """Find the map zone number column of a map zones dataset."""
+    lower = {column.lower(): column for column in columns}
+    for name in ZONE_FIELDS:
+        if name.lower() in lower:
+            return lower[name.lower()]
+    raise RuntimeError(
+        f"Unable to find the map zone number field. Please provide `zone_field`, one of {', '.join(columns)}."
+    )
+
+
+@define
+class MapZoneIndex:
+    """Spatial index over simplified map zone polygons in longitude/latitude.
+
+    Args:
+        zones: Map zone number of each polygon.
+        polygons: Shapely (multi)polygons in EPSG:4326.
+    """
+
+    zones: "np.ndarray"
+    polygons: "np.ndarray"
+    _tree: Any = field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        """Build the STRtree."""
+        shapely = import_optional("shapely")
+        self._tree = shapely.STRtree(self.polygons)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        zone_field: Optional[str] = None,
+        tolerance: float = 0.005,
+    ) -> "MapZoneIndex":
+        """Build an index from a map zones dataset (i.e. the LANDFIRE map zones shapefile).
+
+        Polygons are reprojected to 4326, merged per map zone and simplified with `tolerance` degrees (0.005 degrees is about 500 m), which keeps the index small while zone boundaries stay far more accurate than needed to split requests.
+
+        Args:
+            path: Path-like string to any vector file readable by GeoPandas.
+            zone_field: Field holding the map zone number. Detected from `ZONE_FIELDS` if not provided.
+            tolerance: Simplification tolerance in degrees. Use 0 to keep the original polygons.
+
+        Returns:
+            MapZoneIndex.
+        """
+        gpd = import_optional("geopandas")
+        numpy = import_optional("numpy")
+        gdf = gpd.read_file(path, engine="fiona").to_crs(4326)
+        zone_field = zone_field or _find_zone_field(list(gdf.columns))
+        zones = gdf.dissolve(by=zone_field).sort_index()
+        geometries = zones.geometry
+        if tolerance:
+            geometries = geometries.simplify(tolerance, preserve_topology=True)
+        return cls(
+            zones=zones.index.to_numpy(dtype=numpy.int32),
+            polygons=geometries.to_numpy(),
+        )
+
+    def save(self, path: Optional[str] = None, cache_dir: Optional[str] = None) -> Path:
+        """Save the index as compressed WKB.
+
+        Args:
+            path: File to write. Defaults to `map_zones.npz` in the cache directory.
+            cache_dir: Cache directory. See `landfire._cache.get_cache_dir()` for the default.
+
+        Returns:
+            Path of the written file.
+        """
+        numpy = import_optional("numpy")
+        shapely = import_optional("shapely")
+        target = Path(path) if path else get_cache_dir(cache_dir) / MAP_ZONES_FILE
+        wkb = shapely.to_wkb(self.polygons)
+        numpy.savez_compressed(
+            target,
+            zones=self.zones,
+            offsets=numpy.cumsum([0] + [len(item) for item in wkb]),
+            wkb=numpy.frombuffer(b"".join(wkb), dtype=numpy.uint8),
+        )
+        return target
+
+    @classmethod
+    def load(
+        cls, path: Optional[str] = None, cache_dir: Optional[str] = None
+    ) -> "MapZoneIndex":
+        """Load an index written by `save()`.
+
+        Args:
+            path: File to read. Defaults to `map_zones.npz` in the cache directory.
+            cache_dir: Cache directory. See `landfire._cache.get_cache_dir()` for the default.
+
+        Returns:
+            MapZoneIndex.
+
+        Raises:
+            RuntimeError: If there is no saved index.
+        """
+        numpy = import_optional("numpy")
+        shapely = import_optional("shapely")
+        source = Path(path) if path else get_cache_dir(cache_dir) / MAP_ZONES_FILE
+        if not source.exists():
+            raise RuntimeError(
+                f"No map zone index at {source}. Build one from the LANDFIRE map zones dataset with `MapZoneIndex.from_file(...).save()`."
+            )
+        with numpy.load(source) as data:
+            wkb = data["wkb"].tobytes()
+            offsets = data["offsets"]
+            polygons = shapely.from_wkb(
+                [wkb[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+            )
+            return cls(zones=data["zones"], polygons=polygons)
+
+    def query(self, bbox: Union[BBox, str, Sequence[float]]) -> List[int]:
+        """Get the map zones intersecting a bounding box.
+
+        Args:
+            bbox: Bounding box (`BBox`, string, sequence or GeoJSON, see `BBox.parse()`).
+
+        Returns:
+            Sorted map zone numbers.
+        """
+        shapely = import_optional("shapely")
+        box = shapely.box(*BBox.parse(bbox).bounds)
+        hits = self._tree.query(box, predicate="intersects")
+        return sorted(int(zone) for zone in self.zones[hits])
+
+    def split(self, bbox: Union[BBox, str, Sequence[float]]) -> List[str]:
+        """Split a bounding box along map zone boundaries.
+
+        Every map zone intersecting the bounding box becomes one area of interest: the map zone number if the zone lies entirely within the bounding box (LFPS extracts exactly that zone), otherwise the bounding box of the part of the zone within it.
+
+        Args:
+            bbox: Bounding box (`BBox`, string, sequence or GeoJSON, see `BBox.parse()`).
+
+        Returns:
+            `Area_Of_Interest` strings, one per intersecting map zone in zone order, each usable as `Landfire(bbox=...)`.
+        """
+        shapely = import_optional("shapely")
+        numpy = import_optional("numpy")
+        box = shapely.box(*BBox.parse(bbox).bounds)
+        hits = self._tree.query(box, predicate="intersects")
+        hits = hits[numpy.argsort(self.zones[hits], kind="stable")]
+        aois = []
+        for i in hits.tolist():
+            polygon = self.polygons[i]
+            if shapely.within(polygon, box):
+                aois.append(str(int(self.zones[i])))
+                continue
+            part = shapely.intersection(polygon, box)
+            min_x, min_y, max_x, max_y = shapely.bounds(part).tolist()
+            # Zones only touching an edge of the bounding box have no area to request
+            if min_x < max_x and min_y < max_y:
+                aois.append(str(BBox(min_x, min_y, max_x, max_y)))
+        return aois
+
+
+# Index loaded by get_map_zones() and split_by_map_zones()
+_default_index: Optional[MapZoneIndex] = None
+
+
+def _get_index(index: Optional[MapZoneIndex]) -> MapZoneIndex:
+    """Get index, or the default index (loaded once).
+
+    The default index is the one saved to the cache directory, which overrides the packaged index.
+
+    Raises:
+        RuntimeError: If neither index exists.
+    """
+    global _default_index
+    if index is not None:
+        return index
+    if _default_index is None:
+        saved = get_cache_dir() / MAP_ZONES_FILE
+        if not saved.exists() and PACKAGED_MAP_ZONES.exists():
+            saved = PACKAGED_MAP_ZONES
+        _default_index = MapZoneIndex.load(str(saved))
+    return _default_index
+
+
+def get_map_zones(
+    bbox: Union[BBox, str, Sequence[float]], index: Optional[MapZoneIndex] = None
+) -> List[int]:
+    """Get the LANDFIRE map zones intersecting a bounding box, offline.
+
+    Args:
+        bbox: Bounding box (`BBox`, string, sequence or GeoJSON, see `BBox.parse()`).
+        index: MapZoneIndex to query. Defaults to the saved or packaged index.
+
+    Returns:
+        Sorted map zone numbers.
+    """
+    return _get_index(index).query(bbox)
+
+
+def split_by_map_zones(
+    bbox: Union[BBox, str, Sequence[float]], index: Optional[MapZoneIndex] = None
+) -> List[str]:
+    """Split a large area of interest into one sub-job per LANDFIRE map zone.
+
+    Sub-jobs line up with how LANDFIRE processes data and can be requested in parallel. See `MapZoneIndex.split()`.
+
+    Args:
+        bbox: Bounding box (`BBox`, string, sequence or GeoJSON, see `BBox.parse()`).
+        index: MapZoneIndex to use. Defaults to the saved or packaged index.
+
+    Returns:
+        `Area_Of_Interest` strings (map zone numbers or bounding boxes).
+    """
+    return _get_index(index).split(bbox)
@@ -0,0 +1,407 @@
+"""Merge overlapping areas of interest into shared jobs and clip each area out of the shared result locally.
+
+Batches often contain heavily overlapping areas, i.e. the perimeters of the same fire on consecutive days. Requested one by one, every job extracts and downloads the same pixels again. `plan_shared_jobs()` groups specs with the same layers, projection and resolution whose bounding boxes overlap into one job covering their union, and `request_merged()` requests the shared jobs with `request_many()` and cuts every original area out of the shared GeoTIFF with windowed reads.
+
+Planning requires `shapely`, clipping requires `rasterio`, both from the `raster` extra.
+"""
+import math
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from attrs import frozen
+
+from landfire._optional import import_optional
+from landfire.batch import BatchResult, Spec, _to_mapping, request_many
+from landfire.bbox import BBox
+from landfire.task import validate_requests
+
+
+__all__ = ["SharedJob", "clip_result", "plan_shared_jobs", "request_merged"]
+
+
+@frozen
+class SharedJob:
+    """A job shared by overlapping request specs.
+
+    Args:
+        params: `submitJob` parameters of the shared job, with the union bounding box as `Area_Of_Interest`.
+        members: Positions of the specs served by this job, in input order.
+        member_params: Normalized `submitJob` parameters of each member, in the order of `members`.
+    """
+
+    params: Dict[str, Any]
+    members: Tuple[int, ...]
+    member_params: Tuple[Dict[str, Any], ...]
+
+    @property
+    def shared(self) -> bool:
+        """Whether the job serves more than one spec."""
+        return len(self.members) > 1
+
+
+# (position, normalized submitJob parameters, bounding box or None for map zones) of a spec
+_Member = Tuple[int, Dict[str, Any], Optional[BBox]]
+
+
+def _find(parent: List[int], i: int) -> int:
+    """Find the root of i with path halving."""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _fits(geometries: Any, max_waste: float) -> bool:
+    """Whether the bounding box of geometries is at most `1 + max_waste` times the area of their union."""
+    shapely = import_optional("shapely", extra="raster")
+    union = shapely.box(*shapely.total_bounds(geometries))
+    return bool(
+        shapely.area(union)
+        <= (1 + max_waste) * shapely.area(shapely.union_all(geometries))
+    )
+
+
+def _split_component(
+    geometries: Any,
+    component: List[int],
+    neighbors: Dict[int, Set[int]],
+    max_waste: float,
+) -> List[List[int]]:
+    """Split a connected component into groups whose union boxes don't waste more than max_waste.
+
+    Groups are grown greedily from their first box in input order, adding overlapping boxes as long as the union box still fits.
+    """
+    if _fits(geometries[component], max_waste):
+        return [component]
+    remaining = set(component)
+    groups = []
+    for seed in component:
+        if seed not in remaining:
+            continue
+        remaining.discard(seed)
+        group = [seed]
+        frontier = sorted(neighbors[seed] & remaining)
+        while frontier:
+            i = frontier.pop(0)
+            if i in remaining and _fits(geometries[group + [i]], max_waste):
+                group.append(i)
+                remaining.discard(i)
+                frontier.extend(sorted(neighbors[i] & remaining))
+        groups.append(sorted(group))
+    return groups
+
+
+def _group_overlapping(
+    boxes: List[BBox], min_overlap: float, max_waste: float
+) -> List[List[int]]:
+    """Group sufficiently overlapping boxes, splitting groups whose union box wastes too much area."""
+    numpy = import_optional("numpy")
+    shapely = import_optional("shapely", extra="raster")
+    geometries = shapely.box(*numpy.array([box.bounds for box in boxes]).T)
+    tree = shapely.STRtree(geometries)
+    left, right = tree.query(geometries, predicate="intersects")
+    parent = list(range(len(boxes)))
+    neighbors: Dict[int, Set[int]] = {i: set() for i in range(len(boxes))}
+    areas = shapely.area(geometries)
+    overlaps = shapely.area(shapely.intersection(geometries[left], geometries[right]))
+    for k in range(len(left)):
+        i, j = int(left[k]), int(right[k])
+        if (
+            i < j
+            and overlaps[k] > 0
+            and overlaps[k] >= min_overlap * min(areas[i], areas[j])
+        ):
+            parent[_find(parent, i)] = _find(parent, j)
+            neighbors[i].add(j)
+            neighbors[j].add(i)
+    components: Dict[int, List[int]] = {}
+    for i in range(len(boxes)):
+        components.setdefault(_find(parent, i), []).append(i)
+    return [
+        group
+        for component in components.values()
+        for group in _split_component(geometries, component, neighbors, max_waste)
+    ]
+
+
+def _shared_job(component: List[_Member]) -> SharedJob:
+    """Build the job of a group of specs, covering the union of their bounding boxes."""
+    params = dict(component[0][1])
+    boxes = [box for _, _, box in component if box is not None]
+    if len(component) > 1:
+        union = BBox(
+            min(box.min_x for box in boxes),
+            min(box.min_y for box in boxes),
+            max(box.max_x for box in boxes),
+            max(box.max_y for box in boxes),
+        )
+        params["Area_Of_Interest"] = str(union)
+    return SharedJob(
+        params=params,
+        members=tuple(index for index, _, _ in component),
+        member_params=tuple(member for _, member, _ in component),
+    )
+
+
+def plan_shared_jobs(
+    specs: Iterable[Spec], min_overlap: float = 0.1, max_waste: float = 1.0
+) -> Tuple[List[SharedJob], List[BatchResult]]:
+    """Group overlapping request specs into shared jobs.
+
+    Specs with the same layers (in any order), output projection and resolution are grouped when their bounding boxes overlap by at least `min_overlap` of the smaller box, directly or through other specs (connected components of an STRtree overlap query). Each group becomes one job covering the union of its bounding boxes. Chains of overlapping boxes can span a much larger box than the boxes themselves, so a group is only kept if its union box is at most `1 + max_waste` times the area covered by its members, and is split into smaller groups otherwise, similar to `cluster_bboxes()`. Specs with a map zone area of interest always get a job of their own.
+
+    Args:
+        specs: Request specs, see `request_many()`.
+        min_overlap: Smallest overlap, as a fraction of the smaller bounding box, for two specs to share a job.
+        max_waste: Largest area of a shared job outside of its members' bounding boxes, as a fraction of the area they cover.
+
+    Returns:
+        Shared jobs (in order of their first member) and failed results of invalid specs.
+
+    Raises:
+        ValueError: If max_waste is negative.
+    """
+    if max_waste < 0:
+        raise ValueError("max_waste must not be negative.")
+    invalid: List[BatchResult] = []
+    # (layers, projection, resolution) -> [(index, params, bbox)]
+    groups: Dict[Tuple[Any, ...], List[_Member]] = {}
+    for index, spec in enumerate(specs):
+        try:
+            mapping: Mapping[str, Any] = _to_mapping(spec)
+        except ValueError as exc:
+            invalid.append(BatchResult(index, None, None, None, str(exc), 0.0))
+            continue
+        validation = validate_requests([mapping])[0]
+        if not validation.ok or validation.params is None:
+            error = " ".join(validation.errors)
+            invalid.append(BatchResult(index, None, None, None, error, 0.0))
+            continue
+        params = validation.params
+        try:
+            bbox: Optional[BBox] = BBox.parse(params["Area_Of_Interest"])
+        except ValueError:
+            bbox = None
+        key = (
+            tuple(sorted(params["Layer_List"].split(";"))),
+            params["Output_Projection"],
+            params.get("Resample_Resolution"),
+        )
+        groups.setdefault(key, []).append((index, params, bbox))
+
+    jobs: List[SharedJob] = []
+    for members in groups.values():
+        zones = [member for member in members if member[2] is None]
+        boxed = [member for member in members if member[2] is not None]
+        components = [[member] for member in zones]
+        if boxed:
+            boxes = [box for _, _, box in boxed if box is not None]
+            components.extend(
+                [boxed[i] for i in component]
+                for component in _group_overlapping(boxes, min_overlap, max_waste)
+            )
+        jobs.extend(_shared_job(component) for component in components)
+    jobs.sort(key=lambda job: job.members[0])
+    return jobs, invalid
+
+
+def _pixel_window(src: Any, bounds: Sequence[float], clip: bool = True) -> Any:
+    """Get the window of src covering bounds in its CRS, rounded outward to whole pixels.
+
+    Rounding outward keeps the pixel grid of src, so clips are aligned with the shared result rather than regridded.
+
+    Args:
+        src: Open rasterio dataset.
+        bounds: Bounds `(min_x, min_y, max_x, max_y)` in the CRS of src.
+        clip: Whether to clip the window to the raster.
+
+    Returns:
+        rasterio Window, None if the clipped window is empty.
+    """
+    from rasterio.windows import Window
+
+    inverse = ~src.transform
+    cols, rows = [], []
+    for x in (bounds[0], bounds[2]):
+        for y in (bounds[1], bounds[3]):
+            cols.append(inverse.a * x + inverse.b * y + inverse.c)
+            rows.append(inverse.d * x + inverse.e * y + inverse.f)
+    col_off = int(math.floor(min(cols) + 1e-6))
+    row_off = int(math.floor(min(rows) + 1e-6))
+    col_end = int(math.ceil(max(cols) - 1e-6))
+    row_end = int(math.ceil(max(rows) - 1e-6))
+    if clip:
+        col_off, row_off = max(col_off, 0), max(row_off, 0)
+        col_end, row_end = min(col_end, src.width), min(row_end, src.height)
+        if col_end <= col_off or row_end <= row_off:
+            return None
+    return Window(col_off, row_off, col_end - col_off, row_end - row_off)
+
+
+def _window(src: Any, bbox: BBox) -> Any:
+    """Get the window of src covering a bounding box in EPSG:4326, clipped to the raster."""
+    from rasterio.warp import transform_bounds
+
+    bounds = transform_bounds("EPSG:4326", src.crs, *bbox.bounds, densify_pts=21)
+    window = _pixel_window(src, bounds)
+    if window is None:
+        raise RuntimeError(f"Bounding box `{bbox}` is outside of the shared result.")
+    return window
+
+
+def clip_result(
+    source: str,
+    bbox: BBox,
+    output_path: str,
+    bands: Optional[Sequence[int]] = None,
+) -> Path:
+    """Clip a bounding box out of a downloaded LANDFIRE zip file with windowed reads.
+
+    Only the pixels covering `bbox` are read from the GeoTIFF in `source`, the clipped GeoTIFF keeps the grid, projection, data type and nodata value of the original and is written into a zip file at `output_path`.
+
+    Args:
+        source: Path-like string to a zip file with a GeoTIFF, as downloaded from LFPS.
+        bbox: Area to clip out, in EPSG:4326.
+        output_path: Path-like string of the zip file to write.
+        bands: 1-based band numbers to keep, in output order. Defaults to all bands.
+
+    Returns:
+        Path of the written zip file.
+
+    Raises:
+        RuntimeError: If the zip file has no GeoTIFF or the bounding box is outside of it.
+    """
+    rasterio = import_optional("rasterio", extra="raster")
+    with zipfile.ZipFile(source) as archive:
+        members = [
+            name
+            for name in archive.namelist()
+            if name.lower().endswith((".tif", ".tiff"))
+        ]
+    if not members:
+        raise RuntimeError(f"{source} does not contain a GeoTIFF.")
+
+    target = Path(output_path)
+    with tempfile.TemporaryDirectory(dir=target.parent) as tmp:
+        clipped = Path(tmp) / (target.stem + ".tif")
+        with rasterio.open(f"/vsizip/{Path(source).resolve()}/{members[0]}") as src:
+            window = _window(src, bbox)
+            indexes = list(bands) if bands else list(src.indexes)
+            profile = src.profile
+            profile.update(
+                driver="GTiff",
+                count=len(indexes),
+                width=window.width,
+                height=window.height,
+                transform=src.window_transform(window),
+                compress="deflate",
+            )
+            with rasterio.open(clipped, "w", **profile) as dst:
+                dst.write(src.read(indexes, window=window))
+                dst.descriptions = tuple(src.descriptions[i - 1] for i in indexes)
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.write(clipped, clipped.name)
+    return target
+
+
+def request_merged(
+    specs: Iterable[Spec],
+    output_dir: str = ".",
+    min_overlap: float = 0.1,
+    max_waste: float = 1.0,
+    **kwargs: Any,
+) -> Iterator[BatchResult]:
+    """Request data for many areas of interest, sharing one job between overlapping areas.
+
+    Specs are planned with `plan_shared_jobs()` (so all specs are read up front), shared jobs are requested with `request_many()` and each member area is clipped out of its shared result with `clip_result()`. Jobs with a single member are downloaded directly to the member's output path. Members listing the shared layers in a different order get their bands in their own order.
+
+    Args:
+        specs: Request specs, see `request_many()`.
+        output_dir: Directory for zip files of specs without `output_path`, named `landfire_<index>.zip`. Created if it doesn't exist.
+        min_overlap: Smallest overlap for two specs to share a job, see `plan_shared_jobs()`.
+        max_waste: Largest extra area of a shared job, see `plan_shared_jobs()`.
+        kwargs: Passed to `request_many()` (concurrency limits, backoff and stats).
+
+    Yields:
+        One BatchResult per spec, in completion order. Members of a shared job carry the shared job ID.
+    """
+    specs = list(specs)
+    jobs, invalid = plan_shared_jobs(
+        specs, min_overlap=min_overlap, max_waste=max_waste
+    )
+    yield from invalid
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    def output_path(index: int) -> Path:
+        path = _to_mapping(specs[index]).get("output_path")
+        return Path(path) if path else Path(output_dir) / f"landfire_{index}.zip"
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as shared_dir:
+        shared_specs = []
+        for i, job in enumerate(jobs):
+            target = (
+                Path(shared_dir) / f"shared_{i}.zip"
+                if job.shared
+                else output_path(job.members[0])
+            )
+            shared_specs.append(_job_spec(job.params, target))
+        for result in request_many(shared_specs, output_dir=shared_dir, **kwargs):
+            job = jobs[result.index]
+            for k, index in enumerate(job.members):
+                params = job.member_params[k]
+                path = output_path(index)
+                error = result.error
+                if error is None and job.shared:
+                    try:
+                        clip_result(
+                            str(result.output_path),
+                            BBox.parse(params["Area_Of_Interest"]),
+                            str(path),
+                            bands=_bands(job.params, params),
+                        )
+                    except Exception as exc:
+                        error = str(exc)
+                yield BatchResult(
+                    index=index,
+                    params=params,
+                    output_path=path,
+                    job_id=result.job_id,
+                    error=error,
+                    seconds=result.seconds,
+                )
+
+
+def _bands(shared: Dict[str, Any], member: Dict[str, Any]) -> Optional[List[int]]:
+    """Get the bands of a shared result in the layer order of a member, None if the order is the same."""
+    layers = shared["Layer_List"].split(";")
+    member_layers = member["Layer_List"].split(";")
+    if member_layers == layers:
+        return None
+    return [layers.index(layer) + 1 for layer in member_layers]
+
+
+def _job_spec(params: Dict[str, Any], output_path: Path) -> Dict[str, Any]:
+    """Convert `submitJob` parameters back to a request spec."""
+    spec: Dict[str, Any] = {
+        "bbox": params["Area_Of_Interest"],
+        "layers": params["Layer_List"],
+        "output_path": str(output_path),
+    }
+    if params.get("Output_Projection") is not None:
+        spec["output_crs"] = params["Output_Projection"]
+    if "Resample_Resolution" in params:
+        spec["resample_res"] = params["Resample_Resolution"]
+    return spec
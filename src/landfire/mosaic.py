@@ -0,0 +1,210 @@
+"""Offline backend extracting requests from local LANDFIRE mosaics.
+
+With the national LANDFIRE GeoTIFFs on local disk, a `LocalMosaic` serves `Landfire.request_data()` without the LANDFIRE Product Service: layer codes are checked against the catalog and resolved to local rasters, only the windows covering the bounding box are read, resampling and reprojection are applied locally, and the result is written as a zip file with one multi-band GeoTIFF like LFPS downloads. Requests take seconds instead of a place in the job queue.
+
+Requires the `raster` extra (`rasterio`).
+"""
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from attrs import define, field
+
+from landfire._optional import import_optional
+from landfire.bbox import BBox
+from landfire.merge import _pixel_window
+from landfire.product.index import get_index
+
+
+__all__ = ["LocalMosaic"]
+
+# Extensions of mosaic files found by layer code
+MOSAIC_EXTENSIONS = (".tif", ".tiff", ".vrt", ".img")
+
+# Meters per degree at the equator, converting resolutions for geographic output
+METERS_PER_DEGREE = 111319.49
+
+
+def _to_directory(directory: Optional[Union[str, Path]]) -> Optional[Path]:
+    """Convert a directory to a Path, keeping None."""
+    return None if directory is None else Path(directory)
+
+
+def _to_paths(paths: Optional[Dict[str, Any]]) -> Dict[str, Path]:
+    """Convert a layer to path mapping to Paths."""
+    return {layer: Path(path) for layer, path in (paths or {}).items()}
+
+
+@define
+class LocalMosaic:
+    """Local LANDFIRE mosaics, one raster per layer.
+
+    Args:
+        directory: Directory with one raster per layer named after the layer code, i.e. `ELEV2020.tif` (compared ignoring case).
+        paths: Explicit rasters per layer code, taking precedence over `directory`. Useful for the original LANDFIRE file names, i.e. `{"220F40_22": "LC22_F40_220.tif"}`.
+    """
+
+    directory: Optional[Path] = field(default=None, converter=_to_directory)
+    paths: Dict[str, Path] = field(factory=dict, converter=_to_paths)
+
+    def resolve(self, layer: str) -> Path:
+        """Resolve a layer code to its local raster.
+
+        Args:
+            layer: Product layer code.
+
+        Returns:
+            Path of the raster.
+
+        Raises:
+            RuntimeError: If the layer is not in the catalog or has no local raster.
+        """
+        if layer not in get_index().layer_products:
+            raise RuntimeError(f"Layer `{layer}` is not in the catalog.")
+        if layer in self.paths:
+            return self.paths[layer]
+        if self.directory is not None:
+            for path in sorted(self.directory.iterdir()):
+                if (
+                    path.stem.lower() == layer.lower()
+                    and path.suffix.lower() in MOSAIC_EXTENSIONS
+                ):
+                    return path
+        raise RuntimeError(
+            f"No local mosaic for layer `{layer}`. Please add `{layer}.tif` to {self.directory} or provide it in `paths`."
+        )
+
+    def _grid(
+        self, src: Any, bbox: BBox, output_crs: Optional[str], resample_res: float
+    ) -> Tuple[Any, Any, int, int]:
+        """Get the output grid (CRS, transform, width, height) of a request from the first layer.
+
+        Native requests keep the pixel grid of the mosaic, reprojected ones are aligned to multiples of the resolution.
+        """
+        from rasterio.crs import CRS
+        from rasterio.transform import from_origin
+        from rasterio.warp import transform_bounds
+
+        if output_crs is None:
+            window = _pixel_window(
+                src,
+                transform_bounds("EPSG:4326", src.crs, *bbox.bounds, densify_pts=21),
+            )
+            if window is None:
+                raise RuntimeError(
+                    f"Bounding box `{bbox}` is outside of the local mosaics."
+                )
+            left, bottom, right, top = src.window_bounds(window)
+            crs, origin_x, origin_y = src.crs, src.transform.c, src.transform.f
+        else:
+            crs = CRS.from_user_input(
+                f"EPSG:{output_crs}" if output_crs.isdigit() else output_crs
+            )
+            left, bottom, right, top = transform_bounds(
+                "EPSG:4326", crs, *bbox.bounds, densify_pts=21
+            )
+            origin_x = origin_y = 0.0
+            if crs.is_geographic:
+                resample_res = resample_res / METERS_PER_DEGREE
+        # Snap outward to the resolution, starting from the grid origin
+        left = origin_x + ((left - origin_x) // resample_res) * resample_res
+        top = origin_y - ((origin_y - top) // resample_res) * resample_res
+        width = max(int(-((left - right) // resample_res)), 1)
+        height = max(int(-((bottom - top) // resample_res)), 1)
+        return crs, from_origin(left, top, resample_res, resample_res), width, height
+
+    def extract(
+        self,
+        bbox: Union[BBox, str],
+        layers: Sequence[str],
+        output_path: str,
+        output_crs: Optional[str] = None,
+        resample_res: int = 30,
+    ) -> Path:
+        """Extract layers for a bounding box from the local mosaics.
+
+        Every layer is read through a warped view on the output grid, so only the pixels covering the bounding box are read and resampling (nearest neighbour) and reprojection happen on the fly, one block of the output at a time. The output nodata value is that of the first layer with one, nodata pixels of the other layers are rewritten to it.
+
+        Args:
+            bbox: Bounding box in EPSG:4326.
+            layers: Product layers, written as one band each in order.
+            output_path: Path-like string of the zip file to write.
+            output_crs: Output projection as an EPSG WKID, None to keep the projection of the mosaics.
+            resample_res: Output resolution in meters, converted to degrees at the equator for geographic projections.
+
+        Returns:
+            Path of the written zip file.
+
+        Raises:
+            RuntimeError: If bbox is not a bounding box (i.e. a map zone number), a layer has no local raster or the bounding box is outside of the mosaics.
+        """
+        rasterio = import_optional("rasterio", extra="raster")
+        from rasterio.enums import Resampling
+        from rasterio.vrt import WarpedVRT
+
+        try:
+            box = BBox.parse(bbox)
+        except ValueError as exc:
+            raise RuntimeError(f"Unable to extract from local mosaics! {exc}")
+        sources = [self.resolve(layer) for layer in layers]
+        with rasterio.open(sources[0]) as src:
+            crs, transform, width, height = self._grid(
+                src, box, output_crs, resample_res
+            )
+        dtypes: List[str] = []
+        nodata = None
+        for source in sources:
+            with rasterio.open(source) as src:
+                dtypes.append(src.dtypes[0])
+                nodata = src.nodata if nodata is None else nodata
+        numpy = import_optional("numpy")
+        profile = {
+            "driver": "GTiff",
+            "count": len(layers),
+            "dtype": numpy.result_type(*dtypes).name,
+            "crs": crs,
+            "transform": transform,
+            "width": width,
+            "height": height,
+            "nodata": nodata,
+            "compress": "deflate",
+            # Tiles keep the blocks read through the warped views square and bounded in size
+            "tiled": True,
+            "blockxsize": 512,
+            "blockysize": 512,
+        }
+
+        target = Path(output_path)
+        with tempfile.TemporaryDirectory(dir=target.parent) as tmp:
+            extracted = Path(tmp) / (target.stem + ".tif")
+            with rasterio.open(extracted, "w", **profile) as dst:
+                dst.descriptions = tuple(layers)
+                for band, source in enumerate(sources, start=1):
+                    with rasterio.open(source) as src, WarpedVRT(
+                        src,
+                        crs=crs,
+                        transform=transform,
+                        width=width,
+                        height=height,
+                        resampling=Resampling.nearest,
+                        nodata=src.nodata if src.nodata is not None else nodata,
+                    ) as vrt:
+                        _copy_band(vrt, dst, band, src.nodata)
+            with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.write(extracted, extracted.name)
+        return target
+
+
+def _copy_band(vrt: Any, dst: Any, band: int, src_nodata: Optional[float]) -> None:
+    """Copy the first band of vrt to a band of dst block by block, rewriting nodata to the nodata value of dst."""
+    numpy = import_optional("numpy")
+    nodata = dst.nodata
+    remap = src_nodata is not None and nodata is not None and src_nodata != nodata
+    for _, window in dst.block_windows(band):
+        data = vrt.read(1, window=window).astype(dst.dtypes[band - 1])
+        if remap:
+            data[
+                numpy.isnan(data) if numpy.isnan(src_nodata) else data == src_nodata
+            ] = nodata
+        dst.write(data, band, window=window)
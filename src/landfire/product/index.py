@@ -0,0 +1,293 @@
+"""Precomputed catalog index used for fast product queries.
+
+The catalog is flattened into availability rows, one per (product, ProductAvailability). For every name, code, theme, version, region and layer the index keeps a bitmap (a Python int) of the rows it occurs in, so queries reduce to a handful of integer bitwise operations.
+
+For columnar exports the index also keeps the fully flattened catalog, one entry per (product, availability, region, layer), as dictionary encoded NumPy columns built on first use. Region and layer filters select entries of these columns rather than whole rows, so exports only contain the regions and layers asked for.
+"""
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from attrs import define, field, frozen
+
+from landfire._optional import import_optional
+from landfire.product.models import Product, current_products
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+
+__all__ = ["COLUMNS", "CatalogColumns", "CatalogIndex", "get_index"]
+
+# Columns of flattened catalog exports
+COLUMNS = ("name", "code", "theme", "version", "region", "layer")
+
+# Fields that vary within an availability row, matched per flattened entry
+ENTRY_FIELDS = ("region", "layer")
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Iterate over the positions of the set bits of mask in ascending order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@frozen
+class CatalogColumns:
+    """Flattened catalog with one entry per (product, availability, region, layer).
+
+    Each column is dictionary encoded as integer `codes` into a list of `categories`.
+
+    Args:
+        row: Availability row of each entry.
+        codes: Column name -> category code of each entry.
+        categories: Column name -> category values.
+    """
+
+    row: "np.ndarray"
+    codes: Dict[str, "np.ndarray"]
+    categories: Dict[str, List[str]]
+
+
+@define
+class CatalogIndex:
+    """Bitmap index over the availability rows of a product catalog.
+
+    Args:
+        products: Catalog to index.
+    """
+
+    products: List[Product]
+    # (product index, availability index) of every row
+    rows: List[Tuple[int, int]] = field(init=False, factory=list)
+    # field -> value -> bitmap of rows
+    bitmaps: Dict[str, Dict[str, int]] = field(init=False, factory=dict)
+    # bitmap of all rows belonging to each product
+    product_masks: List[int] = field(init=False, factory=list)
+    # (name, version) -> row, to map (filtered) Products back to rows
+    row_ids: Dict[Tuple[str, str], int] = field(init=False, factory=dict)
+    # layer -> index of the (last) product offering it
+    layer_products: Dict[str, int] = field(init=False, factory=dict)
+    _columns: Optional[CatalogColumns] = field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        """Build row bitmaps."""
+        bitmaps: Dict[str, Dict[str, int]] = {
+            key: {} for key in ("name", "code", "theme", "version", "region", "layer")
+        }
+
+        def add(key: str, value: str, bit: int) -> None:
+            bitmaps[key][value] = bitmaps[key].get(value, 0) | bit
+
+        for i, product in enumerate(self.products):
+            product_mask = 0
+            for j, pa in enumerate(product.availability):
+                bit = 1 << len(self.rows)
+                self.row_ids[(product.name, pa.version.value)] = len(self.rows)
+                self.rows.append((i, j))
+                product_mask |= bit
+                add("version", pa.version.value, bit)
+                for region in pa.regions:
+                    add("region", region.value, bit)
+                for layer in pa.layers:
+                    add("layer", layer, bit)
+                    self.layer_products[layer] = i
+            self.product_masks.append(product_mask)
+            add("name", product.name, product_mask)
+            add("code", product.code, product_mask)
+            add("theme", product.theme.value, product_mask)
+        self.bitmaps = bitmaps
+
+    @property
+    def all_rows(self) -> int:
+        """Bitmap with every row set."""
+        return (1 << len(self.rows)) - 1
+
+    def lookup(self, key: str, value: str) -> int:
+        """Get the bitmap of rows where field `key` has `value`.
+
+        Args:
+            key: Field name (`name`, `code`, `theme`, `version`, `region` or `layer`).
+            value: Field value.
+
+        Returns:
+            Bitmap of matching rows.
+
+        Raises:
+            KeyError: If `key` is not an indexed field.
+        """
+        return self.bitmaps[key].get(value, 0)
+
+    def get_products(self, mask: int) -> List[Product]:
+        """Get the Products selected by a row bitmap.
+
+        Products keep only the availabilities whose rows are selected.
+
+        Args:
+            mask: Bitmap of selected rows.
+
+        Returns:
+            List of Products in catalog order.
+        """
+        products = []
+        for i, product_mask in enumerate(self.product_masks):
+            selected = mask & product_mask
+            if not selected:
+                continue
+            product = self.products[i]
+            if selected != product_mask:
+                product = Product(
+                    name=product.name,
+                    code=product.code,
+                    theme=product.theme,
+                    byte_width=product.byte_width,
+                    categorical=product.categorical,
+                    availability=[
+                        product.availability[self.rows[row][1]]
+                        for row in _iter_bits(selected)
+                    ],
+                )
+            products.append(product)
+        return products
+
+    def get_mask(self, products: List[Product]) -> int:
+        """Get the row bitmap of Products from this catalog, i.e. search results.
+
+        Args:
+            products: Products (possibly with filtered availabilities) from the indexed catalog.
+
+        Returns:
+            Bitmap of the rows of every availability of the products.
+        """
+        mask = 0
+        for product in products:
+            for pa in product.availability:
+                mask |= 1 << self.row_ids[(product.name, pa.version.value)]
+        return mask
+
+    @property
+    def columns(self) -> CatalogColumns:
+        """Flattened, dictionary encoded catalog columns, built on first access."""
+        if self._columns is None:
+            numpy = import_optional("numpy")
+            categories: Dict[str, Dict[str, int]] = {col: {} for col in COLUMNS}
+            codes: Dict[str, List[int]] = {col: [] for col in COLUMNS}
+            rows: List[int] = []
+
+            def encode(col: str, value: str, repeat: int) -> None:
+                code = categories[col].setdefault(value, len(categories[col]))
+                codes[col].extend([code] * repeat)
+
+            for row, (i, j) in enumerate(self.rows):
+                product = self.products[i]
+                pa = product.availability[j]
+                n = len(pa.regions) * len(pa.layers)
+                rows.extend([row] * n)
+                encode("name", product.name, n)
+                encode("code", product.code, n)
+                encode("theme", product.theme.value, n)
+                encode("version", pa.version.value, n)
+                for region in pa.regions:
+                    encode("region", region.value, len(pa.layers))
+                    for layer in pa.layers:
+                        encode("layer", layer, 1)
+
+            self._columns = CatalogColumns(
+                row=numpy.asarray(rows, dtype=numpy.int32),
+                codes={
+                    col: numpy.asarray(codes[col], dtype=numpy.int32) for col in COLUMNS
+                },
+                categories={col: list(categories[col]) for col in COLUMNS},
+            )
+        return self._columns
+
+    def entry_mask(self, mask: int) -> "np.ndarray":
+        """Expand a row bitmap to a boolean mask over the flattened entries.
+
+        Args:
+            mask: Bitmap of selected rows.
+
+        Returns:
+            Boolean array with one value per flattened entry.
+        """
+        numpy = import_optional("numpy")
+        selected = numpy.zeros(len(self.rows), dtype=bool)
+        selected[list(_iter_bits(mask))] = True
+        entries: "np.ndarray" = selected[self.columns.row]
+        return entries
+
+    def match_entries(self, key: str, values: Sequence[str]) -> "np.ndarray":
+        """Get the boolean mask of flattened entries where field `key` has any of `values`.
+
+        Regions and layers are matched per entry, other fields per availability row.
+
+        Args:
+            key: Field name (`name`, `code`, `theme`, `version`, `region` or `layer`).
+            values: Field values.
+
+        Returns:
+            Boolean array with one value per flattened entry.
+        """
+        if key not in ENTRY_FIELDS:
+            mask = 0
+            for value in values:
+                mask |= self.lookup(key, value)
+            return self.entry_mask(mask)
+        numpy = import_optional("numpy")
+        columns = self.columns
+        codes = [
+            i for i, value in enumerate(columns.categories[key]) if value in values
+        ]
+        matches: "np.ndarray" = numpy.isin(columns.codes[key], codes)
+        return matches
+
+    def select_columns(
+        self, mask: int, entries: Optional["np.ndarray"] = None
+    ) -> Tuple[Dict[str, "np.ndarray"], Dict[str, List[str]]]:
+        """Select the flattened entries of the rows in a bitmap.
+
+        Args:
+            mask: Bitmap of selected rows.
+            entries: Optional boolean mask further restricting the flattened entries, i.e. from `match_entries()`.
+
+        Returns:
+            Category codes of the selected entries per column and the categories per column.
+        """
+        numpy = import_optional("numpy")
+        columns = self.columns
+        selected = self.entry_mask(mask)
+        if entries is not None:
+            selected &= entries
+        take = numpy.flatnonzero(selected)
+        return {col: columns.codes[col][take] for col in COLUMNS}, columns.categories
+
+    def get_layers(self, mask: int) -> List[str]:
+        """Get the unique layers of the rows selected by a bitmap.
+
+        Args:
+            mask: Bitmap of selected rows.
+
+        Returns:
+            List of layers.
+        """
+        return [layer for layer, rows in self.bitmaps["layer"].items() if rows & mask]
+
+
+# Index of the last catalog returned by current_products()
+_index: Optional[CatalogIndex] = None
+
+
+def get_index() -> CatalogIndex:
+    """Get the index of the current product catalog, building it on first use.
+
+    The index is rebuilt automatically if a different catalog is installed (i.e. by `refresh_catalog()`).
+
+    Returns:
+        CatalogIndex.
+    """
+    global _index
+    products = current_products()
+    if _index is None or _index.products is not products:
+        _index = CatalogIndex(products)
+    return _index
@@ -0,0 +1,378 @@
+"""Boolean query expressions over the product catalog.
+
+Queries are built with `Q` and combined with `&` (and), `|` (or) and `~` (not), or parsed from a small string syntax with `parse_query()`:
+
+    Q.theme(ProductTheme.fuel) & Q.version(ProductVersion.lf_2020) & ~Q.theme(ProductTheme.mod_fis) | Q.code("ELEV", "SLPD", "ASP")
+
+    parse_query('theme:fuel and version:2.2.0 and not theme:mod-fis or code:(ELEV, SLPD, ASP)')
+
+Queries select availability rows of the catalog: `name`, `code` and `theme` terms match every availability of a product, while `version`, `region` and `layer` terms only match the availabilities they apply to. Queries compile to bitmap operations on the precomputed `CatalogIndex`. For columnar exports they are also evaluated per flattened (availability, region, layer) entry with `evaluate_entries()`, where `region` and `layer` terms only match their own regions and layers.
+"""
+import re
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Type, Union
+
+from attrs import define, field, frozen
+
+from landfire.product.enums import ProductRegion, ProductTheme, ProductVersion
+from landfire.product.index import CatalogIndex
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+__all__ = ["Q", "Query", "parse_query"]
+
+QueryValue = Union[str, Enum]
+
+# Enums accepted (by value or member name) for each enumerated field
+_FIELD_ENUMS: Dict[str, Type[Enum]] = {
+    "theme": ProductTheme,
+    "version": ProductVersion,
+    "region": ProductRegion,
+}
+FIELDS = ("name", "code", "theme", "version", "region", "layer")
+
+
+def _normalize(key: str, value: QueryValue) -> str:
+    """Normalize a query value to the representation stored in the index."""
+    enum = _FIELD_ENUMS.get(key)
+    if isinstance(value, Enum):
+        return str(value.value)
+    if enum is not None and value in enum.__members__:
+        return str(enum[value].value)
+    if key == "name":
+        return value.lower()
+    return value
+
+
+class Query(ABC):
+    """Base class of query expressions."""
+
+    @abstractmethod
+    def evaluate(self, index: CatalogIndex) -> int:
+        """Evaluate the query to a bitmap of matching availability rows.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+        """
+
+    @abstractmethod
+    def evaluate_entries(self, index: CatalogIndex) -> "np.ndarray":
+        """Evaluate the query to a boolean mask over the flattened catalog entries.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+        """
+
+    def __and__(self, other: "Query") -> "Query":
+        """Match rows matching both queries."""
+        return And(self, other)
+
+    def __or__(self, other: "Query") -> "Query":
+        """Match rows matching either query."""
+        return Or(self, other)
+
+    def __invert__(self) -> "Query":
+        """Match rows not matching the query."""
+        return Not(self)
+
+
+def _to_values(values: Iterable[str]) -> Tuple[str, ...]:
+    """Convert values to a tuple."""
+    return tuple(values)
+
+
+@frozen
+class Term(Query):
+    """Match rows where `key` equals any of `values`.
+
+    Args:
+        key: Field name, one of `name`, `code`, `theme`, `version`, `region` or `layer`.
+        values: Accepted field values.
+    """
+
+    key: str = field()
+    values: Tuple[str, ...] = field(converter=_to_values)
+
+    @key.validator
+    def _key_check(self, attribute: object, value: str) -> None:
+        """Ensure key is a queryable field."""
+        if value not in FIELDS:
+            raise ValueError(
+                f"`{value}` is not a queryable field! Supported fields are {', '.join(FIELDS)}."
+            )
+
+    def evaluate(self, index: CatalogIndex) -> int:
+        """Evaluate the term to a bitmap of matching availability rows.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+
+        Returns:
+            Bitmap of matching rows.
+        """
+        mask = 0
+        for value in self.values:
+            mask |= index.lookup(self.key, value)
+        return mask
+
+    def evaluate_entries(self, index: CatalogIndex) -> "np.ndarray":
+        """Evaluate the term to a boolean mask over the flattened catalog entries.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+
+        Returns:
+            Boolean array with one value per entry.
+        """
+        return index.match_entries(self.key, self.values)
+
+
+@frozen
+class And(Query):
+    """Match rows matching both `left` and `right`."""
+
+    left: Query
+    right: Query
+
+    def evaluate(self, index: CatalogIndex) -> int:
+        """Evaluate the query to a bitmap of matching availability rows.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+
+        Returns:
+            Bitmap of matching rows.
+        """
+        return self.left.evaluate(index) & self.right.evaluate(index)
+
+    def evaluate_entries(self, index: CatalogIndex) -> "np.ndarray":
+        """Evaluate the query to a boolean mask over the flattened catalog entries.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+
+        Returns:
+            Boolean array with one value per entry.
+        """
+        entries: "np.ndarray" = self.left.evaluate_entries(
+            index
+        ) & self.right.evaluate_entries(index)
+        return entries
+
+
+@frozen
+class Or(Query):
+    """Match rows matching `left` or `right`."""
+
+    left: Query
+    right: Query
+
+    def evaluate(self, index: CatalogIndex) -> int:
+        """Evaluate the query to a bitmap of matching availability rows.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+
+        Returns:
+            Bitmap of matching rows.
+        """
+        return self.left.evaluate(index) | self.right.evaluate(index)
+
+    def evaluate_entries(self, index: CatalogIndex) -> "np.ndarray":
+        """Evaluate the query to a boolean mask over the flattened catalog entries.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+
+        Returns:
+            Boolean array with one value per entry.
+        """
+        entries: "np.ndarray" = self.left.evaluate_entries(
+            index
+        ) | self.right.evaluate_entries(index)
+        return entries
+
+
+@frozen
+class Not(Query):
+    """Match rows not matching `query`."""
+
+    query: Query
+
+    def evaluate(self, index: CatalogIndex) -> int:
+        """Evaluate the query to a bitmap of matching availability rows.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+
+        Returns:
+            Bitmap of matching rows.
+        """
+        return index.all_rows & ~self.query.evaluate(index)
+
+    def evaluate_entries(self, index: CatalogIndex) -> "np.ndarray":
+        """Evaluate the query to a boolean mask over the flattened catalog entries.
+
+        Args:
+            index: CatalogIndex to evaluate against.
+
+        Returns:
+            Boolean array with one value per entry.
+        """
+        entries: "np.ndarray" = ~self.query.evaluate_entries(index)
+        return entries
+
+
+class Q:
+    """Constructors for query terms. Each accepts one or more values which are OR'ed together."""
+
+    @staticmethod
+    def name(*names: str) -> Query:
+        """Match products by name, ignoring case."""
+        return Term("name", [_normalize("name", v) for v in names])
+
+    @staticmethod
+    def code(*codes: str) -> Query:
+        """Match products by product code."""
+        return Term("code", [_normalize("code", v) for v in codes])
+
+    @staticmethod
+    def theme(*themes: QueryValue) -> Query:
+        """Match products by ProductTheme (member, value or member name)."""
+        return Term("theme", [_normalize("theme", v) for v in themes])
+
+    @staticmethod
+    def version(*versions: QueryValue) -> Query:
+        """Match availabilities by ProductVersion (member, value or member name)."""
+        return Term("version", [_normalize("version", v) for v in versions])
+
+    @staticmethod
+    def region(*regions: QueryValue) -> Query:
+        """Match availabilities by ProductRegion (member, value or member name)."""
+        return Term("region", [_normalize("region", v) for v in regions])
+
+    @staticmethod
+    def layer(*layers: str) -> Query:
+        """Match availabilities containing any of the layers."""
+        return Term("layer", [_normalize("layer", v) for v in layers])
+
+
+# field:value, field:"quoted value", field:(v1, "v 2"), parentheses and keywords
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<term>(?P<key>\w+):(?:\((?P<list>[^)]*)\)|"(?P<quoted>[^"]*)"|(?P<value>[^\s()]+)))
+        |(?P<op>\(|\)|\band\b|\bor\b|\bnot\b)
+    )""",
+    re.VERBOSE | re.IGNORECASE,
+)
+_LIST_ITEM = re.compile(r'\s*(?:"([^"]*)"|([^,"]+?))\s*(?:,|$)')
+
+
+def _tokenize(text: str) -> List[Union[str, Query]]:
+    """Split a query string into operators and Terms."""
+    tokens: List[Union[str, Query]] = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Unable to parse query at `{text[pos:]}`.")
+        pos = match.end()
+        if match.group("op"):
+            tokens.append(match.group("op").lower())
+            continue
+        key = match.group("key").lower()
+        if match.group("list") is not None:
+            values = [
+                quoted if quoted else bare
+                for quoted, bare in _LIST_ITEM.findall(match.group("list"))
+            ]
+        elif match.group("quoted") is not None:
+            values = [match.group("quoted")]
+        else:
+            values = [match.group("value")]
+        if key not in FIELDS:
+            raise ValueError(
+                f"`{key}` is not a queryable field! Supported fields are {', '.join(FIELDS)}."
+            )
+        tokens.append(getattr(Q, key)(*values))
+    return tokens
+
+
+@define
+class _Parser:
+    """Recursive descent parser over query tokens."""
+
+    text: str
+    tokens: List[Union[str, Query]]
+    pos: int = 0
+
+    def peek(self) -> Union[str, Query, None]:
+        """Get the next token without consuming it."""
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> Union[str, Query]:
+        """Consume the next token."""
+        if self.pos >= len(self.tokens):
+            raise ValueError(f"Unexpected end of query `{self.text}`.")
+        self.pos += 1
+        return self.tokens[self.pos - 1]
+
+    def parse(self) -> Query:
+        """Parse all tokens."""
+        query = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise ValueError(
+                f"Unexpected `{self.tokens[self.pos]}` in query `{self.text}`."
+            )
+        return query
+
+    def parse_or(self) -> Query:
+        """Parse `and` expressions joined by `or`."""
+        query = self.parse_and()
+        while self.peek() == "or":
+            self.take()
+            query = query | self.parse_and()
+        return query
+
+    def parse_and(self) -> Query:
+        """Parse `not` expressions joined by `and`."""
+        query = self.parse_not()
+        while self.peek() == "and":
+            self.take()
+            query = query & self.parse_not()
+        return query
+
+    def parse_not(self) -> Query:
+        """Parse a term, a negation or a parenthesized expression."""
+        token = self.take()
+        if token == "not":
+            return ~self.parse_not()
+        if token == "(":
+            query = self.parse_or()
+            if self.take() != ")":
+                raise ValueError(f"Unbalanced parentheses in query `{self.text}`.")
+            return query
+        if isinstance(token, Query):
+            return token
+        raise ValueError(f"Unexpected `{token}` in query `{self.text}`.")
+
+
+def parse_query(text: str) -> Query:
+    """Parse a query string.
+
+    Terms have the form `field:value`, `field:"value with spaces"` or `field:(value1, value2)` where field is one of `name`, `code`, `theme`, `version`, `region` or `layer`. Terms are combined with `not`, `and` and `or` (in order of precedence) and grouped with parentheses.
+
+    Args:
+        text: Query string.
+
+    Returns:
+        Parsed Query.
+
+    Raises:
+        ValueError: If the query string is malformed.
+    """
+    return _Parser(text, _tokenize(text)).parse()
@@ -0,0 +1,209 @@
+"""Refresh the product catalog from the live LANDFIRE Product Service.
+
+The packaged catalog is hand-copied from the LFPS products table and only changes with a release. `refresh_catalog()` fetches the geoprocessing task description from the service, merges any newly published layers into the catalog and keeps the compiled result on disk so later refreshes cost a single conditional request.
+"""
+import hashlib
+import re
+import warnings
+from typing import Any, Dict, List, Optional, Tuple
+
+from landfire._cache import fetch_cached_json, get_cache_dir
+from landfire.core import BASE_URL
+from landfire.product.enums import ProductVersion
+from landfire.product.models import (
+    SNAPSHOT_PATH,
+    Product,
+    ProductAvailability,
+    build_snapshot,
+    load_products,
+    parse_snapshot,
+    set_current_products,
+)
+
+
+__all__ = ["compile_catalog", "refresh_catalog"]
+
+# Revalidate the cached catalog at most once a day by default
+DEFAULT_TTL = 24 * 60 * 60
+
+# Version prefix (i.e. `220` in `220F40_22`) and year suffix (`2021` in `DIST2021`, `_22` in `220CBH_22`)
+_VERSION_PREFIX = re.compile(r"^\d{3}")
+_YEAR_SUFFIX = re.compile(r"(\d{4}|_\d{2})$")
+
+
+def _layer_family(layer: str) -> str:
+    """Reduce a layer name to its family by dropping version prefix and year suffix.
+
+    For example `DIST2021` and `DIST1999` share the family `DIST` and `220CBH_22` and `200CBH_19` share the family `CBH`.
+    """
+    return _YEAR_SUFFIX.sub("", _VERSION_PREFIX.sub("", layer))
+
+
+def _layer_version(layer: str, default: ProductVersion) -> Optional[ProductVersion]:
+    """Get the version of a layer from its version prefix, i.e. `2.2.0` for `220F40_22`.
+
+    Layers without a prefix (`DIST2021`) get the default, layers with an unknown version None.
+    """
+    prefix = _VERSION_PREFIX.match(layer)
+    if prefix is None:
+        return default
+    try:
+        return ProductVersion(".".join(prefix.group()))
+    except ValueError:
+        return None
+
+
+def _version_key(version: ProductVersion) -> Tuple[int, ...]:
+    """Sort key of a product version."""
+    return tuple(int(part) for part in version.value.split("."))
+
+
+def _add_layers(product: Product, layers: List[str]) -> Product:
+    """Add layers to the availability of their version, creating it with the regions of the latest availability if needed."""
+    availability = list(product.availability)
+    latest = availability[-1]
+    for layer in layers:
+        version = _layer_version(layer, latest.version)
+        index = next(
+            (
+                i
+                for i in reversed(range(len(availability)))
+                if availability[i].version == version
+            ),
+            None,
+        )
+        if index is None:
+            availability.append(
+                ProductAvailability(
+                    version=version, regions=latest.regions, layers=[layer]
+                )
+            )
+        else:
+            pa = availability[index]
+            availability[index] = ProductAvailability(
+                version=pa.version, regions=pa.regions, layers=[*pa.layers, layer]
+            )
+    return Product(
+        name=product.name,
+        code=product.code,
+        theme=product.theme,
+        byte_width=product.byte_width,
+        categorical=product.categorical,
+        availability=sorted(availability, key=lambda pa: _version_key(pa.version)),
+    )
+
+
+def get_layer_choices(task: Dict[str, Any]) -> List[str]:
+    """Get the layer names published in a GP task description.
+
+    Args:
+        task: Decoded GP task description (`?f=json`).
+
+    Returns:
+        Layer names from the `Layer_List` parameter choice list.
+
+    Raises:
+        RuntimeError: If the task description has no `Layer_List` choice list.
+    """
+    for param in task.get("parameters", []):
+        if param.get("name") == "Layer_List" and param.get("choiceList"):
+            return [str(choice) for choice in param["choiceList"]]
+    raise RuntimeError(
+        "The LANDFIRE Product Service task description does not publish a `Layer_List` choice list."
+    )
+
+
+def compile_catalog(layers: List[str], base: List[Product]) -> List[Product]:
+    """Merge a list of published layers into a product catalog.
+
+    Layers already in `base` are left untouched. A new layer is added to the last product (in catalog order) with a layer of the same family, i.e. `FDIST2023` is added next to `FDIST2022`. It joins the availability of the version in its prefix, a new one with the regions of the latest availability if the product has none for that version yet (`200FRG` next to `140FRG`). Layers without a prefix join the latest availability. Layers without a known family or with a version missing from `ProductVersion` are skipped with a warning since their product, theme or version can't be inferred.
+
+    Args:
+        layers: Layer names published by the service.
+        base: Catalog to merge into.
+
+    Returns:
+        Merged catalog.
+    """
+    known = {
+        layer for product in base for pa in product.availability for layer in pa.layers
+    }
+
+    # family -> index of last product in base containing that family
+    families: Dict[str, int] = {}
+    for i, product in enumerate(base):
+        for pa in product.availability:
+            for layer in pa.layers:
+                families[_layer_family(layer)] = i
+
+    additions: Dict[int, List[str]] = {}
+    unmatched: List[str] = []
+    for layer in layers:
+        if layer in known:
+            continue
+        known.add(layer)
+        index = families.get(_layer_family(layer))
+        if index is None or _layer_version(layer, ProductVersion.lf_2020) is None:
+            unmatched.append(layer)
+        else:
+            additions.setdefault(index, []).append(layer)
+
+    if unmatched:
+        warnings.warn(
+            f"Skipping layers with no known product or version: {', '.join(unmatched)}.",
+            stacklevel=2,
+        )
+
+    products = list(base)
+    for index, new_layers in additions.items():
+        products[index] = _add_layers(products[index], new_layers)
+    return products
+
+
+def _cache_file_name() -> str:
+    """Name of the compiled catalog in the cache directory.
+
+    The name is keyed on the packaged snapshot so a catalog compiled against an older release is never reused after upgrading.
+    """
+    digest = hashlib.sha1(SNAPSHOT_PATH.read_bytes()).hexdigest()[:12]  # noqa: S324
+    return f"products-{digest}.json"
+
+
+def refresh_catalog(
+    url: str = BASE_URL,
+    *,
+    cache_dir: Optional[str] = None,
+    ttl: float = DEFAULT_TTL,
+    activate: bool = True,
+    timeout: float = 60,
+) -> List[Product]:
+    """Refresh the product catalog from the LANDFIRE Product Service.
+
+    The compiled catalog is kept in `cache_dir` together with the service's `ETag`/`Last-Modified` validators. Within `ttl` seconds the cached copy is used without any request, afterwards it is revalidated with a conditional request that normally returns `304 Not Modified`.
+
+    Args:
+        url: URL of the GP task description. Defaults to the LANDFIRE Product Service.
+        cache_dir: Directory to keep the compiled catalog in. See `landfire._cache.get_cache_dir()` for the default.
+        ttl: Seconds the cached catalog is used before being revalidated.
+        activate: Whether to install the refreshed catalog for `ProductSearch`, `Landfire` layer validation and the product utilities.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        Refreshed list of Products.
+    """
+
+    def compile_task(task: Dict[str, Any]) -> Dict[str, Any]:
+        return build_snapshot(compile_catalog(get_layer_choices(task), load_products()))
+
+    snapshot = fetch_cached_json(
+        url,
+        get_cache_dir(cache_dir) / _cache_file_name(),
+        ttl=ttl,
+        params={"f": "json"},
+        transform=compile_task,
+        timeout=timeout,
+    )
+    products = parse_snapshot(snapshot)
+    if activate:
+        set_current_products(products)
+    return products
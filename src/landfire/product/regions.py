@@ -0,0 +1,216 @@
+"""Offline inference of the LANDFIRE regions covered by a bounding box.
+
+Each `ProductRegion` is described by simplified boundary polygons in longitude/latitude, digitized coarsely and buffered outward by roughly 25-50 km so that coastal islands and borders are always included. The outlines are only meant to tell CONUS, Alaska and Hawaii apart, not to clip data: a bounding box close to a region may be counted as inside it, but a bounding box over a region is never missed.
+
+Regions are tested against their envelopes first and polygons only if the envelope intersects, so inference takes a few microseconds and needs no network or geospatial dependencies.
+"""
+from typing import Dict, Iterable, Sequence, Tuple
+
+from landfire.product.enums import ProductRegion
+
+
+__all__ = ["REGION_BOUNDARIES", "infer_regions"]
+
+Point = Tuple[float, float]
+Ring = Tuple[Point, ...]
+Bounds = Tuple[float, float, float, float]
+
+# Simplified, buffered outlines (rings of (lon, lat)) per region. Alaska is split at the antimeridian.
+REGION_BOUNDARIES: Dict[ProductRegion, Tuple[Ring, ...]] = {
+    ProductRegion.US: (
+        (
+            (-125.3, 49.4),
+            (-95.0, 49.4),
+            (-95.0, 49.8),
+            (-89.2, 48.6),
+            (-84.5, 47.4),
+            (-83.0, 46.3),
+            (-82.0, 43.3),
+            (-78.5, 43.9),
+            (-76.0, 44.6),
+            (-74.5, 45.4),
+            (-71.0, 45.6),
+            (-70.0, 46.9),
+            (-69.0, 47.8),
+            (-67.4, 47.5),
+            (-66.5, 45.0),
+            (-66.6, 44.2),
+            (-69.5, 41.0),
+            (-71.5, 40.7),
+            (-73.8, 40.0),
+            (-75.2, 37.8),
+            (-75.0, 35.1),
+            (-77.4, 33.4),
+            (-80.4, 31.5),
+            (-79.7, 26.5),
+            (-79.9, 24.8),
+            (-81.5, 24.2),
+            (-83.3, 24.3),
+            (-83.2, 28.3),
+            (-84.5, 29.4),
+            (-89.5, 28.6),
+            (-94.5, 28.9),
+            (-97.0, 25.5),
+            (-99.5, 26.0),
+            (-101.5, 29.3),
+            (-103.0, 28.6),
+            (-104.8, 29.3),
+            (-106.6, 31.3),
+            (-108.4, 31.1),
+            (-111.1, 31.0),
+            (-114.9, 32.2),
+            (-117.3, 32.2),
+            (-118.9, 32.6),
+            (-120.9, 33.7),
+            (-121.2, 34.5),
+            (-122.9, 36.4),
+            (-124.1, 39.5),
+            (-124.9, 40.3),
+            (-124.9, 42.5),
+            (-124.4, 46.0),
+            (-125.3, 48.3),
+            (-125.3, 49.4),
+        ),
+    ),
+    ProductRegion.AK: (
+        (
+            (-180.0, 50.7),
+            (-177.0, 50.9),
+            (-172.0, 51.4),
+            (-168.0, 52.2),
+            (-162.5, 53.8),
+            (-159.0, 54.5),
+            (-155.5, 55.3),
+            (-153.0, 56.1),
+            (-151.4, 57.7),
+            (-150.0, 58.9),
+            (-146.5, 59.1),
+            (-144.0, 59.7),
+            (-139.8, 59.3),
+            (-137.0, 57.4),
+            (-134.0, 54.4),
+            (-130.4, 54.4),
+            (-129.6, 55.5),
+            (-129.8, 56.2),
+            (-131.8, 57.0),
+            (-133.2, 58.5),
+            (-135.3, 59.9),
+            (-137.4, 59.1),
+            (-139.1, 60.5),
+            (-140.6, 60.4),
+            (-140.6, 70.1),
+            (-148.0, 70.8),
+            (-156.8, 71.7),
+            (-162.0, 70.6),
+            (-167.6, 68.6),
+            (-166.2, 66.5),
+            (-169.3, 65.8),
+            (-172.6, 64.0),
+            (-172.6, 63.0),
+            (-173.3, 60.2),
+            (-171.0, 56.6),
+            (-180.0, 54.0),
+            (-180.0, 50.7),
+        ),
+        (
+            (172.0, 51.8),
+            (180.0, 50.7),
+            (180.0, 54.0),
+            (172.0, 53.4),
+            (172.0, 51.8),
+        ),
+    ),
+    ProductRegion.HI: (
+        (
+            (-160.9, 21.4),
+            (-160.2, 22.4),
+            (-159.1, 22.5),
+            (-156.4, 21.5),
+            (-154.6, 19.8),
+            (-154.9, 18.8),
+            (-156.0, 18.7),
+            (-156.3, 19.6),
+            (-160.9, 21.4),
+        ),
+    ),
+}
+
+
+def _envelope(points: Iterable[Point]) -> Bounds:
+    """Get the bounds of points."""
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+# (region, ring, ring envelope) in region order
+_INDEX = tuple(
+    (region, ring, _envelope(ring))
+    for region, rings in REGION_BOUNDARIES.items()
+    for ring in rings
+)
+
+
+def _contains(ring: Sequence[Point], x: float, y: float) -> bool:
+    """Test whether a point is inside a ring (even-odd rule)."""
+    inside = False
+    x0, y0 = ring[-1]
+    for x1, y1 in ring:
+        if (y1 > y) != (y0 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+            inside = not inside
+        x0, y0 = x1, y1
+    return inside
+
+
+def _segment_hits_box(a: Point, b: Point, bounds: Bounds) -> bool:
+    """Test whether the segment a-b intersects a box (Liang-Barsky clipping)."""
+    min_x, min_y, max_x, max_y = bounds
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    low, high = 0.0, 1.0
+    for p, q in (
+        (-dx, a[0] - min_x),
+        (dx, max_x - a[0]),
+        (-dy, a[1] - min_y),
+        (dy, max_y - a[1]),
+    ):
+        if p == 0:
+            if q < 0:
+                return False
+        elif p < 0:
+            low = max(low, q / p)
+        else:
+            high = min(high, q / p)
+        if low > high:
+            return False
+    return True
+
+
+def _intersects(ring: Sequence[Point], bounds: Bounds) -> bool:
+    """Test whether a ring and a box intersect."""
+    min_x, min_y, max_x, max_y = bounds
+    # Box inside the ring, or an edge of the ring touching the box
+    if _contains(ring, min_x, min_y):
+        return True
+    return any(
+        _segment_hits_box(ring[i - 1], ring[i], bounds) for i in range(1, len(ring))
+    )
+
+
+def infer_regions(bounds: Sequence[float]) -> Tuple[ProductRegion, ...]:
+    """Infer the LANDFIRE regions intersecting a longitude/latitude bounding box.
+
+    Args:
+        bounds: Bounds `(min_x, min_y, max_x, max_y)` in EPSG:4326.
+
+    Returns:
+        Intersecting regions in `ProductRegion` order. Empty if the bounding box is outside of all regions.
+    """
+    min_x, min_y, max_x, max_y = bounds
+    box = (min_x, min_y, max_x, max_y)
+    regions = []
+    for region, ring, (x0, y0, x1, y1) in _INDEX:
+        if region in regions or x0 > max_x or x1 < min_x or y0 > max_y or y1 < min_y:
+            continue
+        if _intersects(ring, box):
+            regions.append(region)
+    return tuple(sorted(regions, key=list(ProductRegion).index))
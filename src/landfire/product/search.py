@@ -1,10 +1,19 @@
 """Search class for obtaining product information."""
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 from attr import define, field
 
+from landfire._optional import import_optional
 from landfire.product.enums import ProductRegion, ProductTheme, ProductVersion
-from landfire.product.models import PRODUCTS, Product
+from landfire.product.index import COLUMNS, get_index
+from landfire.product.models import Product, current_products
+from landfire.product.query import Query, parse_query
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pandas as pd
+    import pyarrow
 
 
 @define
@@ -13,6 +22,8 @@ class ProductSearch:
 
     Call get_products() or get_layers() to get search output depending on your needs. Passing no arguments to this class will result in no actual searching and methods called on this object will return all products/layers.
 
+    Filters passed as lists are combined with AND across arguments and OR within each list. For anything more complex (OR across fields, NOT), pass a `query` built with `landfire.product.query.Q` or a query string, i.e. `'theme:fuel and version:2.2.0 and not theme:mod-fis or code:(ELEV, SLPD, ASP)'`. The query is evaluated first and the other filters are applied to its result.
+
     A reference table of available LANDFIRE products can be found here: https://lfps.usgs.gov/helpdocs/productstable.html
 
     Args:
@@ -21,6 +32,7 @@ class ProductSearch:
         themes: Product themes. See ProductTheme enum.
         versions: Product versions. See ProductVersion enum.
         regions: Product regions. See ProductRegion enum.
+        query: Boolean product query. See `landfire.product.query`.
 
     """
 
@@ -29,8 +41,20 @@ class ProductSearch:
     themes: Optional[List[ProductTheme]] = field(kw_only=True, default=None)
     versions: Optional[List[ProductVersion]] = field(kw_only=True, default=None)
     regions: Optional[List[ProductRegion]] = field(kw_only=True, default=None)
+    query: Optional[Union[Query, str]] = field(kw_only=True, default=None)
+
+    _products: List[Product] = field(factory=current_products, init=False)
 
-    _products: List[Product] = field(default=PRODUCTS, init=False)
+    def _filter_by_query(self, query: Union[Query, str]) -> None:
+        """Filter products with a boolean query evaluated on the catalog index.
+
+        Args:
+            query: Query or query string.
+        """
+        if isinstance(query, str):
+            query = parse_query(query)
+        index = get_index()
+        self._products = index.get_products(query.evaluate(index))
 
     def _filter_by_name(self, names: List[str]) -> None:
         """Filter products by name(s).
@@ -84,6 +108,8 @@ class ProductSearch:
                     name=product.name,
                     code=product.code,
                     theme=product.theme,
+                    byte_width=product.byte_width,
+                    categorical=product.categorical,
                     availability=availabilities,
                 )
                 products.append(product)
@@ -125,8 +151,9 @@ class ProductSearch:
         themes: Optional[List[ProductTheme]] = None,
         versions: Optional[List[ProductVersion]] = None,
         regions: Optional[List[ProductRegion]] = None,
+        query: Optional[Union[Query, str]] = None,
     ) -> List[Product]:
-        """Query products for a particular combination of names, product codes, themes, versions, and regions. Passing no arguments results in no actual searching.
+        """Query products for a particular combination of names, product codes, themes, versions, regions, and a boolean query. Passing no arguments results in no actual searching.
 
         Args:
             names: Product names.
@@ -134,10 +161,13 @@ class ProductSearch:
             themes: Product themes. See ProductTheme enum.
             versions: Product versions. See ProductVersion enum.
             regions: Product regions. See ProductRegion enum.
+            query: Boolean product query. See `landfire.product.query`.
 
         Returns:
             List of matching products.
         """
+        if query is not None:
+            self._filter_by_query(query)
         if names:
             self._filter_by_name(names)
         if codes:
@@ -163,6 +193,7 @@ class ProductSearch:
             themes=self.themes,
             versions=self.versions,
             regions=self.regions,
+            query=self.query,
         )
 
     def get_layers(self) -> List[str]:
@@ -177,5 +208,78 @@ class ProductSearch:
             themes=self.themes,
             versions=self.versions,
             regions=self.regions,
+            query=self.query,
         )
         return self._get_layers(products)
+
+    def _get_columns(self) -> Tuple[Dict[str, "np.ndarray"], Dict[str, List[str]]]:
+        """Get dictionary encoded flattened columns of the matching products.
+
+        Products are matched per availability, region and layer filters are then applied per entry so only the requested regions and layers are exported.
+        """
+        products = self.get_products()
+        index = get_index()
+        entries = None
+        if self.query is not None:
+            query = (
+                parse_query(self.query) if isinstance(self.query, str) else self.query
+            )
+            entries = query.evaluate_entries(index)
+        if self.regions:
+            regions = index.match_entries(
+                "region", [region.value for region in self.regions]
+            )
+            entries = regions if entries is None else entries & regions
+        return index.select_columns(index.get_mask(products), entries)
+
+    def to_records(self) -> "np.recarray":
+        """Export matching products as a NumPy record array.
+
+        There is one record per (name, code, theme, version, region, layer) combination. Columns are gathered from the precomputed, flattened catalog instead of looping over products.
+
+        Returns:
+            Record array with string fields name, code, theme, version, region and layer.
+        """
+        numpy = import_optional("numpy")
+        codes, categories = self._get_columns()
+        records: "np.recarray" = numpy.rec.fromarrays(
+            [numpy.asarray(categories[col], dtype=str)[codes[col]] for col in COLUMNS],
+            names=list(COLUMNS),
+        )
+        return records
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Export matching products as a pandas DataFrame.
+
+        There is one row per (name, code, theme, version, region, layer) combination. Columns are categorical and built directly from the precomputed, dictionary encoded catalog columns.
+
+        Returns:
+            DataFrame with columns name, code, theme, version, region and layer.
+        """
+        pandas = import_optional("pandas")
+        codes, categories = self._get_columns()
+        return pandas.DataFrame(
+            {
+                col: pandas.Categorical.from_codes(codes[col], categories[col])
+                for col in COLUMNS
+            }
+        )
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """Export matching products as a pyarrow Table.
+
+        There is one row per (name, code, theme, version, region, layer) combination. Columns are dictionary encoded arrays built directly from the precomputed catalog columns.
+
+        Returns:
+            Table with columns name, code, theme, version, region and layer.
+        """
+        pyarrow = import_optional("pyarrow", extra=None)
+        codes, categories = self._get_columns()
+        arrays: Dict[str, Any] = {
+            col: pyarrow.DictionaryArray.from_arrays(
+                pyarrow.array(codes[col]),
+                pyarrow.array(categories[col], type=pyarrow.string()),
+            )
+            for col in COLUMNS
+        }
+        return pyarrow.table(arrays)
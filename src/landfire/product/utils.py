@@ -2,17 +2,17 @@
 from typing import Dict, List
 
 from landfire.product.enums import ProductRegion, ProductTheme, ProductVersion
-from landfire.product.models import PRODUCTS
+from landfire.product.models import current_products
 
 
 def get_product_names() -> List[str]:
     """Get a list of all possible LANDFIRE product names."""
-    return [product.name for product in PRODUCTS]
+    return [product.name for product in current_products()]
 
 
 def get_product_codes() -> List[str]:
     """Get a list of all possible LANDFIRE product codes."""
-    return [product.code for product in PRODUCTS]
+    return [product.code for product in current_products()]
 
 
 def get_product_themes() -> List[str]:
@@ -0,0 +1,229 @@
+"""Local multi-resolution products from a single native resolution download.
+
+Every `resample_res` is a separate queued LFPS job. `build_pyramid()` instead derives coarser resolutions from one download by aggregating blocks of pixels with NumPy: the most common value for categorical layers (fuel models, vegetation types) and the mean of valid pixels for continuous layers (canopy base height, bulk density, elevation). The method is chosen from the catalog's `Product.categorical` flag; aspect is categorical there, as averaging directions across north is meaningless. Rasters are processed in strips of rows, so memory stays bounded regardless of the area.
+
+Requires the `raster` extra (`rasterio`).
+"""
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from landfire._optional import import_optional
+from landfire.product.index import get_index
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+
+__all__ = ["aggregate_mean", "aggregate_mode", "build_pyramid"]
+
+# Output rows aggregated per read, bounding memory to STRIP_ROWS * factor source rows
+STRIP_ROWS = 256
+
+
+def aggregate_mode(blocks: "np.ndarray", nodata: Optional[float]) -> "np.ndarray":
+    """Get the most common valid value of each row of blocks.
+
+    Ties are broken towards the smallest value, rows without valid values get nodata.
+
+    Args:
+        blocks: 2D array with one block of pixels per row.
+        nodata: Value of pixels to ignore.
+
+    Returns:
+        1D array of the mode of each row.
+    """
+    numpy = import_optional("numpy")
+    values = numpy.sort(blocks, axis=1)
+    positions = numpy.arange(values.shape[1])
+    starts = numpy.ones(values.shape, dtype=bool)
+    starts[:, 1:] = values[:, 1:] != values[:, :-1]
+    # Length of the run of equal values ending at each position
+    run_starts = numpy.maximum.accumulate(numpy.where(starts, positions, 0), axis=1)
+    run_lengths = positions - run_starts + 1
+    if nodata is not None:
+        run_lengths[values == nodata] = 0
+    best = numpy.argmax(run_lengths, axis=1)
+    result: "np.ndarray" = values[numpy.arange(len(values)), best]
+    if nodata is not None:
+        result[run_lengths.max(axis=1) == 0] = nodata
+    return result
+
+
+def aggregate_mean(blocks: "np.ndarray", nodata: Optional[float]) -> "np.ndarray":
+    """Get the mean of valid values of each row of blocks, in the dtype of blocks.
+
+    Integer means are rounded, rows without valid values get nodata.
+
+    Args:
+        blocks: 2D array with one block of pixels per row.
+        nodata: Value of pixels to ignore.
+
+    Returns:
+        1D array of the mean of each row.
+    """
+    numpy = import_optional("numpy")
+    valid = numpy.ones(blocks.shape, dtype=bool) if nodata is None else blocks != nodata
+    counts = valid.sum(axis=1)
+    sums = numpy.where(valid, blocks, 0).sum(axis=1, dtype="float64")
+    means = numpy.divide(sums, counts, out=numpy.zeros(len(sums)), where=counts > 0)
+    if numpy.issubdtype(blocks.dtype, numpy.integer):
+        means = numpy.rint(means)
+    if nodata is not None:
+        means[counts == 0] = nodata
+    result: "np.ndarray" = means.astype(blocks.dtype)
+    return result
+
+
+def _is_geographic(crs: str) -> bool:
+    """Whether an output projection (EPSG WKID or other user input) is geographic.
+
+    Raises:
+        RuntimeError: If the projection is unknown.
+    """
+    import_optional("rasterio", extra="raster")
+    from rasterio.crs import CRS
+    from rasterio.errors import CRSError
+
+    try:
+        crs_obj = CRS.from_user_input(f"EPSG:{crs}" if crs.isdigit() else crs)
+    except CRSError as exc:
+        raise RuntimeError(f"Unknown output projection `{crs}`! {exc}")
+    return bool(crs_obj.is_geographic)
+
+
+def _spans(size: int, factor: int) -> List[Tuple[int, int]]:
+    """Split `range(size)` into the span of whole blocks of factor and the partial block after it, leaving out empty spans."""
+    whole = size - size % factor
+    return [
+        (start, stop) for start, stop in ((0, whole), (whole, size)) if stop > start
+    ]
+
+
+def _aggregate_band(
+    src: Any,
+    dst: Any,
+    band: int,
+    factor: int,
+    categorical: bool,
+) -> None:
+    """Aggregate factor x factor blocks of a source band into dst, one strip at a time.
+
+    Partial blocks at the right and bottom edges are aggregated separately from the pixels inside the source only, as padding them would count the padding value for sources without nodata.
+    """
+    from rasterio.windows import Window
+
+    numpy = import_optional("numpy")
+    aggregate = aggregate_mode if categorical else aggregate_mean
+    for row in range(0, dst.height, STRIP_ROWS):
+        rows = min(STRIP_ROWS, dst.height - row)
+        top = row * factor
+        data = src.read(
+            band,
+            window=Window(0, top, src.width, min(rows * factor, src.height - top)),
+        )
+        result = numpy.empty((rows, dst.width), dtype=data.dtype)
+        for row_start, row_stop in _spans(data.shape[0], factor):
+            for col_start, col_stop in _spans(data.shape[1], factor):
+                part = data[row_start:row_stop, col_start:col_stop]
+                height = min(factor, row_stop - row_start)
+                width = min(factor, col_stop - col_start)
+                out_rows = (row_stop - row_start) // height
+                out_cols = (col_stop - col_start) // width
+                blocks = (
+                    part.reshape(out_rows, height, out_cols, width)
+                    .transpose(0, 2, 1, 3)
+                    .reshape(out_rows * out_cols, height * width)
+                )
+                result[
+                    row_start // factor : row_start // factor + out_rows,
+                    col_start // factor : col_start // factor + out_cols,
+                ] = aggregate(blocks, src.nodata).reshape(out_rows, out_cols)
+        dst.write(result, band, window=Window(0, row, dst.width, rows))
+
+
+def build_pyramid(
+    source: str,
+    layers: Sequence[str],
+    resolutions: Sequence[int],
+    output_dir: Optional[str] = None,
+) -> Dict[int, Path]:
+    """Derive coarser resolutions from a downloaded LANDFIRE zip file.
+
+    Each resolution must be a whole multiple of the source resolution. Output pixels aggregate the source pixels they cover, partial blocks at the edges aggregate their valid pixels. Outputs keep the projection, origin, data type and nodata value of the source, and are written as `<source name>_<resolution>m.zip` with one GeoTIFF, like LFPS downloads.
+
+    Args:
+        source: Path-like string to a zip file with a GeoTIFF, as downloaded from LFPS.
+        layers: Layers of the bands of the GeoTIFF, in band order. Their catalog products decide between mode and mean.
+        resolutions: Output resolutions in units of the source projection (meters for the LANDFIRE projections).
+        output_dir: Directory to write to. Defaults to the directory of source.
+
+    Returns:
+        Path of the zip file per resolution.
+
+    Raises:
+        RuntimeError: If a layer is not in the catalog, the layers don't match the bands, or a resolution is not a multiple of the source resolution.
+    """
+    rasterio = import_optional("rasterio", extra="raster")
+
+    index = get_index()
+    unknown = [layer for layer in layers if layer not in index.layer_products]
+    if unknown:
+        raise RuntimeError(
+            f"Unable to choose the aggregation of layers not in the catalog: {', '.join(unknown)}."
+        )
+    categorical = [
+        index.products[index.layer_products[layer]].categorical for layer in layers
+    ]
+
+    path = Path(source)
+    target_dir = Path(output_dir) if output_dir else path.parent
+    with zipfile.ZipFile(path) as archive:
+        members = [
+            name
+            for name in archive.namelist()
+            if name.lower().endswith((".tif", ".tiff"))
+        ]
+    if not members:
+        raise RuntimeError(f"{source} does not contain a GeoTIFF.")
+
+    outputs = {}
+    with rasterio.open(f"/vsizip/{path.resolve()}/{members[0]}") as src:
+        if src.count != len(layers):
+            raise RuntimeError(
+                f"{source} has {src.count} bands but {len(layers)} layers were given."
+            )
+        base = src.res[0]
+        for resolution in resolutions:
+            factor = round(resolution / base)
+            if factor < 1 or abs(factor * base - resolution) > 1e-6 * base:
+                raise RuntimeError(
+                    f"Resolution {resolution} must be a multiple of the source resolution {base:g}."
+                )
+            t = src.transform
+            profile = src.profile
+            profile.update(
+                driver="GTiff",
+                width=-(-src.width // factor),
+                height=-(-src.height // factor),
+                transform=rasterio.Affine(
+                    t.a * factor, t.b * factor, t.c, t.d * factor, t.e * factor, t.f
+                ),
+                compress="deflate",
+                tiled=False,
+            )
+            profile.pop("blockxsize", None)
+            profile.pop("blockysize", None)
+            target = target_dir / f"{path.stem}_{resolution}m.zip"
+            with tempfile.TemporaryDirectory(dir=target_dir) as tmp:
+                tif = Path(tmp) / f"{target.stem}.tif"
+                with rasterio.open(tif, "w", **profile) as dst:
+                    dst.descriptions = src.descriptions
+                    for band in range(1, src.count + 1):
+                        _aggregate_band(src, dst, band, factor, categorical[band - 1])
+                with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as archive:
+                    archive.write(tif, tif.name)
+            outputs[resolution] = target
+    return outputs
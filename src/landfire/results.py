@@ -0,0 +1,331 @@
+"""Local reuse of downloaded LANDFIRE results for areas inside earlier requests.
+
+A `ResultCache` keeps copies of downloaded zip files together with the bounding box, layers, output projection and resolution they were requested with. A new request whose bounding box lies within a cached result with the same projection and resolution, and whose layers are all in that result, is served by clipping the cached GeoTIFF with windowed reads (see `landfire.merge.clip_result()`) instead of submitting a job. A county inside a cached statewide download then takes well under a second instead of minutes in the LFPS queue.
+
+The index is a small JSON file next to the cached zip files, results are looked up through an STRtree of their bounding boxes. Several processes can share a cache: every change merges the index on disk under a lock file before replacing it. With `max_bytes` set, the least recently used results are evicted once the cache grows past it. Requires `shapely` and `rasterio` from the `raster` extra.
+"""
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from attrs import define, evolve, field, frozen
+
+from landfire._cache import _file_lock, _read_json, _write_json, get_cache_dir
+from landfire._optional import import_optional
+from landfire.bbox import BBox
+from landfire.merge import clip_result
+
+
+__all__ = ["CachedResult", "ResultCache"]
+
+# Directory of the result cache within the cache directory, and name of its index
+RESULTS_DIR = "results"
+RESULTS_INDEX = "index.json"
+
+# Seconds after which an incomplete copy into the cache is considered left behind by a crashed process
+PARTIAL_STALE_AFTER = 3600.0
+
+
+def _file_size(path: Path) -> int:
+    """Size of a file in bytes, 0 if it is gone."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+@frozen
+class CachedResult:
+    """A downloaded result in the cache.
+
+    Args:
+        path: Zip file in the cache directory.
+        bbox: Bounding box the result was requested with, in EPSG:4326.
+        layers: Layers of the result, in band order.
+        output_crs: Output projection the result was requested with, None for the native LANDFIRE projection.
+        resample_res: Resolution in meters the result was requested with.
+        created: Time the result was added (seconds since the epoch).
+        used: Time the result was last added or served from (seconds since the epoch).
+    """
+
+    path: Path
+    bbox: BBox
+    layers: Tuple[str, ...]
+    output_crs: Optional[str]
+    resample_res: int
+    created: float
+    used: float
+
+    def serves(
+        self, layers: Sequence[str], output_crs: Optional[str], resample_res: int
+    ) -> bool:
+        """Whether the result has all layers with the given projection and resolution."""
+        return (
+            self.output_crs == output_crs
+            and self.resample_res == resample_res
+            and set(layers).issubset(self.layers)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON serializable dictionary, with the path relative to the cache."""
+        return {
+            "path": self.path.name,
+            "bbox": list(self.bbox.bounds),
+            "layers": list(self.layers),
+            "output_crs": self.output_crs,
+            "resample_res": self.resample_res,
+            "created": self.created,
+            "used": self.used,
+        }
+
+
+@define
+class ResultCache:
+    """Cache of downloaded results, serving requests within them locally.
+
+    Args:
+        directory: Directory holding the cached zip files and their index. Defaults to `results` in the cache directory (see `landfire._cache.get_cache_dir()`).
+        max_bytes: Size limit of the cached zip files in bytes. If set, adding a result evicts the least recently used results until the cache fits (see `prune()`). Defaults to no limit.
+    """
+
+    directory: Path = field(
+        factory=lambda: get_cache_dir() / RESULTS_DIR, converter=Path
+    )
+    max_bytes: Optional[int] = None
+    _entries: List[CachedResult] = field(init=False, factory=list)
+    # STRtree over the entry bounding boxes, built on the first lookup after a change
+    _tree: Any = field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        """Load the index, dropping entries whose zip file is gone."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries = self._read_index()
+
+    @property
+    def entries(self) -> List[CachedResult]:
+        """Cached results, oldest first."""
+        return list(self._entries)
+
+    @property
+    def _index_path(self) -> Path:
+        """Path of the index."""
+        return self.directory / RESULTS_INDEX
+
+    def _read_index(self) -> List[CachedResult]:
+        """Read the index on disk, dropping entries whose zip file is gone."""
+        entries = []
+        for item in _read_json(self._index_path) or []:
+            path = self.directory / item["path"]
+            if path.exists():
+                entries.append(
+                    CachedResult(
+                        path=path,
+                        bbox=BBox(*item["bbox"]),
+                        layers=tuple(item["layers"]),
+                        output_crs=item["output_crs"],
+                        resample_res=item["resample_res"],
+                        created=item["created"],
+                        used=item.get("used", item["created"]),
+                    )
+                )
+        return entries
+
+    def _merge_index(self) -> None:
+        """Merge the index on disk into the entries. Must hold the index lock.
+
+        Entries added by other processes are picked up, entries whose zip file another process removed are dropped, and the latest use of each result wins.
+        """
+        merged = {entry.path.name: entry for entry in self._read_index()}
+        for entry in self._entries:
+            if not entry.path.exists():
+                continue
+            other = merged.get(entry.path.name)
+            if other is None or other.used < entry.used:
+                merged[entry.path.name] = entry
+        self._entries = sorted(merged.values(), key=lambda entry: entry.created)
+
+    def _write_index(self) -> None:
+        """Write the index and invalidate the STRtree. Must hold the index lock."""
+        _write_json(self._index_path, [entry.to_dict() for entry in self._entries])
+        self._tree = None
+
+    def _save(self) -> None:
+        """Merge the entries with the index on disk and write it."""
+        with _file_lock(self._index_path):
+            self._merge_index()
+            self._write_index()
+
+    def add(
+        self,
+        source: str,
+        bbox: Union[BBox, str],
+        layers: Sequence[str],
+        output_crs: Optional[str] = None,
+        resample_res: int = 30,
+    ) -> CachedResult:
+        """Copy a downloaded zip file into the cache.
+
+        Args:
+            source: Path-like string to the zip file, as downloaded from LFPS.
+            bbox: Bounding box the result was requested with.
+            layers: Layers the result was requested with, in request order (LFPS writes one band per layer in this order).
+            output_crs: Output projection the result was requested with.
+            resample_res: Resolution in meters the result was requested with.
+
+        Returns:
+            CachedResult.
+
+        Raises:
+            RuntimeError: If bbox is not a bounding box (i.e. a map zone number).
+        """
+        try:
+            box = BBox.parse(bbox)
+        except ValueError as exc:
+            raise RuntimeError(f"Unable to cache result! {exc}")
+        created = time.time()
+        path = self.directory / f"{int(created * 1e6):x}_{os.getpid()}.zip"
+        # Copies are only named *.zip once indexed, so prune() never takes a copy in progress for an orphan
+        partial = path.with_name(path.name + ".part")
+        shutil.copyfile(source, partial)
+        entry = CachedResult(
+            path=path,
+            bbox=box,
+            layers=tuple(layers),
+            output_crs=output_crs,
+            resample_res=resample_res,
+            created=created,
+            used=created,
+        )
+        with _file_lock(self._index_path):
+            os.replace(partial, path)
+            self._entries.append(entry)
+            self._merge_index()
+            self._write_index()
+        if self.max_bytes is not None:
+            self.prune(self.max_bytes)
+        return entry
+
+    def find(
+        self,
+        bbox: Union[BBox, str],
+        layers: Sequence[str],
+        output_crs: Optional[str] = None,
+        resample_res: int = 30,
+    ) -> Optional[CachedResult]:
+        """Find a cached result containing a request.
+
+        Args:
+            bbox: Bounding box of the request. Map zone numbers never match.
+            layers: Layers of the request.
+            output_crs: Output projection of the request.
+            resample_res: Resolution in meters of the request.
+
+        Returns:
+            The smallest cached result whose bounding box contains `bbox` and that has all layers with the same projection and resolution, or None.
+        """
+        try:
+            box = BBox.parse(bbox)
+        except ValueError:
+            return None
+        if not self._entries:
+            return None
+        shapely = import_optional("shapely", extra="raster")
+        if self._tree is None:
+            self._tree = shapely.STRtree(
+                [shapely.box(*entry.bbox.bounds) for entry in self._entries]
+            )
+        hits = self._tree.query(shapely.box(*box.bounds), predicate="within")
+        matches = [
+            self._entries[i]
+            for i in hits.tolist()
+            if self._entries[i].serves(layers, output_crs, resample_res)
+        ]
+        # The smallest result needs the least reading and is the closest match
+        return min(matches, key=lambda entry: entry.bbox.area, default=None)
+
+    def serve(
+        self,
+        bbox: Union[BBox, str],
+        layers: Sequence[str],
+        output_path: str,
+        output_crs: Optional[str] = None,
+        resample_res: int = 30,
+    ) -> Optional[CachedResult]:
+        """Write a request to output_path from a cached result containing it, if there is one.
+
+        Args:
+            bbox: Bounding box of the request.
+            layers: Layers of the request. The written GeoTIFF has one band per layer in this order.
+            output_path: Path-like string of the zip file to write.
+            output_crs: Output projection of the request.
+            resample_res: Resolution in meters of the request.
+
+        Returns:
+            The cached result the request was served from, or None if no cached result contains it.
+        """
+        entry = self.find(bbox, layers, output_crs, resample_res)
+        if entry is None:
+            return None
+        bands = [entry.layers.index(layer) + 1 for layer in layers]
+        clip_result(str(entry.path), BBox.parse(bbox), output_path, bands=bands)
+        used = evolve(entry, used=time.time())
+        self._entries[self._entries.index(entry)] = used
+        self._save()
+        return used
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached zip files in bytes."""
+        return sum(_file_size(entry.path) for entry in self._entries)
+
+    def _remove_orphans(self) -> None:
+        """Delete zip files missing from the index and stale incomplete copies. Must hold the index lock."""
+        indexed = {entry.path.name for entry in self._entries}
+        for path in self.directory.glob("*.zip"):
+            if path.name not in indexed:
+                path.unlink(missing_ok=True)
+        for path in self.directory.glob("*.zip.part"):
+            try:
+                if time.time() - path.stat().st_mtime > PARTIAL_STALE_AFTER:
+                    path.unlink()
+            except OSError:
+                continue
+
+    def prune(self, max_bytes: int) -> List[CachedResult]:
+        """Evict the least recently used results until the cached zip files fit in max_bytes.
+
+        The most recently used result is always kept, even if it alone is larger than max_bytes. Zip files in the cache directory that are not in the index (i.e. left behind by a crashed process) are deleted as well.
+
+        Args:
+            max_bytes: Size limit in bytes.
+
+        Returns:
+            Evicted results, least recently used first.
+        """
+        with _file_lock(self._index_path):
+            self._merge_index()
+            by_use = sorted(self._entries, key=lambda entry: entry.used)
+            total = sum(_file_size(entry.path) for entry in by_use)
+            evicted = []
+            for entry in by_use[:-1]:
+                if total <= max_bytes:
+                    break
+                total -= _file_size(entry.path)
+                entry.path.unlink(missing_ok=True)
+                evicted.append(entry)
+            self._entries = [entry for entry in self._entries if entry not in evicted]
+            self._remove_orphans()
+            self._write_index()
+        return evicted
+
+    def clear(self) -> None:
+        """Remove all cached results, including those added by other processes."""
+        with _file_lock(self._index_path):
+            self._merge_index()
+            for entry in self._entries:
+                entry.path.unlink(missing_ok=True)
+            self._entries = []
+            self._remove_orphans()
+            self._write_index()
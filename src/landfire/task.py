@@ -0,0 +1,448 @@
+"""Pre-flight validation of LANDFIRE Product Service requests.
+
+The GP task description of the LANDFIRE Product Service publishes the parameters a job accepts. It is fetched once per TTL, cached on disk and in memory, and used to reject invalid requests locally instead of after they waited in the job queue.
+"""
+import math
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Container,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from attrs import field, frozen
+
+from landfire._cache import fetch_cached_json, get_cache_dir
+from landfire.product.enums import ProductRegion
+from landfire.product.index import get_index
+from landfire.product.regions import infer_regions
+
+
+__all__ = [
+    "RequestValidation",
+    "TaskSchema",
+    "get_task_schema",
+    "validate_params",
+    "validate_requests",
+]
+
+# Revalidate the cached task description at most once a day by default
+DEFAULT_TTL = 24 * 60 * 60
+
+# Used when the task description does not publish a resampling domain
+DEFAULT_RESAMPLE_RANGE = (30, 9999)
+
+CACHE_FILE = "task.json"
+
+# (url, cache path) -> (expiry, schema) so repeated requests skip the disk cache too
+_memo: Dict[Tuple[str, str], Tuple[float, "TaskSchema"]] = {}
+
+
+def _to_frozenset(values: Optional[List[Any]]) -> Optional[FrozenSet[str]]:
+    """Convert an optional list of choices to a frozenset of strings."""
+    return None if values is None else frozenset(str(v) for v in values)
+
+
+def _to_range(values: Any) -> Tuple[int, int]:
+    """Convert a two item sequence to an (int, int) tuple."""
+    low, high = values
+    return int(low), int(high)
+
+
+@frozen
+class TaskSchema:
+    """Parameter constraints of the LANDFIRE Product Service GP task.
+
+    Args:
+        layers: Valid `Layer_List` choices. None if the service doesn't publish a choice list.
+        output_projections: Valid `Output_Projection` choices. None if the service doesn't publish a choice list.
+        resample_range: Inclusive (min, max) `Resample_Resolution` in meters.
+    """
+
+    layers: Optional[FrozenSet[str]] = field(default=None, converter=_to_frozenset)
+    output_projections: Optional[FrozenSet[str]] = field(
+        default=None, converter=_to_frozenset
+    )
+    resample_range: Tuple[int, int] = field(
+        default=DEFAULT_RESAMPLE_RANGE, converter=_to_range
+    )
+
+    @classmethod
+    def from_task(cls, task: Dict[str, Any]) -> "TaskSchema":
+        """Build a TaskSchema from a GP task description.
+
+        Args:
+            task: Decoded GP task description (`?f=json`).
+
+        Returns:
+            TaskSchema.
+        """
+        params = {param.get("name"): param for param in task.get("parameters", [])}
+        resample = params.get("Resample_Resolution", {})
+        domain = resample.get("domain") or resample.get("filter") or {}
+        if "range" in domain:
+            resample_range = domain["range"]
+        elif "minValue" in domain and "maxValue" in domain:
+            resample_range = (domain["minValue"], domain["maxValue"])
+        else:
+            resample_range = DEFAULT_RESAMPLE_RANGE
+        return cls(
+            layers=params.get("Layer_List", {}).get("choiceList"),
+            output_projections=params.get("Output_Projection", {}).get("choiceList"),
+            resample_range=resample_range,
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Serialize to a JSON compatible dict (the inverse of `TaskSchema(**data)`).
+
+        Returns:
+            JSON compatible dict.
+        """
+        return {
+            "layers": None if self.layers is None else sorted(self.layers),
+            "output_projections": (
+                None
+                if self.output_projections is None
+                else sorted(self.output_projections)
+            ),
+            "resample_range": list(self.resample_range),
+        }
+
+
+def get_task_schema(
+    url: str,
+    *,
+    cache_dir: Optional[str] = None,
+    ttl: float = DEFAULT_TTL,
+    timeout: float = 60,
+) -> TaskSchema:
+    """Get the parameter schema of the LANDFIRE Product Service GP task.
+
+    The schema is kept in memory and on disk. It is fetched at most once per `ttl` and then revalidated with a conditional request.
+
+    Args:
+        url: URL of the GP task description.
+        cache_dir: Directory to keep the schema in. See `landfire._cache.get_cache_dir()` for the default.
+        ttl: Seconds a cached schema is used before being revalidated.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        TaskSchema.
+    """
+    path = get_cache_dir(cache_dir) / CACHE_FILE
+    key = (url, str(path))
+    now = time.monotonic()
+    memo = _memo.get(key)
+    if memo is not None and memo[0] > now:
+        return memo[1]
+
+    data = fetch_cached_json(
+        url,
+        path,
+        ttl=ttl,
+        params={"f": "json"},
+        transform=lambda task: TaskSchema.from_task(task).to_json(),
+        timeout=timeout,
+    )
+    schema = TaskSchema(**data)
+    _memo[key] = (now + ttl, schema)
+    return schema
+
+
+def _parse_aoi(aoi: Any) -> Tuple[Optional[str], List[str]]:
+    """Parse an `Area_Of_Interest` value (bounding box or map zone number).
+
+    Returns the normalized value (None if invalid) and a list of errors.
+    """
+    if isinstance(aoi, (list, tuple)):
+        parts = [str(part) for part in aoi]
+    else:
+        parts = str(aoi).split()
+    if len(parts) == 1 and parts[0].isdigit():
+        # LFPS also accepts a single map zone number
+        return str(int(parts[0])), []
+    try:
+        values = [float(part) for part in parts]
+    except ValueError:
+        values = []
+    if len(values) != 4 or not all(math.isfinite(v) for v in values):
+        return None, [
+            f"Area_Of_Interest `{aoi}` must be four numbers `min_x min_y max_x max_y`."
+        ]
+    min_x, min_y, max_x, max_y = values
+    errors = []
+    if not (-180 <= min_x <= 180 and -180 <= max_x <= 180):
+        errors.append(
+            f"Area_Of_Interest `{aoi}` longitudes must be within -180 and 180."
+        )
+    if not (-90 <= min_y <= 90 and -90 <= max_y <= 90):
+        errors.append(f"Area_Of_Interest `{aoi}` latitudes must be within -90 and 90.")
+    if min_x >= max_x or min_y >= max_y:
+        errors.append(
+            f"Area_Of_Interest `{aoi}` minimum coordinates must be less than maximum coordinates."
+        )
+    if errors:
+        return None, errors
+    return " ".join(repr(v) for v in values), []
+
+
+def _check_regions(
+    aoi: str,
+    regions: Optional[Sequence[ProductRegion]],
+    layers: Sequence[str],
+    available: Optional[Dict[Tuple[ProductRegion, ...], FrozenSet[str]]] = None,
+) -> List[str]:
+    """Check layers are available in the regions intersecting a bounding box.
+
+    Shared by `Landfire` and `validate_requests()` so single and batch requests are validated alike. Map zones (regions None) are not checked.
+
+    Args:
+        aoi: Area of interest, for error messages.
+        regions: Regions intersecting the bounding box (see `infer_regions()`), None for map zones.
+        layers: Requested layers.
+        available: Optional memo of the layers available per tuple of regions, shared across calls.
+
+    Returns:
+        List of errors, empty if the layers are available.
+    """
+    if regions is None:
+        return []
+    if not regions:
+        return [
+            f"Bounding box `{aoi}` is outside of the LANDFIRE regions ({', '.join(r.value for r in ProductRegion)})."
+        ]
+    key = tuple(regions)
+    if available is None or key not in available:
+        index = get_index()
+        mask = 0
+        for region in key:
+            mask |= index.lookup("region", region.value)
+        layer_set = frozenset(index.get_layers(mask))
+        if available is None:
+            available = {}
+        available[key] = layer_set
+    unavailable = [layer for layer in layers if layer not in available[key]]
+    if unavailable:
+        return [
+            f"Specified layers are not available in the region(s) of the bounding box ({', '.join(r.value for r in key)}): {', '.join(unavailable)}."
+        ]
+    return []
+
+
+def _aoi_regions(aoi: Optional[str]) -> Optional[Tuple[ProductRegion, ...]]:
+    """Get the regions intersecting a normalized `Area_Of_Interest`, None for map zones or invalid values."""
+    if aoi is None or len(aoi.split()) != 4:
+        return None
+    min_x, min_y, max_x, max_y = (float(part) for part in aoi.split())
+    return infer_regions((min_x, min_y, max_x, max_y))
+
+
+def _validate_aoi(aoi: Any) -> List[str]:
+    """Validate an `Area_Of_Interest` value (bounding box or map zone number)."""
+    return _parse_aoi(aoi)[1]
+
+
+def validate_params(params: Dict[str, Any], schema: TaskSchema) -> List[str]:
+    """Validate a `submitJob` parameter payload against a TaskSchema.
+
+    Args:
+        params: `submitJob` request parameters.
+        schema: TaskSchema to validate against.
+
+    Returns:
+        List of error messages. Empty if the parameters are valid.
+    """
+    errors = _validate_aoi(params.get("Area_Of_Interest"))
+
+    layers = [layer for layer in str(params.get("Layer_List", "")).split(";") if layer]
+    if not layers:
+        errors.append("Layer_List must contain at least one layer.")
+    elif schema.layers is not None:
+        invalid = [layer for layer in layers if layer not in schema.layers]
+        if invalid:
+            errors.append(
+                f"Layer_List contains layers not offered by the service: {', '.join(invalid)}."
+            )
+
+    projection = params.get("Output_Projection")
+    if (
+        projection is not None
+        and schema.output_projections is not None
+        and str(projection) not in schema.output_projections
+    ):
+        errors.append(
+            f"Output_Projection `{projection}` is not offered by the service."
+        )
+
+    resolution = params.get("Resample_Resolution")
+    low, high = schema.resample_range
+    if resolution is not None:
+        try:
+            valid = low <= int(resolution) <= high
+        except (TypeError, ValueError):
+            valid = False
+        if not valid:
+            errors.append(
+                f"Resample_Resolution `{resolution}` must be between {low} and {high} meters."
+            )
+    return errors
+
+
+# Keys accepted in request specs, mirroring the arguments of `Landfire` and `Landfire.request_data()`
+SPEC_KEYS = ("bbox", "layers", "output_crs", "resample_res", "output_path")
+
+
+def _to_errors(errors: Iterable[str]) -> Tuple[str, ...]:
+    """Convert error messages to a tuple."""
+    return tuple(errors)
+
+
+@frozen
+class RequestValidation:
+    """Outcome of validating a single request spec.
+
+    Args:
+        params: Normalized `submitJob` parameters. None if the spec is invalid.
+        errors: Error messages. Empty if the spec is valid.
+    """
+
+    params: Optional[Dict[str, Any]]
+    errors: Tuple[str, ...] = field(converter=_to_errors)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the spec is valid."""
+        return not self.errors
+
+
+def _parse_layers(layers: Any) -> List[str]:
+    """Normalize a layer list (sequence or `;` separated string), dropping blanks and duplicates."""
+    if isinstance(layers, str):
+        layers = layers.split(";")
+    return list(
+        dict.fromkeys(str(layer).strip() for layer in layers if str(layer).strip())
+    )
+
+
+def _check_projection(output_crs: str, schema: Optional[TaskSchema]) -> List[str]:
+    """Check an output projection is an integer WKID offered by the service."""
+    if not output_crs.isdigit():
+        return [f"Output_Projection `{output_crs}` must be an integer WKID."]
+    if (
+        schema is not None
+        and schema.output_projections is not None
+        and output_crs not in schema.output_projections
+    ):
+        return [f"Output_Projection `{output_crs}` is not offered by the service."]
+    return []
+
+
+def _check_layers(
+    layers: List[str],
+    known_layers: Container[str],
+    aoi: Optional[str],
+    available: Dict[Tuple[ProductRegion, ...], FrozenSet[str]],
+) -> List[str]:
+    """Check the layers of a spec are known and available in the regions of its area of interest."""
+    if not layers:
+        return ["Layer_List must contain at least one layer."]
+    invalid = [layer for layer in layers if layer not in known_layers]
+    if invalid:
+        return [
+            f"Layer_List contains layers not available from the LANDFIRE API: {', '.join(invalid)}."
+        ]
+    if aoi is None:
+        return []
+    return _check_regions(aoi, _aoi_regions(aoi), layers, available)
+
+
+def _validate_spec(
+    spec: Mapping[str, Any],
+    known_layers: Container[str],
+    schema: Optional[TaskSchema],
+    aois: Dict[str, Tuple[Optional[str], List[str]]],
+    available: Dict[Tuple[ProductRegion, ...], FrozenSet[str]],
+) -> RequestValidation:
+    """Validate and normalize a single request spec. See `validate_requests()`."""
+    errors = [
+        f"Unknown request spec key `{key}`." for key in spec if key not in SPEC_KEYS
+    ]
+
+    # Bounding boxes are frequently repeated across a batch, parse each once
+    bbox = spec.get("bbox")
+    aoi_key = repr(bbox)
+    if aoi_key not in aois:
+        aois[aoi_key] = _parse_aoi(bbox)
+    aoi, aoi_errors = aois[aoi_key]
+    errors.extend(aoi_errors)
+
+    layers = _parse_layers(spec.get("layers") or [])
+    errors.extend(_check_layers(layers, known_layers, aoi, available))
+
+    output_crs = spec.get("output_crs")
+    if output_crs is not None:
+        output_crs = str(output_crs)
+        errors.extend(_check_projection(output_crs, schema))
+
+    resample_res = spec.get("resample_res", 30)
+    low, high = DEFAULT_RESAMPLE_RANGE if schema is None else schema.resample_range
+    if isinstance(resample_res, bool) or not isinstance(resample_res, int):
+        errors.append(f"Resample_Resolution `{resample_res}` must be an integer.")
+    elif not low <= resample_res <= high:
+        errors.append(
+            f"Resample_Resolution `{resample_res}` must be between {low} and {high} meters."
+        )
+
+    output_path = spec.get("output_path")
+    if output_path is not None and Path(output_path).suffix != ".zip":
+        errors.append(
+            f"{output_path} is not valid! Verify the path exists and the file name ends in `.zip`."
+        )
+
+    if errors:
+        return RequestValidation(params=None, errors=errors)
+    params: Dict[str, Any] = {
+        "Area_Of_Interest": aoi,
+        "Output_Projection": output_crs,
+        "Layer_List": ";".join(layers),
+        "f": "JSON",
+    }
+    # Same as Landfire, the API fails if the default resolution is provided
+    if resample_res != 30:
+        params["Resample_Resolution"] = resample_res
+    return RequestValidation(params=params, errors=[])
+
+
+def validate_requests(
+    specs: Iterable[Mapping[str, Any]], schema: Optional[TaskSchema] = None
+) -> List[RequestValidation]:
+    """Validate and normalize a batch of request specs without building a `Landfire` client per spec.
+
+    Each spec is a mapping with the keys `bbox` (string `min_x min_y max_x max_y`, a sequence of four numbers or a map zone number), `layers` (list or `;` separated string), and optionally `output_crs`, `resample_res` and `output_path`, matching the arguments of `Landfire` and `Landfire.request_data()`.
+
+    Layers are checked against the shared catalog index, which is built once for all specs, including whether they are available in the regions of the bounding box like `Landfire` does. Pass a TaskSchema (see `get_task_schema()`) to additionally check layers, projections and the resampling range against the live service.
+
+    Args:
+        specs: Request specs to validate.
+        schema: Optional TaskSchema to validate against.
+
+    Returns:
+        One RequestValidation per spec, in order. Valid specs carry normalized `submitJob` parameters.
+    """
+    catalog_layers = get_index().bitmaps["layer"]
+    known_layers: Container[str] = catalog_layers
+    if schema is not None and schema.layers is not None:
+        known_layers = schema.layers.intersection(catalog_layers)
+    aois: Dict[str, Tuple[Optional[str], List[str]]] = {}
+    available: Dict[Tuple[ProductRegion, ...], FrozenSet[str]] = {}
+    return [
+        _validate_spec(spec, known_layers, schema, aois, available) for spec in specs
+    ]
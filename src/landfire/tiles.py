@@ -0,0 +1,393 @@
+"""Tile-grid cache assembling any CONUS area of interest from reusable tiles.
+
+Exact-match caching misses whenever an area shifts slightly, as evolving fire perimeters constantly do. A `TileCache` instead snaps every request to a fixed grid of square tiles in the LANDFIRE CONUS Albers projection (EPSG:5070), stores one single band GeoTIFF per tile, layer and resolution, and only fetches the tiles and layers an area needs that are not cached yet. Missing tiles are grouped by their missing layers, merged into as few rectangular jobs per group as possible and requested concurrently with `request_many()`. The area of interest is then assembled from cached tiles with windowed copies, so cache hits come from the spatial overlap between requests rather than from identical bounding boxes.
+
+Requires the `raster` extra (`rasterio`).
+"""
+import math
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Sequence, Tuple, Union
+
+from attrs import define, field, frozen, validators
+
+from landfire._cache import get_cache_dir
+from landfire._optional import import_optional
+from landfire.batch import request_many
+from landfire.bbox import BBox
+from landfire.merge import _pixel_window
+from landfire.product.enums import ProductRegion
+from landfire.product.regions import infer_regions
+
+
+__all__ = ["TileCache", "TileRequest"]
+
+# Directory of the tile cache within the cache directory
+TILES_DIR = "tiles"
+
+# Projection of the tile grid, the native projection of LANDFIRE CONUS data
+GRID_CRS = "EPSG:5070"
+
+# Origin of the tile grid. LANDFIRE CONUS pixel corners lie 15 m off multiples of 30 m.
+GRID_ORIGIN = (15.0, 15.0)
+
+# (column, row) of a tile, rows increase northward
+Tile = Tuple[int, int]
+# (min column, min row, max column, max row) of a rectangle of tiles, inclusive
+Rectangle = Tuple[int, int, int, int]
+
+
+@frozen
+class TileRequest:
+    """Summary of a request assembled from tiles.
+
+    Args:
+        tiles: Tiles covering the area of interest.
+        cached: Tiles that were already cached for all layers.
+        jobs: Jobs submitted for the missing tiles.
+    """
+
+    tiles: int
+    cached: int
+    jobs: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of tiles served from the cache."""
+        return self.cached / self.tiles if self.tiles else 1.0
+
+
+def _rectangles(tiles: Sequence[Tile]) -> List[Rectangle]:
+    """Merge tiles into rectangles: runs of adjacent columns per row, stacked while runs line up."""
+    rows: Dict[int, List[int]] = {}
+    for col, row in sorted(set(tiles), key=lambda tile: (tile[1], tile[0])):
+        rows.setdefault(row, []).append(col)
+    # (min column, max column) -> rectangle growing northward
+    open_rectangles: Dict[Tuple[int, int], Rectangle] = {}
+    rectangles: List[Rectangle] = []
+    for row in sorted(rows):
+        runs = []
+        cols = rows[row]
+        start = cols[0]
+        for i in range(1, len(cols) + 1):
+            if i == len(cols) or cols[i] != cols[i - 1] + 1:
+                runs.append((start, cols[i - 1]))
+                if i < len(cols):
+                    start = cols[i]
+        grown = {}
+        for run in runs:
+            previous = open_rectangles.pop(run, None)
+            if previous is not None and previous[3] == row - 1:
+                grown[run] = (previous[0], previous[1], previous[2], row)
+            else:
+                if previous is not None:
+                    rectangles.append(previous)
+                grown[run] = (run[0], row, run[1], row)
+        rectangles.extend(open_rectangles.values())
+        open_rectangles = grown
+    rectangles.extend(open_rectangles.values())
+    return sorted(rectangles, key=lambda rect: (rect[1], rect[0]))
+
+
+def _snap(bounds: Sequence[float], step: float) -> Tuple[float, float, float, float]:
+    """Snap bounds in EPSG:5070 outward to multiples of step from the grid origin."""
+    origin_x, origin_y = GRID_ORIGIN
+    return (
+        origin_x + math.floor((bounds[0] - origin_x) / step) * step,
+        origin_y + math.floor((bounds[1] - origin_y) / step) * step,
+        origin_x + math.ceil((bounds[2] - origin_x) / step) * step,
+        origin_y + math.ceil((bounds[3] - origin_y) / step) * step,
+    )
+
+
+@define
+class TileCache:
+    """Cache of LANDFIRE data in fixed tiles of the CONUS Albers grid.
+
+    Args:
+        directory: Directory holding the tiles. Defaults to `tiles` in the cache directory (see `landfire._cache.get_cache_dir()`).
+        tile_size: Tile width and height in meters. Must be a multiple of the requested resolutions. Defaults to 1024 pixels at 30 meters.
+    """
+
+    directory: Path = field(factory=lambda: get_cache_dir() / TILES_DIR, converter=Path)
+    tile_size: int = field(default=30720, validator=validators.gt(0))
+
+    def tiles(self, bbox: Union[BBox, str]) -> List[Tile]:
+        """Get the tiles covering a bounding box.
+
+        Args:
+            bbox: Bounding box in EPSG:4326.
+
+        Returns:
+            Tiles in row, then column order.
+        """
+        import_optional("rasterio", extra="raster")
+        from rasterio.warp import transform_bounds
+
+        bounds = transform_bounds(
+            "EPSG:4326", GRID_CRS, *BBox.parse(bbox).bounds, densify_pts=21
+        )
+        min_x, min_y, max_x, max_y = _snap(bounds, self.tile_size)
+        cols = range(
+            round((min_x - GRID_ORIGIN[0]) / self.tile_size),
+            round((max_x - GRID_ORIGIN[0]) / self.tile_size),
+        )
+        rows = range(
+            round((min_y - GRID_ORIGIN[1]) / self.tile_size),
+            round((max_y - GRID_ORIGIN[1]) / self.tile_size),
+        )
+        return [(col, row) for row in rows for col in cols]
+
+    def bounds(self, rectangle: Rectangle) -> Tuple[float, float, float, float]:
+        """Get the bounds in EPSG:5070 of a rectangle of tiles (a single tile is `(col, row, col, row)`)."""
+        return (
+            GRID_ORIGIN[0] + rectangle[0] * self.tile_size,
+            GRID_ORIGIN[1] + rectangle[1] * self.tile_size,
+            GRID_ORIGIN[0] + (rectangle[2] + 1) * self.tile_size,
+            GRID_ORIGIN[1] + (rectangle[3] + 1) * self.tile_size,
+        )
+
+    def path(self, tile: Tile, layer: str, resample_res: int = 30) -> Path:
+        """Get the GeoTIFF path of a tile."""
+        return self.directory / f"{resample_res}m" / layer / f"{tile[0]}_{tile[1]}.tif"
+
+    def missing(
+        self, tiles: Sequence[Tile], layers: Sequence[str], resample_res: int = 30
+    ) -> Dict[Tuple[str, ...], List[Tile]]:
+        """Group the tiles not cached for all layers by their missing layers.
+
+        Args:
+            tiles: Tiles to check.
+            layers: Product layers.
+            resample_res: Resolution in meters.
+
+        Returns:
+            Tiles per tuple of missing layers (in the order of `layers`), tiles cached for all layers are left out.
+        """
+        groups: Dict[Tuple[str, ...], List[Tile]] = {}
+        for tile in tiles:
+            absent = tuple(
+                layer
+                for layer in layers
+                if not self.path(tile, layer, resample_res).exists()
+            )
+            if absent:
+                groups.setdefault(absent, []).append(tile)
+        return groups
+
+    def fetch(
+        self,
+        missing: Mapping[Tuple[str, ...], Sequence[Tile]],
+        resample_res: int = 30,
+        **kwargs: Any,
+    ) -> int:
+        """Request missing tiles from LFPS and store them in the cache.
+
+        The tiles of each group are merged into rectangles (see `_rectangles()`), each requested as one job for the layers of its group with `request_many()`, and the results are cut into tiles on the grid.
+
+        Args:
+            missing: Tiles to fetch per tuple of layers, as returned by `missing()`.
+            resample_res: Resolution in meters.
+            kwargs: Passed to `request_many()` (concurrency limits and backoff).
+
+        Returns:
+            Number of jobs submitted.
+
+        Raises:
+            RuntimeError: If a job fails.
+        """
+        import_optional("rasterio", extra="raster")
+        from rasterio.warp import transform_bounds
+
+        rectangles = [
+            (rectangle, layers)
+            for layers, tiles in missing.items()
+            for rectangle in _rectangles(tiles)
+        ]
+        if not rectangles:
+            return 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.directory) as tmp:
+            specs = [
+                (
+                    str(
+                        BBox(
+                            *transform_bounds(
+                                GRID_CRS,
+                                "EPSG:4326",
+                                *self.bounds(rectangle),
+                                densify_pts=21,
+                            )
+                        )
+                    ),
+                    list(layers),
+                    None,
+                    resample_res,
+                )
+                for rectangle, layers in rectangles
+            ]
+            for result in request_many(specs, output_dir=tmp, **kwargs):
+                if not result.ok or result.output_path is None:
+                    raise RuntimeError(
+                        f"Unable to fetch tiles {rectangles[result.index][0]}! {result.error}"
+                    )
+                self._store(result.output_path, *rectangles[result.index], resample_res)
+        return len(rectangles)
+
+    def _store(
+        self,
+        source: Path,
+        rectangle: Rectangle,
+        layers: Sequence[str],
+        resample_res: int,
+    ) -> None:
+        """Cut a downloaded result into single band tiles."""
+        rasterio = import_optional("rasterio", extra="raster")
+        from rasterio.transform import from_origin
+
+        with zipfile.ZipFile(source) as archive:
+            member = next(
+                name
+                for name in archive.namelist()
+                if name.lower().endswith((".tif", ".tiff"))
+            )
+        pixels = self.tile_size // resample_res
+        with rasterio.open(f"/vsizip/{source.resolve()}/{member}") as src:
+            for row in range(rectangle[1], rectangle[3] + 1):
+                for col in range(rectangle[0], rectangle[2] + 1):
+                    min_x, _, _, max_y = self.bounds((col, row, col, row))
+                    window = _pixel_window(
+                        src, self.bounds((col, row, col, row)), clip=False
+                    )
+                    profile = src.profile
+                    profile.update(
+                        driver="GTiff",
+                        count=1,
+                        width=pixels,
+                        height=pixels,
+                        transform=from_origin(min_x, max_y, resample_res, resample_res),
+                        compress="deflate",
+                        tiled=False,
+                    )
+                    profile.pop("blockxsize", None)
+                    profile.pop("blockysize", None)
+                    for band, layer in enumerate(layers, start=1):
+                        path = self.path((col, row), layer, resample_res)
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        # Results off the grid are resampled onto it (nearest neighbour)
+                        data = src.read(
+                            band,
+                            window=window,
+                            boundless=True,
+                            fill_value=src.nodata or 0,
+                            out_shape=(pixels, pixels),
+                        )
+                        partial = path.with_name(path.name + ".tmp")
+                        with rasterio.open(partial, "w", **profile) as dst:
+                            dst.write(data, 1)
+                        partial.replace(path)
+
+    def assemble(
+        self,
+        bbox: Union[BBox, str],
+        layers: Sequence[str],
+        output_path: str,
+        resample_res: int = 30,
+    ) -> Path:
+        """Assemble a bounding box from cached tiles.
+
+        The output GeoTIFF covers the envelope of `bbox` in EPSG:5070 snapped outward to the pixel grid, with one band per layer in order, and is written into a zip file at `output_path`. Tiles are copied one window at a time, so memory stays bounded by the tile size.
+
+        Args:
+            bbox: Bounding box in EPSG:4326.
+            layers: Product layers, all tiles must be cached.
+            output_path: Path-like string of the zip file to write.
+            resample_res: Resolution in meters.
+
+        Returns:
+            Path of the written zip file.
+        """
+        rasterio = import_optional("rasterio", extra="raster")
+        from rasterio.transform import from_origin
+        from rasterio.warp import transform_bounds
+
+        min_x, min_y, max_x, max_y = _snap(
+            transform_bounds(
+                "EPSG:4326", GRID_CRS, *BBox.parse(bbox).bounds, densify_pts=21
+            ),
+            resample_res,
+        )
+        tiles = self.tiles(bbox)
+        with rasterio.open(self.path(tiles[0], layers[0], resample_res)) as src:
+            profile = src.profile
+        profile.update(
+            count=len(layers),
+            width=round((max_x - min_x) / resample_res),
+            height=round((max_y - min_y) / resample_res),
+            transform=from_origin(min_x, max_y, resample_res, resample_res),
+        )
+        target = Path(output_path)
+        with tempfile.TemporaryDirectory(dir=target.parent) as tmp:
+            assembled = Path(tmp) / (target.stem + ".tif")
+            with rasterio.open(assembled, "w", **profile) as dst:
+                dst.descriptions = tuple(layers)
+                for band, layer in enumerate(layers, start=1):
+                    for tile in tiles:
+                        with rasterio.open(self.path(tile, layer, resample_res)) as src:
+                            overlap = (
+                                max(min_x, src.bounds.left),
+                                max(min_y, src.bounds.bottom),
+                                min(max_x, src.bounds.right),
+                                min(max_y, src.bounds.top),
+                            )
+                            data = src.read(1, window=_pixel_window(src, overlap))
+                            dst.write(data, band, window=_pixel_window(dst, overlap))
+            with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.write(assembled, assembled.name)
+        return target
+
+    def request(
+        self,
+        bbox: Union[BBox, str],
+        layers: Sequence[str],
+        output_path: str,
+        resample_res: int = 30,
+        **kwargs: Any,
+    ) -> TileRequest:
+        """Fetch the missing tiles of a bounding box and assemble it from the cache.
+
+        Args:
+            bbox: Bounding box in EPSG:4326, within CONUS.
+            layers: Product layers.
+            output_path: Path-like string of the zip file to write.
+            resample_res: Resolution in meters, a divisor of the tile size.
+            kwargs: Passed to `request_many()` (concurrency limits and backoff).
+
+        Returns:
+            TileRequest with the tile count, cached tiles and submitted jobs.
+
+        Raises:
+            RuntimeError: If bbox is not a bounding box (i.e. a map zone number) within CONUS, the resolution doesn't divide the tile size or a job fails.
+        """
+        try:
+            box = BBox.parse(bbox)
+        except ValueError as exc:
+            raise RuntimeError(f"Unable to request tiles! {exc}")
+        if infer_regions(box.bounds) != (ProductRegion.US,):
+            raise RuntimeError(
+                f"Tile-grid requests are only available within CONUS, `{box}` is not."
+            )
+        if self.tile_size % resample_res:
+            raise RuntimeError(
+                f"Resolution {resample_res} must divide the tile size {self.tile_size}."
+            )
+        tiles = self.tiles(box)
+        missing = self.missing(tiles, layers, resample_res)
+        jobs = self.fetch(missing, resample_res, **kwargs)
+        self.assemble(box, layers, output_path, resample_res)
+        return TileRequest(
+            tiles=len(tiles),
+            cached=len(tiles) - sum(len(group) for group in missing.values()),
+            jobs=jobs,
+        )
@@ -0,0 +1,107 @@
+"""Shared test fixtures."""
+import json
+import tempfile
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+import numpy
+import pytest
+
+from landfire.bbox import BBox
+
+
+class StandInService:
+    """Local stand-in for the LANDFIRE Product Service serving one JSON document with an ETag."""
+
+    def __init__(self, document: Dict[str, Any], etag: str = '"v1"') -> None:
+        """Class init."""
+        self.document = document
+        self.etag = etag
+        self.last_modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+        self.statuses: List[int] = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_port}/LandfireProductService"
+
+    def _handler(self) -> Any:
+        """Build a request handler bound to this service."""
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.headers.get("If-None-Match") == service.etag:
+                    status = 304
+                    body = b""
+                else:
+                    status = 200
+                    body = json.dumps(service.document).encode()
+                service.statuses.append(status)
+                self.send_response(status)
+                self.send_header("ETag", service.etag)
+                self.send_header("Last-Modified", service.last_modified)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                return None
+
+        return Handler
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep cached LANDFIRE metadata out of the user cache directory."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("LANDFIRE_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def stand_in_service() -> Iterator[StandInService]:
+    """Stand-in LANDFIRE Product Service running on localhost."""
+    service = StandInService({})
+    thread = threading.Thread(target=service.server.serve_forever, daemon=True)
+    thread.start()
+    yield service
+    service.server.shutdown()
+    service.server.server_close()
+
+
+@pytest.fixture
+def write_result() -> Callable[..., None]:
+    """Writer of zip files with a GeoTIFF in EPSG:4326 covering bounds at 0.01 degrees, like LFPS downloads.
+
+    Called as `write_result(path, bounds, count=1)`, pixels are numbered row by row, plus 1000 per band.
+    """
+    rasterio = pytest.importorskip("rasterio")
+
+    def write(path: Path, bounds: str, count: int = 1) -> None:
+        min_x, min_y, max_x, max_y = BBox.parse(bounds).bounds
+        width = round((max_x - min_x) / 0.01)
+        height = round((max_y - min_y) / 0.01)
+        with tempfile.TemporaryDirectory() as tmp:
+            tif = Path(tmp) / "result.tif"
+            with rasterio.open(
+                tif,
+                "w",
+                driver="GTiff",
+                width=width,
+                height=height,
+                count=count,
+                dtype="int32",
+                crs="EPSG:4326",
+                transform=rasterio.Affine(0.01, 0, min_x, 0, -0.01, max_y),
+                nodata=-9999,
+            ) as dst:
+                data = numpy.arange(width * height, dtype="int32").reshape(
+                    height, width
+                )
+                dst.write(numpy.stack([data + 1000 * band for band in range(count)]))
+            with zipfile.ZipFile(path, "w") as archive:
+                archive.write(tif, "result.tif")
+
+    return write
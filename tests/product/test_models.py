@@ -0,0 +1,103 @@
+"""Product models tests."""
+import subprocess
+import sys
+
+import pytest
+from attrs.exceptions import FrozenInstanceError
+
+from landfire.product.enums import ProductRegion, ProductTheme, ProductVersion
+from landfire.product.models import (
+    Product,
+    ProductAvailability,
+    build_snapshot,
+    load_products,
+    parse_snapshot,
+)
+
+
+def test_load_products() -> None:
+    """Test load_products() materializes the full catalog once."""
+    products = load_products()
+    assert len(products) == 76
+    assert products is load_products()
+
+
+def test_products_module_attr() -> None:
+    """Test PRODUCTS is lazily resolved to the loaded catalog."""
+    from landfire.product.models import PRODUCTS
+
+    assert PRODUCTS is load_products()
+
+
+def test_products_not_loaded_on_import() -> None:
+    """Test importing models does not materialize the catalog."""
+    code = (
+        "import landfire.product.models as m;"
+        "print(m.load_products.cache_info().currsize)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "0"
+
+
+def test_product_coerces_values() -> None:
+    """Test Product and ProductAvailability coerce raw values to enums and tuples."""
+    product = Product(
+        name="elevation",
+        code="ELEV",
+        theme="topographic",
+        availability=[
+            ProductAvailability(version="2.2.0", regions=["US"], layers=["ELEV2020"])
+        ],
+    )
+    assert product.theme is ProductTheme.topographic
+    assert product.availability[0].version is ProductVersion.lf_2020
+    assert product.availability[0].regions == (ProductRegion.US,)
+    assert product.availability[0].layers == ("ELEV2020",)
+
+
+def test_product_frozen_and_slotted() -> None:
+    """Test Products cannot be mutated and carry no instance dict."""
+    product = load_products()[0]
+    with pytest.raises(FrozenInstanceError):
+        product.name = "changed"  # type: ignore
+    assert not hasattr(product, "__dict__")
+    assert not hasattr(product.availability[0], "__dict__")
+
+
+def test_snapshot_byte_widths() -> None:
+    """Test byte widths default to the catalog width and round trip through snapshots."""
+    products = load_products()
+    assert {product.byte_width for product in products} == {2}
+    wide = Product(
+        name="elevation",
+        code="ELEV",
+        theme="topographic",
+        availability=[
+            ProductAvailability(version="2.2.0", regions=["US"], layers=["ELEV2020"])
+        ],
+        byte_width=4,
+    )
+    snapshot = build_snapshot([products[0], wide])
+    assert snapshot["byte_widths"] == {"ELEV": 4}
+    assert parse_snapshot(snapshot) == [products[0], wide]
+
+
+def test_snapshot_categorical() -> None:
+    """Test products are categorical unless listed as continuous, and round trip through snapshots."""
+    products = {product.code: product for product in load_products()}
+    assert products["FBFM40"].categorical and products["EVT"].categorical
+    assert not products["CBH"].categorical and not products["ELEV"].categorical
+    snapshot = build_snapshot(load_products())
+    assert snapshot["continuous"] == [
+        "CBD",
+        "CBH",
+        "CC",
+        "CH",
+        "ELEV",
+        "SLPD",
+        "SLPP",
+        "VDep",
+    ]
+    assert parse_snapshot(snapshot) == load_products()
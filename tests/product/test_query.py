@@ -0,0 +1,117 @@
+"""Product query tests."""
+from typing import Set
+
+import pytest
+
+from landfire.product.enums import ProductRegion, ProductTheme, ProductVersion
+from landfire.product.index import CatalogIndex, get_index
+from landfire.product.models import load_products
+from landfire.product.query import Q, Query, parse_query
+from landfire.product.search import ProductSearch
+
+
+def layers(query: Query) -> Set[str]:
+    """Evaluate a query against the catalog index and return its layers."""
+    index = get_index()
+    return set(index.get_layers(query.evaluate(index)))
+
+
+def test_index_rows() -> None:
+    """Test CatalogIndex has one row per product availability."""
+    index = CatalogIndex(load_products())
+    assert len(index.rows) == sum(len(p.availability) for p in load_products())
+    assert index.get_products(index.all_rows) == load_products()
+
+
+def test_get_index_cached() -> None:
+    """Test get_index() reuses the index of the current catalog."""
+    assert get_index() is get_index()
+
+
+def test_term_matches_search() -> None:
+    """Test single terms match equivalent ProductSearch filters."""
+    assert layers(Q.code("FBFM40")) == set(ProductSearch(codes=["FBFM40"]).get_layers())
+    assert layers(Q.theme(ProductTheme.map_zones)) == {"map_zones"}
+
+
+def test_term_enum_values() -> None:
+    """Test terms accept enum members, values and member names."""
+    assert (
+        layers(Q.version(ProductVersion.lf_2020))
+        == layers(Q.version("2.2.0"))
+        == layers(Q.version("lf_2020"))
+    )
+
+
+def test_version_narrows_availability() -> None:
+    """Test version terms only keep matching availabilities."""
+    products = ProductSearch(
+        query=Q.code("DistYear") & Q.version(ProductVersion.lf_2001)
+    ).get_products()
+    assert len(products) == 1
+    assert [pa.version for pa in products[0].availability] == [ProductVersion.lf_2001]
+
+
+def test_and_or_not() -> None:
+    """Test operators compose as set operations."""
+    query = Q.theme(ProductTheme.fuel) & Q.version(ProductVersion.lf_2020) & ~Q.theme(
+        ProductTheme.mod_fis
+    ) | Q.code("ELEV", "SLPD", "ASP")
+    fuel = set(
+        ProductSearch(
+            themes=[ProductTheme.fuel], versions=[ProductVersion.lf_2020]
+        ).get_layers()
+    )
+    assert layers(query) == fuel | {"ELEV2020", "SLPD2020", "ASP2020"}
+
+
+def test_not_region() -> None:
+    """Test NOT complements against every availability."""
+    only_ak = layers(Q.region(ProductRegion.AK) & ~Q.region("US", "HI"))
+    assert only_ak == {"105CFFDRS", "130CFFDRS", "140CFFDRS", "200CFFDRS", "220CFFDRS"}
+
+
+def test_parse_query() -> None:
+    """Test string queries parse to the equivalent operator query."""
+    assert parse_query(
+        "theme:fuel and version:2.2.0 and not theme:mod-fis or code:(ELEV, SLPD, ASP)"
+    ) == (
+        Q.theme("fuel") & Q.version("2.2.0") & ~Q.theme("mod-fis")
+        | Q.code("ELEV", "SLPD", "ASP")
+    )
+
+
+def test_parse_query_quotes_and_groups() -> None:
+    """Test quoted values and parentheses."""
+    query = parse_query(
+        'name:"Fuel Vegetation Cover 2020" or (layer:ELEV2020 and region:AK)'
+    )
+    assert layers(query) == {"200FVC_20", "ELEV2020"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["code:ELEV and", "(code:ELEV", "code:ELEV)", "color:red", "code:ELEV code:ASP"],
+)
+def test_parse_query_invalid(text: str) -> None:
+    """Test malformed queries raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_query(text)
+
+
+def test_search_query_string() -> None:
+    """Test ProductSearch accepts query strings and combines them with other filters."""
+    products = ProductSearch(
+        query="theme:topographic or code:FBFM40", versions=[ProductVersion.lf_2020]
+    ).get_products()
+    assert [p.code for p in products] == ["FBFM40", "ASP", "ELEV", "SLPD", "SLPP"]
+
+
+def test_query_abstract() -> None:
+    """Test queries without evaluate() can't be instantiated."""
+
+    class Incomplete(Query):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore[abstract]
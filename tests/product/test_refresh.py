@@ -0,0 +1,111 @@
+"""Product catalog refresh tests."""
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from landfire.product.models import (
+    current_products,
+    load_products,
+    set_current_products,
+)
+from landfire.product.refresh import compile_catalog, refresh_catalog
+from landfire.product.search import ProductSearch
+from tests.conftest import StandInService
+
+
+def task_description(layers: List[str]) -> Dict[str, Any]:
+    """Minimal GP task description publishing a layer choice list."""
+    return {
+        "name": "LandfireProductService",
+        "parameters": [
+            {"name": "Layer_List", "dataType": "GPString", "choiceList": layers},
+            {"name": "Area_Of_Interest", "dataType": "GPString"},
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_catalog() -> Iterator[None]:
+    """Make sure a refreshed catalog never leaks into other tests."""
+    yield
+    set_current_products(None)
+
+
+def test_compile_catalog_adds_layer_to_family() -> None:
+    """Test a new layer is added next to the latest layer of its family."""
+    products = compile_catalog(["FDIST2022", "FDIST2023"], load_products())
+    product = next(p for p in products if p.name == "fuel disturbance 2022")
+    assert product.availability[-1].layers == ("FDIST2022", "FDIST2023")
+    assert len(products) == len(load_products())
+
+
+def test_compile_catalog_adds_new_version() -> None:
+    """Test a layer of a newer version gets its own availability instead of the latest one."""
+    products = compile_catalog(["200FRG", "140FRG"], load_products())
+    product = next(p for p in products if p.code == "FRG")
+    assert [pa.version.value for pa in product.availability] == [
+        "1.0.5",
+        "1.3.0",
+        "1.4.0",
+        "2.0.0",
+    ]
+    assert product.availability[-1].layers == ("200FRG",)
+    assert product.availability[-1].regions == product.availability[-2].regions
+    assert product.availability[-2].layers == ("140FRG",)
+
+
+def test_compile_catalog_skips_unknown_version() -> None:
+    """Test layers with a version prefix missing from ProductVersion are skipped."""
+    with pytest.warns(UserWarning, match="990FRG"):
+        products = compile_catalog(["990FRG"], load_products())
+    assert products == load_products()
+
+
+def test_compile_catalog_skips_unknown_family() -> None:
+    """Test layers without a known family are skipped with a warning."""
+    with pytest.warns(UserWarning, match="NOPE"):
+        products = compile_catalog(["NOPE"], load_products())
+    assert products == load_products()
+
+
+def test_refresh_catalog(stand_in_service: StandInService, tmp_path: Path) -> None:
+    """Test refresh_catalog() compiles and activates the served catalog."""
+    stand_in_service.document = task_description(["DIST2021", "ELEV2020"])
+    products = refresh_catalog(stand_in_service.url, cache_dir=str(tmp_path))
+    assert current_products() is products
+    assert "DIST2021" in ProductSearch(codes=["DistYear"]).get_layers()
+    assert stand_in_service.statuses == [200]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_refresh_catalog_ttl(stand_in_service: StandInService, tmp_path: Path) -> None:
+    """Test a fresh cached catalog is used without any request."""
+    stand_in_service.document = task_description(["DIST2021"])
+    refresh_catalog(stand_in_service.url, cache_dir=str(tmp_path), activate=False)
+    refresh_catalog(stand_in_service.url, cache_dir=str(tmp_path), activate=False)
+    assert stand_in_service.statuses == [200]
+
+
+def test_refresh_catalog_not_modified(
+    stand_in_service: StandInService, tmp_path: Path
+) -> None:
+    """Test a stale cached catalog is revalidated with a conditional request."""
+    stand_in_service.document = task_description(["DIST2021"])
+    first = refresh_catalog(stand_in_service.url, cache_dir=str(tmp_path), ttl=0)
+    second = refresh_catalog(stand_in_service.url, cache_dir=str(tmp_path), ttl=0)
+    assert stand_in_service.statuses == [200, 304]
+    assert first == second
+
+
+def test_refresh_catalog_modified(
+    stand_in_service: StandInService, tmp_path: Path
+) -> None:
+    """Test a changed document is downloaded and compiled again."""
+    stand_in_service.document = task_description(["DIST2021"])
+    refresh_catalog(stand_in_service.url, cache_dir=str(tmp_path), ttl=0)
+    stand_in_service.document = task_description(["DIST2021", "DIST2022"])
+    stand_in_service.etag = '"v2"'
+    refresh_catalog(stand_in_service.url, cache_dir=str(tmp_path), ttl=0)
+    assert stand_in_service.statuses == [200, 200]
+    assert "DIST2022" in ProductSearch(codes=["DistYear"]).get_layers()
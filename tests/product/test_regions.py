@@ -0,0 +1,38 @@
+"""Region inference tests."""
+from typing import Tuple
+
+import pytest
+
+from landfire.product.enums import ProductRegion
+from landfire.product.regions import infer_regions
+
+
+US = ProductRegion.US
+AK = ProductRegion.AK
+HI = ProductRegion.HI
+
+
+@pytest.mark.parametrize(
+    ("bounds", "regions"),
+    [
+        ((-107.70894965, 46.56799094, -106.02718124, 47.34869094), (US,)),
+        # Islands and peninsulas near the outline
+        ((-81.85, 24.5, -81.75, 24.6), (US,)),
+        ((-70.1, 41.2, -69.9, 41.4), (US,)),
+        ((-150.0, 61.0, -149.0, 62.0), (AK,)),
+        ((-131.7, 55.3, -131.6, 55.4), (AK,)),
+        ((-176.7, 51.8, -176.5, 51.9), (AK,)),
+        ((173.0, 52.8, 173.1, 52.9), (AK,)),
+        ((-156.0, 19.0, -155.0, 20.0), (HI,)),
+        # Bounding box containing a whole region
+        ((-162.0, 18.0, -153.0, 23.0), (HI,)),
+        ((-180.0, 18.0, -60.0, 72.0), (US, AK, HI)),
+        ((-10.0, 40.0, 10.0, 50.0), ()),
+        ((-140.0, 45.0, -130.0, 50.0), ()),
+    ],
+)
+def test_infer_regions(
+    bounds: Tuple[float, float, float, float], regions: Tuple[ProductRegion, ...]
+) -> None:
+    """Test infer_regions() finds the regions intersecting a bounding box."""
+    assert infer_regions(bounds) == regions
@@ -1,5 +1,12 @@
 """ProductSearch tests."""
+import sys
+from typing import List, Tuple
+
+import pytest
+
 from landfire.product.enums import ProductRegion, ProductTheme, ProductVersion
+from landfire.product.index import COLUMNS
+from landfire.product.models import Product
 from landfire.product.search import ProductSearch
 
 
@@ -178,3 +185,73 @@ def test_search_products_get_layers_9() -> None:
     ).get_layers()
 
     assert len(layers) == 1
+
+
+def _flatten(products: List[Product]) -> List[Tuple[str, ...]]:
+    """Flatten Products the slow way for comparison with columnar exports."""
+    return [
+        (p.name, p.code, p.theme.value, pa.version.value, region.value, layer)
+        for p in products
+        for pa in p.availability
+        for region in pa.regions
+        for layer in pa.layers
+    ]
+
+
+def test_search_products_to_records() -> None:
+    """Test ProductSearch.to_records() flattens matching products."""
+    search = ProductSearch(
+        themes=[ProductTheme.fuel], versions=[ProductVersion.lf_2020]
+    )
+    records = search.to_records()
+
+    assert records.dtype.names == COLUMNS
+    assert [tuple(r) for r in records.tolist()] == _flatten(search.get_products())
+
+
+def test_search_products_to_dataframe() -> None:
+    """Test ProductSearch.to_dataframe() flattens matching products."""
+    search = ProductSearch(regions=[ProductRegion.HI], codes=["FBFM40", "ELEV"])
+    df = search.to_dataframe()
+
+    assert list(df.columns) == list(COLUMNS)
+    assert str(df["layer"].dtype) == "category"
+    assert list(df.itertuples(index=False, name=None)) == [
+        row for row in _flatten(search.get_products()) if row[4] == "HI"
+    ]
+
+
+def test_search_products_export_region_filters() -> None:
+    """Test exports only contain the regions and layers asked for."""
+    for search in (
+        ProductSearch(regions=[ProductRegion.AK]),
+        ProductSearch(query="region:AK"),
+        ProductSearch(query="region:AK and code:ELEV"),
+    ):
+        records = search.to_records()
+        assert len(records) > 0
+        assert set(records.region.tolist()) == {"AK"}
+
+    search = ProductSearch(query="region:(US, HI) and layer:ELEV2020")
+    records = search.to_records()
+    assert set(records.layer.tolist()) == {"ELEV2020"}
+    assert set(records.region.tolist()) == {"US", "HI"}
+
+
+def test_search_products_to_arrow() -> None:
+    """Test ProductSearch.to_arrow() flattens matching products."""
+    search = ProductSearch()
+    table = search.to_arrow()
+
+    assert table.column_names == list(COLUMNS)
+    rows = [tuple(row[col] for col in COLUMNS) for row in table.to_pylist()]
+    assert rows == _flatten(search.get_products())
+
+
+def test_search_products_to_arrow_missing_pyarrow(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test ProductSearch.to_arrow() fails with an install hint without pyarrow."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(RuntimeError, match="Please install `pyarrow`"):
+        ProductSearch().to_arrow()
@@ -0,0 +1,155 @@
+"""Batch request tests."""
+from pathlib import Path
+from typing import Any, Iterator, List
+from unittest import mock
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from landfire import request_many
+from landfire.batch import BatchResult, PipelineStats
+from tests.test_landfire import (
+    MockResponse,
+    mocked_requests_get_all_success,
+    mocked_requests_get_processing_fail,
+)
+
+
+BBOX = "-107.70894965 46.56799094 -106.02718124 47.34869094"
+
+
+def run(specs: Any, tmp_path: Path, **kwargs: Any) -> List[BatchResult]:
+    """Run request_many() without polling delays."""
+    return list(
+        request_many(specs, output_dir=str(tmp_path), backoff_base_value=0, **kwargs)
+    )
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_all_success)
+def test_request_many(mock_get: mock.Mock, tmp_path: Path) -> None:
+    """Test specs are validated, submitted, polled and downloaded."""
+    stats = PipelineStats()
+    specs = [
+        (BBOX, ["ELEV2020"]),
+        {"bbox": BBOX, "layers": "ELEV2020;SLPD2020", "resample_res": 60},
+        (BBOX, ["ELEV2020"], "5070", 90),
+    ]
+    results = run(specs, tmp_path, max_in_flight=2, stats=stats)
+    assert sorted(result.index for result in results) == [0, 1, 2]
+    assert all(result.ok for result in results)
+    for result in results:
+        assert result.output_path == tmp_path / f"landfire_{result.index}.zip"
+        assert result.output_path.read_text() == "dummy text to write that is very cool"
+    assert results[0].job_id == "j2c9bd85a11324adb8b763747f2eafebb"
+    assert stats.submit.calls == stats.poll.calls == stats.download.calls == 3
+    assert stats.download.bytes == 3 * 37
+    assert set(stats.throughput()) == {"submit", "poll", "download", "download_bytes"}
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_all_success)
+def test_request_many_invalid_specs(mock_get: mock.Mock, tmp_path: Path) -> None:
+    """Test invalid specs are reported without submitting a job."""
+    results = run([(BBOX, ["NOPE"]), (BBOX, ["ELEV2020"], None, 30, "x")], tmp_path)
+    assert [result.ok for result in results] == [False, False]
+    assert "NOPE" in str(results[0].error)
+    assert "must be (bbox, layers" in str(results[1].error)
+    assert not mock_get.called
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_processing_fail)
+def test_request_many_job_failure(mock_get: mock.Mock, tmp_path: Path) -> None:
+    """Test failed jobs are yielded with their error."""
+    stats = PipelineStats()
+    (result,) = run([(BBOX, ["ELEV2020"])], tmp_path, stats=stats)
+    assert result.error == (
+        "Encountered an error during job processing! Status was `esriJobFailed` and message was `Sad failure`."
+    )
+    assert stats.poll.errors == 1
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_all_success)
+def test_request_many_reads_specs_lazily(mock_get: mock.Mock, tmp_path: Path) -> None:
+    """Test specs are only read when a slot is free."""
+    read = []
+
+    def specs() -> Iterator[Any]:
+        for i in range(20):
+            read.append(i)
+            yield (BBOX, ["ELEV2020"])
+
+    results = request_many(
+        specs(), output_dir=str(tmp_path), max_in_flight=3, backoff_base_value=0
+    )
+    next(results)
+    assert len(read) <= 4
+    assert len(list(results)) == 19
+
+
+def test_request_many_validates_eagerly(tmp_path: Path) -> None:
+    """Test invalid arguments raise at the call, before results are requested."""
+    with pytest.raises(ValueError, match="max_in_flight"):
+        request_many([], output_dir=str(tmp_path), max_in_flight=0)
+    with pytest.raises(ValueError, match="max_poll_retries"):
+        request_many([], output_dir=str(tmp_path), max_poll_retries=-1)
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_all_success)
+def test_request_many_creates_output_dir(mock_get: mock.Mock, tmp_path: Path) -> None:
+    """Test a missing output directory is created."""
+    output_dir = tmp_path / "new" / "dir"
+    (result,) = run([(BBOX, ["ELEV2020"])], output_dir)
+    assert result.ok
+    assert result.output_path == output_dir / "landfire_0.zip"
+    assert result.output_path.exists()
+
+
+def flaky_status(failures: int) -> Any:
+    """Mock requests where the first `failures` status checks raise a network error."""
+    calls: List[str] = []
+
+    def mocked_get(*args: Any, **kwargs: Any) -> Any:
+        url = kwargs["url"]
+        if "/jobs/" in url and "Output_File" not in url and len(calls) < failures:
+            calls.append(url)
+            raise requests.ConnectionError("Connection aborted")
+        return mocked_requests_get_all_success(*args, **kwargs)
+
+    return mocked_get
+
+
+def test_request_many_retries_polls(tmp_path: Path) -> None:
+    """Test status checks failing with network errors are retried a bounded number of times."""
+    stats = PipelineStats()
+    with patch("landfire.core.requests.get", side_effect=flaky_status(2)):
+        (result,) = run([(BBOX, ["ELEV2020"])], tmp_path, stats=stats)
+    assert result.ok
+    assert stats.poll.calls == 3
+    assert stats.poll.errors == 2
+
+    stats = PipelineStats()
+    with patch("landfire.core.requests.get", side_effect=flaky_status(3)):
+        (result,) = run(
+            [(BBOX, ["ELEV2020"])], tmp_path, max_poll_retries=2, stats=stats
+        )
+    assert result.error == "Connection aborted"
+    assert stats.poll.calls == stats.poll.errors == 3
+
+
+def test_request_many_interrupted_download(tmp_path: Path) -> None:
+    """Test an interrupted download leaves no partial zip file behind."""
+
+    class BrokenResponse(MockResponse):
+        def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+            yield b"partial"
+            raise ConnectionError("Connection reset")
+
+    def mocked_get(*args: Any, **kwargs: Any) -> Any:
+        if ".zip" in kwargs["url"]:
+            return BrokenResponse({}, 200)
+        return mocked_requests_get_all_success(*args, **kwargs)
+
+    with patch("landfire.core.requests.get", side_effect=mocked_get):
+        (result,) = run([(BBOX, ["ELEV2020"])], tmp_path)
+    assert result.error == "Connection reset"
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,94 @@
+"""BBox tests."""
+import geojson
+import numpy as np
+import pytest
+
+from landfire.bbox import BBox
+
+
+BOUNDS = (-107.70894965, 46.56799094, -106.02718124, 47.34869094)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        BOUNDS,
+        list(BOUNDS),
+        np.array(BOUNDS),
+        "-107.70894965 46.56799094 -106.02718124 47.34869094",
+        "-107.70894965, 46.56799094, -106.02718124, 47.34869094",
+        BBox(*BOUNDS),
+    ],
+)
+def test_parse(value: object) -> None:
+    """Test BBox.parse() accepts sequences, arrays, strings and BBoxes."""
+    bbox = BBox.parse(value)
+    assert bbox.bounds == BOUNDS
+    assert str(bbox) == "-107.70894965 46.56799094 -106.02718124 47.34869094"
+
+
+def test_parse_geojson() -> None:
+    """Test BBox.parse() computes the bounds of GeoJSON objects."""
+    polygon = geojson.Polygon(
+        [[(-107.5, 46.5), (-106.0, 47.25), (-106.5, 46.0), (-107.5, 46.5)]]
+    )
+    collection = geojson.FeatureCollection(
+        [geojson.Feature(geometry=polygon), geojson.Feature(geometry=None)]
+    )
+    assert BBox.parse(polygon).bounds == (-107.5, 46.0, -106.0, 47.25)
+    assert BBox.parse(dict(collection)).bounds == (-107.5, 46.0, -106.0, 47.25)
+    assert BBox.parse({"type": "Polygon", "bbox": [0, 1, 2, 3]}).bounds == (
+        0,
+        1,
+        2,
+        3,
+    )
+
+
+@pytest.mark.parametrize(
+    ("value", "match"),
+    [
+        ("-107.7 46.5 -106.0", "four numbers"),
+        ("a b c d", "four numbers"),
+        ((-190, 46.5, -106.0, 47.3), "longitudes"),
+        ((-107.7, 46.5, -106.0, 97.3), "latitudes"),
+        ((-106.0, 46.5, -107.7, 47.3), "less than"),
+        ({"type": "FeatureCollection", "features": []}, "no coordinates"),
+    ],
+)
+def test_parse_invalid(value: object, match: str) -> None:
+    """Test BBox.parse() rejects invalid bounding boxes."""
+    with pytest.raises(ValueError, match=match):
+        BBox.parse(value)
+
+
+def test_snap() -> None:
+    """Test snap() rounds outward and collapses float noise."""
+    bbox = BBox(-107.708949651, 46.56799094, -106.02718124, 47.34869094)
+    assert bbox.snap().bounds == (-107.70895, 46.56799, -106.027181, 47.348691)
+    assert bbox.snap() == BBox(*BOUNDS).snap()
+    # Coordinates already on the grid are kept
+    assert BBox(-107.5, 46.25, -106.0, 47.0).snap(2).bounds == (
+        -107.5,
+        46.25,
+        -106.0,
+        47.0,
+    )
+
+
+def test_snap_to_grid() -> None:
+    """Test snap_to_grid() snaps outward to whole arc-second cells."""
+    snapped = BBox(*BOUNDS).snap_to_grid()
+    assert snapped.bounds == (-107.70916667, 46.56777778, -106.02694444, 47.34888889)
+    nearby = BBox(-107.7090, 46.5679, -106.0272, 47.3488).snap_to_grid()
+    assert nearby == snapped
+    assert BBox(*BOUNDS).snap_to_grid(resolution=90).min_x == -107.70916667
+
+
+def test_area_and_pixel_count() -> None:
+    """Test area and pixel count estimates."""
+    # One degree square at the equator is about 111 km x 111 km
+    bbox = BBox(0, 0, 1, 1)
+    assert bbox.area == pytest.approx(111_195**2, rel=1e-3)
+    assert bbox.pixel_count() == pytest.approx(bbox.area / 900, abs=1)
+    assert bbox.pixel_count(90) == pytest.approx(bbox.pixel_count() / 9, rel=1e-6)
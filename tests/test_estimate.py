@@ -0,0 +1,58 @@
+"""Job estimate tests."""
+import pytest
+
+from landfire import Landfire
+from landfire.bbox import BBox
+from landfire.estimate import (
+    COMPRESSION_RATIOS,
+    JOB_OVERHEAD_SECONDS,
+    estimate_job,
+)
+from landfire.product.enums import ProductTheme
+
+
+BBOX = "-107.70894965 46.56799094 -106.02718124 47.34869094"
+
+
+def test_estimate_job() -> None:
+    """Test sizes scale with layers, byte widths and compression ratios."""
+    estimate = estimate_job(BBOX, ["ELEV2020", "220F40_22"])
+    assert estimate.layers == 2
+    assert estimate.uncompressed_bytes == estimate.pixels * 2 * 2
+    assert estimate.compressed_bytes == pytest.approx(
+        estimate.pixels * 2 / COMPRESSION_RATIOS[ProductTheme.topographic]
+        + estimate.pixels * 2 / COMPRESSION_RATIOS[ProductTheme.fuel],
+        abs=1,
+    )
+    assert estimate.seconds > JOB_OVERHEAD_SECONDS
+
+
+def test_estimate_job_resolution_and_crs() -> None:
+    """Test pixel counts depend on resolution and the output projection."""
+    native = estimate_job(BBOX, ["ELEV2020"])
+    coarse = estimate_job(BBOX, ["ELEV2020"], resample_res=90)
+    assert coarse.pixels == pytest.approx(native.pixels / 9, rel=1e-6)
+    assert coarse.seconds < native.seconds
+
+    # Geographic output uses the equal area of the bounding box, the projected envelope is larger
+    geographic = estimate_job(BBOX, ["ELEV2020"], output_crs="4326")
+    assert geographic.pixels == BBox.parse(BBOX).pixel_count()
+    assert native.pixels > geographic.pixels
+
+
+def test_estimate_job_errors() -> None:
+    """Test map zones and unknown layers can't be estimated."""
+    with pytest.raises(RuntimeError, match="four numbers"):
+        estimate_job("10", ["ELEV2020"])
+    with pytest.raises(RuntimeError, match="not in the catalog: NOPE"):
+        estimate_job(BBOX, ["ELEV2020", "NOPE"])
+
+
+def test_landfire_estimate() -> None:
+    """Test Landfire.estimate() uses the request parameters."""
+    lf = Landfire(bbox=BBOX, resample_res=60, output_crs="5070")
+    assert lf.estimate(["ELEV2020"]) == estimate_job(
+        BBOX, ["ELEV2020"], resample_res=60, output_crs="5070"
+    )
+    with pytest.raises(RuntimeError, match="Specified layers"):
+        lf.estimate(["NOPE"])
@@ -1,12 +1,29 @@
 """Geospatial utils tests."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Tuple
+
+import fiona
 import geojson
+import pyproj
 import pytest
 from fiona.errors import DriverError
 
 from landfire.geospatial import (
     GeospatialDriver,
+    _scan_geojson,
+    cluster_bboxes,
     get_bbox_from_file,
     get_bbox_from_polygon,
+    get_bboxes_from_files,
+    get_bboxes_from_polygons,
+    get_clustered_bboxes_from_file,
+    get_csv_bounds,
+    get_feature_bboxes,
+    get_geojson_bounds,
+    reproject_bounds,
 )
 
 
@@ -63,6 +80,26 @@ def test_get_bbox_from_polygon_same_crs(polygon_4326: geojson.Polygon) -> None:
     assert validate_bbox(bbox)
 
 
+def test_get_bbox_from_polygon_4326_without_pyproj() -> None:
+    """Test bounding boxes of 4326 polygons don't import pyproj, in a fresh interpreter."""
+    code = (
+        "import sys, geojson\n"
+        "from landfire.geospatial import get_bbox_from_polygon\n"
+        "polygon = geojson.Polygon([[(-107.7, 46.5), (-106.0, 46.5), (-106.0, 47.3), (-107.7, 46.5)]])\n"
+        "bboxes = [get_bbox_from_polygon(polygon), get_bbox_from_polygon(polygon, 'EPSG:4326')]\n"
+        "print(json.dumps([bboxes, 'pyproj' in sys.modules]))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", "import json\n" + code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    bboxes, loaded = json.loads(out.stdout)
+    assert bboxes == ["-107.7 46.5 -106.0 47.3"] * 2
+    assert not loaded
+
+
 def test_get_bbox_from_polygon_diff_crs(polygon_3857: geojson.Polygon) -> None:
     """Test get_bbox_from_polygon() returns a valid bounding box as string in crs 4326 from 3857."""
     bbox: str = get_bbox_from_polygon(aoi_polygon=polygon_3857, crs="3857")
@@ -136,3 +173,438 @@ def test_get_bbox_from_file_geojson_bad_path() -> None:
         str(exc.value)
         == "Unable to read file. Are you sure the correct file path was provided?"
     )
+
+
+def _write_polygon(path: Path, driver: str, polygon: geojson.Polygon, crs: str) -> None:
+    """Write a single polygon feature to path with fiona."""
+    schema = {"geometry": "Polygon", "properties": {"id": "int"}}
+    with fiona.open(path, "w", driver=driver, crs=crs, schema=schema) as dst:
+        dst.write({"geometry": polygon, "properties": {"id": 1}})
+
+
+@pytest.mark.parametrize(
+    "driver,suffix",
+    [
+        (GeospatialDriver.geopackage, ".gpkg"),
+        (GeospatialDriver.flatgeobuf, ".fgb"),
+        (GeospatialDriver.shapefile, ".shp"),
+    ],
+)
+def test_get_bbox_from_file_metadata_reprojected(
+    polygon_3857: geojson.Polygon,
+    tmp_path: Path,
+    driver: GeospatialDriver,
+    suffix: str,
+) -> None:
+    """Test get_bbox_from_file() reads the layer extent and reprojects it to 4326."""
+    path = tmp_path / f"aoi{suffix}"
+    _write_polygon(path, driver.value, polygon_3857, "EPSG:3857")
+    assert validate_bbox(get_bbox_from_file(str(path), driver=driver))
+    assert validate_bbox(get_bbox_from_file(str(path)))
+
+
+def test_get_bbox_from_file_streams_without_extent(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test get_bbox_from_file() streams feature bounds if the driver has no extent."""
+
+    def no_extent(self: fiona.Collection) -> None:
+        raise DriverError("Driver was not able to calculate bounds")
+
+    monkeypatch.setattr(fiona.Collection, "bounds", property(no_extent))
+    bbox = get_bbox_from_file("tests/data/test_shapefile/POLYGON.shp")
+    assert validate_bbox(bbox)
+
+
+def test_reproject_bounds_same_crs() -> None:
+    """Test reproject_bounds() returns 4326 bounds unchanged."""
+    bounds = (-107.7, 46.5, -106.0, 47.3)
+    assert reproject_bounds(bounds, "4326") == bounds
+    assert reproject_bounds(bounds, "EPSG:4326") == bounds
+
+
+def test_reproject_bounds_densified() -> None:
+    """Test reproject_bounds() accounts for curved edges of the extent."""
+    # CONUS Albers, parallels bulge north between the corners of the extent
+    bounds = (-2000000.0, 300000.0, 2000000.0, 3000000.0)
+    corners = reproject_bounds(bounds, "5070", densify_pts=2)
+    densified = reproject_bounds(bounds, "5070")
+    assert densified[3] > corners[3] + 0.1
+
+
+def test_reproject_bounds_pole() -> None:
+    """Test reproject_bounds() extends extents containing a pole to 90° latitude."""
+    bounds = reproject_bounds((-1e6, -1e6, 1e6, 1e6), "EPSG:3413")
+    assert bounds[0] == -180 and bounds[2] == 180
+    assert bounds[3] == 90
+
+
+def test_get_bbox_from_polygon_antimeridian() -> None:
+    """Test get_bbox_from_polygon() rejects bounding boxes crossing the antimeridian."""
+    # Alaska Albers extent spanning the Aleutians
+    polygon = geojson.Polygon(
+        [[(-1e6, 0.0), (1e6, 0.0), (1e6, 2.5e6), (-1e6, 2.5e6), (-1e6, 0.0)]]
+    )
+    with pytest.raises(RuntimeError, match="antimeridian"):
+        get_bbox_from_polygon(polygon, crs="3338")
+
+
+def test_get_bbox_from_polygon_many_vertices(polygon_3857: geojson.Polygon) -> None:
+    """Test get_bbox_from_polygon() only depends on the extent of the polygon."""
+    ring = polygon_3857["coordinates"][0]
+    (x0, y0), (x1, y1) = ring[1], ring[3]
+    dense = geojson.Polygon(
+        [
+            [(x0 + (x1 - x0) * i / 10000, y0) for i in range(10000)]
+            + [(x1, y0), (x1, y1), (x0, y1), (x0, y0)]
+        ],
+        precision=8,
+    )
+    assert get_bbox_from_polygon(dense, crs="3857") == get_bbox_from_polygon(
+        polygon_3857, crs="3857"
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_get_bboxes_from_files_ordered(workers: int) -> None:
+    """Test get_bboxes_from_files() yields results in input order with per-file errors."""
+    paths = [
+        "tests/data/test_4326.geojson",
+        "tests/data/does_not_exist.shp",
+        "tests/data/test_shapefile/POLYGON.shp",
+    ] * 3
+    results = list(get_bboxes_from_files(paths, workers=workers, chunksize=2))
+
+    assert [r.position for r in results] == list(range(len(paths)))
+    assert [r.path for r in results] == paths
+    for result in results:
+        if "does_not_exist" in result.path:
+            assert result.bbox is None
+            assert result.error is not None and "Unable to read file" in result.error
+        else:
+            assert result.error is None
+            assert result.bbox is not None and validate_bbox(result.bbox)
+
+
+def test_get_bboxes_from_files_unordered() -> None:
+    """Test get_bboxes_from_files() streams every result when unordered."""
+    paths = ["tests/data/test_4326.geojson", "tests/data/test_shapefile/POLYGON.shp"]
+    results = list(get_bboxes_from_files(paths * 4, workers=2, ordered=False))
+
+    assert sorted(r.position for r in results) == list(range(8))
+    assert all(r.bbox is not None and validate_bbox(r.bbox) for r in results)
+
+
+@pytest.fixture
+def feature_collection(tmp_path: Path) -> Path:
+    """Feature collection file with mixed geometry types and distracting properties."""
+    features = [
+        {
+            "type": "Feature",
+            "properties": {
+                "values": [[-500, 500]],
+                "note": 'has "coordinates": [9, 9]',
+            },
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [[-107.5, 46.6], [-106.1, 46.6], [-106.1, 47.3], [-107.5, 46.6]]
+                ],
+            },
+        },
+        {
+            "type": "Feature",
+            "properties": {},
+            "geometry": {
+                "type": "GeometryCollection",
+                "geometries": [
+                    {"type": "Point", "coordinates": [-1.0770894965e2, 46.9, 1500]},
+                    {
+                        "type": "LineString",
+                        "coordinates": [[-106.5, 46.56799094], [-106.02718124, 47.0]],
+                    },
+                ],
+            },
+        },
+        {"type": "Feature", "properties": {"bbox": [0, 0]}, "geometry": None},
+        {
+            "type": "Feature",
+            "properties": {},
+            "geometry": {"coordinates": [-107.0, 47.34869094], "type": "Point"},
+        },
+    ]
+    path = tmp_path / "features.geojson"
+    path.write_text(
+        json.dumps({"type": "FeatureCollection", "features": features}, indent=1),
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_get_geojson_bounds(feature_collection: Path, chunk_size: int) -> None:
+    """Test get_geojson_bounds() streams positions across chunk boundaries."""
+    bounds = get_geojson_bounds(str(feature_collection), chunk_size=chunk_size)
+    assert bounds == (-107.70894965, 46.56799094, -106.02718124, 47.34869094)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+def test_get_geojson_bounds_properties(tmp_path: Path, chunk_size: int) -> None:
+    """Test `crs` and `coordinates` within properties and strings are not mistaken for members."""
+    features = [
+        {
+            "type": "Feature",
+            "properties": {
+                "crs": {"type": "name", "properties": {"name": "EPSG:3857"}},
+                "coordinates": [[0.0, 0.0], [500.0, 500.0]],
+                "note": 'see "crs": 3857 and "coordinates": [1, 2]}, {"x": [',
+                "escaped": '\\"coordinates": [9, 9]',
+            },
+            "geometry": {"type": "Point", "coordinates": [-107.5, 46.5]},
+        },
+        {
+            "type": "Feature",
+            "properties": {"coordinates": "n/a"},
+            "geometry": {"type": "Point", "coordinates": [-106.5, 47.0]},
+        },
+    ]
+    path = tmp_path / "aoi.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    assert get_geojson_bounds(str(path), chunk_size=chunk_size) == (
+        -107.5,
+        46.5,
+        -106.5,
+        47.0,
+    )
+    assert _scan_geojson(path, chunk_size) == ((-107.5, 46.5, -106.5, 47.0), False)
+
+
+def test_get_geojson_bounds_empty(tmp_path: Path) -> None:
+    """Test get_geojson_bounds() fails for files without coordinates."""
+    path = tmp_path / "empty.geojson"
+    path.write_text('{"type": "FeatureCollection", "features": []}')
+    with pytest.raises(RuntimeError, match="no geometries"):
+        get_geojson_bounds(str(path))
+
+
+@pytest.fixture
+def points_csv(tmp_path: Path) -> Path:
+    """CSV file of points with detectable coordinate columns and a missing value."""
+    path = tmp_path / "points.csv"
+    path.write_text(
+        "id,Longitude,LAT\n"
+        "1,-107.70894965,47.0\n"
+        "2,-106.5,46.56799094\n"
+        "3,,45.0\n"
+        "4,-106.02718124,47.34869094\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 1000])
+def test_get_csv_bounds(points_csv: Path, chunk_rows: int) -> None:
+    """Test get_csv_bounds() detects columns and accumulates bounds across chunks."""
+    bounds = get_csv_bounds(str(points_csv), chunk_rows=chunk_rows)
+    assert bounds == (-107.70894965, 45.0, -106.02718124, 47.34869094)
+
+
+def test_get_csv_bounds_wkt(tmp_path: Path) -> None:
+    """Test get_csv_bounds() with a WKT column."""
+    path = tmp_path / "aoi.csv"
+    path.write_text(
+        "name;shape\n"
+        'a;"POLYGON ((-107.7 46.5, -106 46.5, -106 47.3, -107.7 46.5))"\n'
+        "b;\n"
+        "c;POINT (-105 48)\n",
+        encoding="utf-8",
+    )
+    bounds = get_csv_bounds(str(path), wkt_column="shape", delimiter=";", chunk_rows=1)
+    assert bounds == (-107.7, 46.5, -105.0, 48.0)
+
+
+def test_get_csv_bounds_invalid_values(tmp_path: Path) -> None:
+    """Test values that aren't coordinates are reported with their column and file."""
+    path = tmp_path / "points.csv"
+    path.write_text("lon,lat\n-107.7,46.5\n-106.5,north\n", encoding="utf-8")
+    with pytest.raises(RuntimeError, match=r"column `lat` of .*points\.csv"):
+        get_csv_bounds(str(path))
+    path.write_text("wkt\nPOINT (-105 48)\nPOINT (oops)\n", encoding="utf-8")
+    with pytest.raises(RuntimeError, match=r"WKT in column `wkt` of .*points\.csv"):
+        get_csv_bounds(str(path))
+
+
+def test_get_csv_bounds_errors(tmp_path: Path) -> None:
+    """Test get_csv_bounds() fails without coordinate columns or coordinates."""
+    path = tmp_path / "aoi.csv"
+    path.write_text("a,b\n1,2\n", encoding="utf-8")
+    with pytest.raises(RuntimeError, match="coordinate columns"):
+        get_csv_bounds(str(path))
+    path.write_text("x,y\n,\n", encoding="utf-8")
+    with pytest.raises(RuntimeError, match="no coordinates"):
+        get_csv_bounds(str(path))
+
+
+def test_get_bbox_from_file_csv(points_csv: Path) -> None:
+    """Test get_bbox_from_file() reads CSV files in chunks."""
+    assert (
+        get_bbox_from_file(str(points_csv))
+        == "-107.70894965 45.0 -106.02718124 47.34869094"
+    )
+
+
+def test_get_bbox_from_file_geojson_legacy_crs(
+    polygon_3857: geojson.Polygon, tmp_path: Path
+) -> None:
+    """Test get_bbox_from_file() honors a legacy GeoJSON `crs` member."""
+    path = tmp_path / "aoi.geojson"
+    _write_polygon(path, GeospatialDriver.geojson.value, polygon_3857, "EPSG:3857")
+    assert '"crs"' in path.read_text()
+    assert validate_bbox(get_bbox_from_file(str(path)))
+
+
+# Two groups of small boxes far apart
+SCATTERED_BBOXES = [
+    (-107.70, 46.56, -107.60, 46.66),
+    (-107.62, 46.60, -107.50, 46.70),
+    (-107.55, 46.55, -107.45, 46.65),
+    (-100.10, 40.00, -100.00, 40.10),
+    (-100.05, 40.05, -99.95, 40.15),
+]
+
+
+def test_cluster_bboxes() -> None:
+    """Test cluster_bboxes() merges nearby boxes and keeps distant ones apart."""
+    clusters = sorted(cluster_bboxes(SCATTERED_BBOXES))
+    assert clusters == [
+        pytest.approx((-107.70, 46.55, -107.45, 46.70)),
+        pytest.approx((-100.10, 40.00, -99.95, 40.15)),
+    ]
+
+    def area(b: Tuple[float, float, float, float]) -> float:
+        return (b[2] - b[0]) * (b[3] - b[1])
+
+    total = (-107.70, 40.00, -99.95, 46.70)
+    assert sum(area(b) for b in clusters) < area(total) / 100
+
+
+def test_cluster_bboxes_thresholds() -> None:
+    """Test cluster_bboxes() honors max_waste."""
+    assert len(cluster_bboxes(SCATTERED_BBOXES, max_waste=1)) == 1
+    assert len(cluster_bboxes(SCATTERED_BBOXES, max_waste=0)) == 5
+    assert cluster_bboxes([]) == []
+    with pytest.raises(ValueError):
+        cluster_bboxes(SCATTERED_BBOXES, max_waste=2)
+
+
+def test_cluster_bboxes_overlap() -> None:
+    """Test the intersection of overlapping boxes is only counted once as covered."""
+    # Union 9, covered 4 + 4 - 1 = 7, so 2/9 of the merged box is waste
+    boxes = [(0.0, 0.0, 2.0, 2.0), (1.0, 1.0, 3.0, 3.0)]
+    assert len(cluster_bboxes(boxes, max_waste=0.2)) == 2
+    assert cluster_bboxes(boxes, max_waste=0.25) == [(0.0, 0.0, 3.0, 3.0)]
+    # A box within another covers nothing extra
+    assert cluster_bboxes([(0, 0, 2, 2), (0.5, 0.5, 1, 1)], max_waste=0) == [
+        (0.0, 0.0, 2.0, 2.0)
+    ]
+
+
+def test_cluster_bboxes_points() -> None:
+    """Test points and lines, which have no area, merge with their neighbours."""
+    grid = [
+        (x0 + 0.01 * i, y0 + 0.01 * j) * 2
+        for x0, y0 in ((-107.0, 46.0), (-100.0, 40.0))
+        for i in range(6)
+        for j in range(6)
+    ]
+    assert sorted(cluster_bboxes(grid)) == [
+        pytest.approx((-107.0, 46.0, -106.95, 46.05)),
+        pytest.approx((-100.0, 40.0, -99.95, 40.05)),
+    ]
+    # Segments along a parallel
+    segments = [(-107.0 + 0.1 * i, 46.0, -106.9 + 0.1 * i, 46.0) for i in range(5)]
+    assert cluster_bboxes(segments) == [pytest.approx((-107.0, 46.0, -106.5, 46.0))]
+    # Points far apart stay separate
+    assert len(cluster_bboxes([(0, 0, 0, 0), (1, 1, 1, 1)])) == 2
+    with pytest.raises(ValueError):
+        cluster_bboxes(grid, min_size=-1)
+
+
+def test_cluster_bboxes_many() -> None:
+    """Test thousands of scattered points are clustered like a few features."""
+    numpy = pytest.importorskip("numpy")
+    rng = numpy.random.default_rng(0)
+    centers = numpy.array([(-107.0, 46.0), (-100.0, 40.0), (-90.0, 35.0)])
+    points = (
+        centers[rng.integers(0, 3, 5000)] + rng.uniform(0, 0.2, (5000, 2))
+    ).tolist()
+    clusters = cluster_bboxes([(x, y, x, y) for x, y in points])
+    assert len(clusters) == 3
+
+
+def test_get_clustered_bboxes_from_file(tmp_path: Path) -> None:
+    """Test get_clustered_bboxes_from_file() returns one bounding box per group of features."""
+    transformer = pyproj.Transformer.from_crs(4326, 3857, always_xy=True)
+    path = tmp_path / "perimeters.gpkg"
+    schema = {"geometry": "Polygon", "properties": {"id": "int"}}
+    with fiona.open(path, "w", driver="GPKG", crs="EPSG:3857", schema=schema) as dst:
+        for i, (x0, y0, x1, y1) in enumerate(SCATTERED_BBOXES):
+            ring = [
+                transformer.transform(x, y)
+                for x, y in [(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)]
+            ]
+            dst.write(
+                {
+                    "geometry": {"type": "Polygon", "coordinates": [ring]},
+                    "properties": {"id": i},
+                }
+            )
+
+    feature_bboxes = get_feature_bboxes(str(path))
+    assert feature_bboxes == [pytest.approx(b) for b in SCATTERED_BBOXES]
+
+    bboxes = get_clustered_bboxes_from_file(str(path))
+    assert len(bboxes) == 2
+    assert [round(float(v), 2) for v in bboxes[0].split()] == [
+        -107.70,
+        46.55,
+        -107.45,
+        46.70,
+    ]
+
+
+def test_get_bboxes_from_polygons(
+    polygon_4326: geojson.Polygon, polygon_3857: geojson.Polygon
+) -> None:
+    """Test get_bboxes_from_polygons() matches get_bbox_from_polygon() for every polygon."""
+    assert (
+        get_bboxes_from_polygons([polygon_4326] * 3)
+        == [get_bbox_from_polygon(polygon_4326)] * 3
+    )
+
+    bboxes = get_bboxes_from_polygons([polygon_3857, polygon_3857], crs="3857")
+    assert len(bboxes) == 2
+    assert all(validate_bbox(bbox) for bbox in bboxes)
+    assert get_bboxes_from_polygons([]) == []
+
+
+def test_get_bboxes_from_polygons_pole() -> None:
+    """Test get_bboxes_from_polygons() handles extents containing a pole."""
+    arctic = geojson.Polygon(
+        [[(-1e6, -1e6), (1e6, -1e6), (1e6, 1e6), (-1e6, 1e6), (-1e6, -1e6)]]
+    )
+    small = geojson.Polygon(
+        [[(-1e6, -2e6), (-9e5, -2e6), (-9e5, -1.9e6), (-1e6, -2e6)]]
+    )
+    pole_bbox, small_bbox = get_bboxes_from_polygons([arctic, small], crs="3413")
+    assert [float(v) for v in pole_bbox.split()][::2] == [-180, 180]
+    assert float(pole_bbox.split()[3]) == 90
+    assert [float(v) for v in small_bbox.split()] == pytest.approx(
+        reproject_bounds((-1e6, -2e6, -9e5, -1.9e6), "3413")
+    )
+
+
+def test_get_bboxes_from_polygons_empty() -> None:
+    """Test get_bboxes_from_polygons() rejects polygons without coordinates."""
+    with pytest.raises(RuntimeError, match="Polygon 0 has no coordinates"):
+        get_bboxes_from_polygons([geojson.Polygon([])])
@@ -0,0 +1,143 @@
+"""GeoTIFF header reader tests."""
+import math
+import struct
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy
+import pytest
+
+from landfire._geotiff import read_geotiff_extent
+from landfire.geospatial import GeospatialDriver, get_bbox_from_file
+from tests.test_geospatial import validate_bbox
+
+
+# rasterio is only used to write test rasters
+rasterio = pytest.importorskip("rasterio")
+
+# (a, b, c, d, e, f) with x = a*col + b*row + c and y = d*col + e*row + f
+Transform = Tuple[float, float, float, float, float, float]
+
+WIDTH, HEIGHT = 40, 30
+NORTH_UP: Transform = (30, 0, -1_200_000, 0, -30, 2_400_000)
+# NORTH_UP rotated by 10 degrees
+ROTATED: Transform = (
+    30 * math.cos(math.radians(10)),
+    30 * math.sin(math.radians(10)),
+    -1_200_000,
+    30 * math.sin(math.radians(10)),
+    -30 * math.cos(math.radians(10)),
+    2_400_000,
+)
+
+
+def write_raster(path: Path, crs: Any, transform: Transform, **options: Any) -> None:
+    """Write a small single band GeoTIFF."""
+    with rasterio.open(
+        path,
+        "w",
+        driver="GTiff",
+        width=WIDTH,
+        height=HEIGHT,
+        count=1,
+        dtype="uint8",
+        crs=crs,
+        transform=rasterio.Affine(*transform),
+        **options,
+    ) as dst:
+        dst.write(numpy.zeros((1, HEIGHT, WIDTH), dtype="uint8"))
+
+
+def corners_bounds(transform: Transform) -> Tuple[float, float, float, float]:
+    """Bounds of the corners of a WIDTH x HEIGHT raster."""
+    a, b, c, d, e, f = transform
+    corners = [(0, 0), (WIDTH, 0), (0, HEIGHT), (WIDTH, HEIGHT)]
+    xs = [a * col + b * row + c for col, row in corners]
+    ys = [d * col + e * row + f for col, row in corners]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"BIGTIFF": "YES", "ENDIANNESS": "BIG"},
+        {"TILED": "YES", "COMPRESS": "DEFLATE"},
+    ],
+)
+@pytest.mark.parametrize("transform", [NORTH_UP, ROTATED])
+def test_read_geotiff_extent(
+    tmp_path: Path, options: Dict[str, str], transform: Transform
+) -> None:
+    """Test read_geotiff_extent() reads the extent and CRS from the header."""
+    path = tmp_path / "aoi.tif"
+    write_raster(path, "EPSG:5070", transform, **options)
+    extent = read_geotiff_extent(str(path))
+    assert extent is not None
+    bounds, crs = extent
+    assert crs == "EPSG:5070"
+    assert bounds == pytest.approx(corners_bounds(transform))
+
+
+def test_read_geotiff_extent_pixel_is_point(tmp_path: Path) -> None:
+    """Test read_geotiff_extent() treats point raster coordinates as pixel centers, like GDAL."""
+    path = tmp_path / "aoi.tif"
+    write_raster(path, "EPSG:5070", NORTH_UP)
+    with rasterio.open(path, "r+") as dst:
+        dst.update_tags(AREA_OR_POINT="Point")
+    with rasterio.open(path) as src:
+        expected = tuple(src.bounds)
+    extent = read_geotiff_extent(str(path))
+    assert extent is not None
+    assert extent[0] == pytest.approx(expected)
+
+
+def test_read_geotiff_extent_not_geotiff() -> None:
+    """Test read_geotiff_extent() rejects other files."""
+    assert read_geotiff_extent("tests/data/test_4326.geojson") is None
+
+
+def test_read_geotiff_extent_missing_tags(tmp_path: Path) -> None:
+    """Test read_geotiff_extent() returns None for headers without an image size."""
+    path = tmp_path / "no_size.tif"
+    write_raster(path, "EPSG:5070", NORTH_UP)
+    data = bytearray(path.read_bytes())
+    # Rename the ImageWidth tag of the first IFD, which rasterio writes first
+    (offset,) = struct.unpack_from("<I", data, 4)
+    assert struct.unpack_from("<H", data, offset + 2)[0] == 256
+    struct.pack_into("<H", data, offset + 2, 65000)
+    path.write_bytes(bytes(data))
+    assert read_geotiff_extent(str(path)) is None
+
+
+def test_get_bbox_from_file_geotiff(tmp_path: Path) -> None:
+    """Test get_bbox_from_file() reads GeoTIFFs, falling back to rasterio for user defined CRS."""
+    transform: Transform = (
+        1.68176841 / WIDTH,
+        0,
+        -107.70894965,
+        0,
+        -0.78070000 / HEIGHT,
+        47.34869094,
+    )
+    path = tmp_path / "aoi.tif"
+    write_raster(path, "EPSG:4326", transform)
+    assert validate_bbox(get_bbox_from_file(str(path)))
+    assert validate_bbox(get_bbox_from_file(str(path), driver=GeospatialDriver.geotiff))
+
+    custom = tmp_path / "custom.tif"
+    write_raster(
+        custom, "+proj=longlat +a=6378137 +rf=298.257223563 +no_defs", transform
+    )
+    assert read_geotiff_extent(str(custom)) is None
+    assert validate_bbox(get_bbox_from_file(str(custom)))
+
+
+def test_get_bbox_from_file_geotiff_bad(tmp_path: Path) -> None:
+    """Test get_bbox_from_file() reports unreadable rasters."""
+    with pytest.raises(RuntimeError, match="correct file path"):
+        get_bbox_from_file(str(tmp_path / "missing.tif"))
+    with pytest.raises(RuntimeError, match="driver `GTiff`"):
+        get_bbox_from_file(
+            "tests/data/test_4326.geojson", driver=GeospatialDriver.geotiff
+        )
@@ -0,0 +1,82 @@
+"""Import time regression tests.
+
+These run `python -X importtime` in a fresh interpreter so that modules already imported by the test session do not hide regressions.
+"""
+import json
+import subprocess
+import sys
+from typing import Dict, Set, Tuple
+
+import pytest
+
+
+# Modules that must never be pulled in by a bare package import
+HEAVY_MODULES = (
+    "attr",
+    "attrs",
+    "fiona",
+    "geojson",
+    "geopandas",
+    "numpy",
+    "pandas",
+    "pydantic",
+    "pyproj",
+    "requests",
+    "shapely",
+    "tqdm",
+    "landfire.core",
+    "landfire.product.search",
+)
+
+# Generous ceiling on cumulative import time of the package itself
+MAX_IMPORT_US = 50_000
+
+
+def run_import(statement: str) -> Tuple[Set[str], Dict[str, int]]:
+    """Run `statement` in a fresh interpreter.
+
+    Returns:
+        Names of all modules in `sys.modules` afterwards and the cumulative `-X importtime` microseconds per module.
+    """
+    code = f"{statement}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: Dict[str, int] = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            timings[name.strip()] = int(cumulative)
+        except ValueError:
+            # header line
+            continue
+    return set(json.loads(out.stdout)), timings
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["import landfire", "import landfire.geospatial", "import landfire.product"],
+)
+def test_import_does_not_load_heavy_modules(statement: str) -> None:
+    """Test importing the package does not import heavy dependencies."""
+    modules, _ = run_import(statement)
+    loaded = sorted(name for name in HEAVY_MODULES if name in modules)
+    assert loaded == []
+
+
+def test_import_landfire_time() -> None:
+    """Test `import landfire` stays under the import time budget."""
+    _, timings = run_import("import landfire")
+    assert timings["landfire"] < MAX_IMPORT_US
+
+
+def test_lazy_attribute_access() -> None:
+    """Test lazily resolved attributes import their module on first access."""
+    modules, _ = run_import("import landfire\nlandfire.Landfire")
+    assert "landfire.core" in modules
+    assert "requests" in modules
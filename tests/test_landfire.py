@@ -1,12 +1,28 @@
 """Test suite for the landfire package."""
 import tempfile
-from typing import Any, Dict, Iterator
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
 from unittest import mock
 from unittest.mock import patch
 
 import pytest
 
-from landfire import Landfire
+from landfire import BBox, Landfire
+from landfire.core import BASE_URL
+
+
+# Minimal GP task description used for pre-flight validation
+TASK_DESCRIPTION = {
+    "name": "LandfireProductService",
+    "parameters": [
+        {"name": "Layer_List", "choiceList": ["map_zones", "ELEV2020"]},
+        {"name": "Output_Projection", "choiceList": ["4326", "5070"]},
+        {
+            "name": "Resample_Resolution",
+            "domain": {"type": "range", "range": [30, 9999]},
+        },
+    ],
+}
 
 
 class MockResponse:
@@ -16,6 +32,7 @@ class MockResponse:
         """Class init."""
         self.json_data = json_data
         self.status_code = status_code
+        self.headers: Dict[str, str] = {}
 
     def json(self) -> Dict[str, Any]:
         """Mock json func from Response."""
@@ -89,6 +106,13 @@ def mocked_requests_get_all_success(*args: Any, **kwargs: Any) -> Any:
         )
 
 
+def mocked_requests_get_preflight(*args: Any, **kwargs: Any) -> Any:
+    """Build mock requests for all successful, serving the task description."""
+    if kwargs["url"] == BASE_URL:
+        return MockResponse(TASK_DESCRIPTION, 200)
+    return mocked_requests_get_all_success(*args, **kwargs)
+
+
 def mocked_requests_get_submit_fail(*args: Any, **kwargs: Any) -> Any:
     """Build mock requests for initial submission failure when no job id."""
     if "/submitJob" in kwargs["url"]:
@@ -173,6 +197,13 @@ def test_landfire_init() -> None:
     assert lf.resample_res == 30
 
 
+def test_landfire_init_bbox() -> None:
+    """Tests that Landfire accepts a BBox."""
+    bbox = BBox(-107.70894965, 46.56799094, -106.02718124, 47.34869094)
+    lf = Landfire(bbox=bbox)
+    assert lf.bbox == "-107.70894965 46.56799094 -106.02718124 47.34869094"
+
+
 def test_resample_range_check_fail() -> None:
     """Tests that Landfire resample_res params fails range check."""
     with pytest.raises(ValueError) as exc:
@@ -194,7 +225,21 @@ def test_request_data_bad_layers(landfire: Landfire) -> None:
     )
 
 
-@patch("landfire.requests.get", side_effect=mocked_requests_get_all_success)
+def test_request_data_layers_outside_region() -> None:
+    """Test layers not available in the region of the bounding box are rejected."""
+    lf = Landfire(bbox="-150 61 -149 62")
+    lf._validate_layers(["ELEV2020"])
+    with pytest.raises(
+        RuntimeError, match=r"region\(s\) of the bounding box \(AK\): 200F40_19"
+    ):
+        lf.request_data(layers=["ELEV2020", "200F40_19"], output_path="test.zip")
+    with pytest.raises(RuntimeError, match="outside of the LANDFIRE regions"):
+        Landfire(bbox="0 40 10 50").request_data(
+            layers=["ELEV2020"], output_path="test.zip"
+        )
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_all_success)
 def test_landfire_download(
     mock_get: mock.Mock,
     landfire: Landfire,
@@ -207,7 +252,35 @@ def test_landfire_download(
     temp_dir.cleanup()
 
 
-@patch("landfire.requests.get", side_effect=mocked_requests_get_submit_fail)
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_all_success)
+def test_landfire_download_cache(
+    mock_get: mock.Mock, tmp_path: Path, write_result: Callable[..., None]
+) -> None:
+    """Test downloads are cached and requests within them are served locally."""
+    pytest.importorskip("rasterio")
+    from landfire.results import ResultCache
+
+    cache = ResultCache(tmp_path / "cache")
+    state = Landfire(bbox="-108.0 46.0 -106.0 48.0")
+    state.request_data(
+        layers=["ELEV2020"], output_path=str(tmp_path / "state.zip"), cache=cache
+    )
+    (entry,) = cache.entries
+    assert entry.layers == ("ELEV2020",) and entry.resample_res == 30
+
+    # Replace the mocked download with a real GeoTIFF to clip from
+    write_result(entry.path, "-108.0 46.0 -106.0 48.0")
+    mock_get.reset_mock()
+    county = Landfire(bbox="-107.5 46.5 -107.0 47.0")
+    county.request_data(
+        layers=["ELEV2020"], output_path=str(tmp_path / "county.zip"), cache=cache
+    )
+    assert not mock_get.called
+    assert (tmp_path / "county.zip").exists()
+    assert len(cache.entries) == 1
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_submit_fail)
 def test_landfire_download_submit_fail(
     mock_get: mock.Mock,
     landfire: Landfire,
@@ -226,7 +299,7 @@ def test_landfire_download_submit_fail(
     temp_dir.cleanup()
 
 
-@patch("landfire.requests.get", side_effect=mocked_requests_get_job_status_fail)
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_job_status_fail)
 def test_landfire_download_job_status_fail(
     mock_get: mock.Mock,
     landfire: Landfire,
@@ -245,7 +318,7 @@ def test_landfire_download_job_status_fail(
     temp_dir.cleanup()
 
 
-@patch("landfire.requests.get", side_effect=mocked_requests_get_processing_fail)
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_processing_fail)
 def test_landfire_download_job_processing_fail(
     mock_get: mock.Mock,
     landfire: Landfire,
@@ -262,3 +335,63 @@ def test_landfire_download_job_processing_fail(
         == "Encountered an error during job processing! Status was `esriJobFailed` and message was `Sad failure`."
     )
     temp_dir.cleanup()
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_preflight)
+def test_landfire_download_preflight_fail(
+    mock_get: mock.Mock,
+    temp_dir: tempfile.TemporaryDirectory,  # type: ignore
+) -> None:
+    """Test invalid requests fail pre-flight validation before a job is submitted."""
+    landfire = Landfire(
+        bbox="-107.70894965 46.56799094 -106.02718124",
+        output_crs="3857",
+    )
+    with pytest.raises(RuntimeError) as exc:
+        landfire.request_data(
+            layers=["map_zones"],
+            output_path=f"{temp_dir.name}/test_data.zip",
+            preflight=True,
+        )
+    assert str(exc.value) == (
+        "Request failed pre-flight validation! "
+        "Area_Of_Interest `-107.70894965 46.56799094 -106.02718124` must be four numbers `min_x min_y max_x max_y`. "
+        "Output_Projection `3857` is not offered by the service."
+    )
+    assert not any(
+        "/submitJob" in call.kwargs["url"] for call in mock_get.call_args_list
+    )
+    temp_dir.cleanup()
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_preflight)
+def test_landfire_download_preflight(
+    mock_get: mock.Mock,
+    landfire: Landfire,
+    temp_dir: tempfile.TemporaryDirectory,  # type: ignore
+) -> None:
+    """Test valid requests pass pre-flight validation and are submitted."""
+    landfire.request_data(
+        layers=["map_zones"],
+        output_path=f"{temp_dir.name}/test_data.zip",
+        preflight=True,
+        backoff_base_value=0,
+    )
+    assert mock_get.call_args_list[0].kwargs["url"] == BASE_URL
+    temp_dir.cleanup()
+
+
+@patch("landfire.core.requests.get", side_effect=mocked_requests_get_all_success)
+def test_landfire_download_no_preflight(
+    mock_get: mock.Mock,
+    landfire: Landfire,
+    temp_dir: tempfile.TemporaryDirectory,  # type: ignore
+) -> None:
+    """Test pre-flight validation is off by default."""
+    landfire.request_data(
+        layers=["map_zones"],
+        output_path=f"{temp_dir.name}/test_data.zip",
+        backoff_base_value=0,
+    )
+    assert all(call.kwargs["url"] != BASE_URL for call in mock_get.call_args_list)
+    temp_dir.cleanup()
@@ -0,0 +1,138 @@
+"""Map zone index tests."""
+import json
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from landfire import Landfire, mapzones
+from landfire.batch import BatchResult
+from landfire.mapzones import MapZoneIndex, get_map_zones, split_by_map_zones
+
+
+@pytest.fixture
+def zones_file(tmp_path: Path) -> Path:
+    """Map zones dataset with a 2x2 grid of one degree zones (zone 2 in two parts)."""
+    features = []
+    cells = {1: [(0, 0)], 2: [(1, 0)], 3: [(0, 1)], 4: [(1, 1)]}
+    for zone, origins in cells.items():
+        for x, y in origins:
+            ring = [[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1], [x, y]]
+            features.append(
+                {
+                    "type": "Feature",
+                    "properties": {"ZONE_NUM": zone, "NAME": f"zone {zone}"},
+                    "geometry": {"type": "Polygon", "coordinates": [ring]},
+                }
+            )
+    features.append(
+        {
+            "type": "Feature",
+            "properties": {"ZONE_NUM": 2, "NAME": "zone 2 island"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[2.5, 0], [3, 0], [3, 0.5], [2.5, 0.5], [2.5, 0]]],
+            },
+        }
+    )
+    path = tmp_path / "zones.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    return path
+
+
+@pytest.fixture
+def index(zones_file: Path) -> MapZoneIndex:
+    """Index of the test zones."""
+    return MapZoneIndex.from_file(str(zones_file), tolerance=0)
+
+
+def test_from_file(index: MapZoneIndex) -> None:
+    """Test zones are merged per map zone number."""
+    assert index.zones.tolist() == [1, 2, 3, 4]
+    assert index.polygons[1].geom_type == "MultiPolygon"
+
+
+def test_query(index: MapZoneIndex) -> None:
+    """Test get_map_zones() finds intersecting zones."""
+    assert get_map_zones("0.1 0.1 0.2 0.2", index) == [1]
+    assert get_map_zones("0.5 0.5 1.5 1.5", index) == [1, 2, 3, 4]
+    assert get_map_zones((2.6, 0.1, 2.7, 0.2), index) == [2]
+    assert get_map_zones("5 5 6 6", index) == []
+
+
+def test_split(index: MapZoneIndex) -> None:
+    """Test split_by_map_zones() uses zone numbers for zones within the bounding box."""
+    assert split_by_map_zones("-1 -1 1.5 3", index) == [
+        "1",
+        "1.0 0.0 1.5 1.0",
+        "3",
+        "1.0 1.0 1.5 2.0",
+    ]
+    # Zones only touching the bounding box are dropped
+    assert split_by_map_zones("0.25 0.25 0.75 1.0", index) == ["0.25 0.25 0.75 1.0"]
+
+
+def test_save_load(
+    index: MapZoneIndex, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the index round trips through the cache directory."""
+    monkeypatch.setattr(mapzones, "_default_index", None)
+    with pytest.raises(RuntimeError, match="No map zone index"):
+        MapZoneIndex.load(cache_dir=str(tmp_path))
+
+    path = index.save(cache_dir=str(tmp_path))
+    assert path == tmp_path / mapzones.MAP_ZONES_FILE
+    loaded = MapZoneIndex.load(cache_dir=str(tmp_path))
+    assert loaded.zones.tolist() == index.zones.tolist()
+    assert all(loaded.polygons[i].equals(index.polygons[i]) for i in range(4))
+
+    monkeypatch.setenv("LANDFIRE_CACHE_DIR", str(tmp_path))
+    assert get_map_zones("0.5 0.5 1.5 0.75") == [1, 2]
+
+
+def test_default_index(
+    index: MapZoneIndex, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the packaged index is the default and an index in the cache directory overrides it."""
+    packaged = tmp_path / "data" / mapzones.MAP_ZONES_FILE
+    packaged.parent.mkdir()
+    monkeypatch.setattr(mapzones, "PACKAGED_MAP_ZONES", packaged)
+    monkeypatch.setattr(mapzones, "_default_index", None)
+    monkeypatch.setenv("LANDFIRE_CACHE_DIR", str(tmp_path / "cache"))
+    with pytest.raises(RuntimeError, match="No map zone index"):
+        get_map_zones("0.5 0.5 1.5 0.75")
+
+    index.save(str(packaged))
+    assert get_map_zones("0.5 0.5 1.5 0.75") == [1, 2]
+
+    MapZoneIndex(zones=index.zones[:1], polygons=index.polygons[:1]).save()
+    monkeypatch.setattr(mapzones, "_default_index", None)
+    assert get_map_zones("0.5 0.5 1.5 0.75") == [1]
+
+
+def test_landfire_request_by_map_zones(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test Landfire requests one sub-job per map zone of its bounding box."""
+    shapely = pytest.importorskip("shapely")
+    numpy = pytest.importorskip("numpy")
+    index = MapZoneIndex(
+        zones=numpy.array([20, 21]),
+        polygons=numpy.array(
+            [shapely.box(-108, 46, -107, 47), shapely.box(-107, 46, -106, 47)]
+        ),
+    )
+    requested: List[Any] = []
+
+    def fake_request_many(specs: Any, **kwargs: Any) -> Iterator[BatchResult]:
+        requested.extend(specs)
+        for i in reversed(range(len(requested))):
+            yield BatchResult(i, None, None, f"j{i}", None, 1.0)
+
+    monkeypatch.setattr("landfire.batch.request_many", fake_request_many)
+    lf = Landfire(bbox="-107.5 46 -106 47", resample_res=60)
+    results = lf.request_by_map_zones(["ELEV2020"], "out", index=index)
+    assert [result.job_id for result in results] == ["j0", "j1"]
+    assert [spec["bbox"] for spec in requested] == ["-107.5 46.0 -107.0 47.0", "21"]
+    assert all(spec["resample_res"] == 60 for spec in requested)
+
+    with pytest.raises(RuntimeError, match="must be a bounding box"):
+        Landfire(bbox="21").request_by_map_zones(["ELEV2020"], "out", index=index)
@@ -0,0 +1,192 @@
+"""Shared job tests."""
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Iterator, List
+
+import numpy
+import pytest
+
+from landfire.batch import BatchResult
+from landfire.bbox import BBox
+from landfire.merge import clip_result, plan_shared_jobs, request_merged
+
+
+DAY_1 = "-107.7 46.5 -107.0 47.0"
+DAY_2 = "-107.5 46.6 -106.8 47.1"
+DAY_3 = "-106.9 46.9 -106.5 47.3"
+ELSEWHERE = "-110.0 44.0 -109.5 44.5"
+
+
+def test_plan_shared_jobs() -> None:
+    """Test overlapping specs with identical layers share one job covering their union."""
+    jobs, invalid = plan_shared_jobs(
+        [
+            (DAY_1, ["ELEV2020"]),
+            (ELSEWHERE, ["ELEV2020"]),
+            (DAY_2, ["ELEV2020"]),
+            (DAY_3, ["ELEV2020"]),
+            (DAY_2, ["SLPD2020"]),
+            ("10", ["ELEV2020"]),
+        ]
+    )
+    assert invalid == []
+    assert [job.members for job in jobs] == [(0, 2, 3), (1,), (4,), (5,)]
+    assert jobs[0].shared and not jobs[1].shared
+    assert BBox.parse(jobs[0].params["Area_Of_Interest"]).bounds == (
+        -107.7,
+        46.5,
+        -106.5,
+        47.3,
+    )
+    assert [params["Area_Of_Interest"] for params in jobs[0].member_params] == [
+        DAY_1,
+        DAY_2,
+        DAY_3,
+    ]
+    assert jobs[3].params["Area_Of_Interest"] == "10"
+
+
+def test_plan_shared_jobs_min_overlap() -> None:
+    """Test boxes overlapping less than min_overlap of the smaller box get their own jobs."""
+    specs = [(DAY_2, ["ELEV2020"]), (DAY_3, ["ELEV2020"])]
+    assert len(plan_shared_jobs(specs, min_overlap=0.0)[0]) == 1
+    assert len(plan_shared_jobs(specs, min_overlap=0.5)[0]) == 2
+
+
+def test_plan_shared_jobs_chained() -> None:
+    """Test chains of overlapping boxes are split instead of merged into one huge job."""
+    # A staircase of one degree boxes, each overlapping the next by a quarter
+    specs = [
+        (f"{-110 + i / 2} {40 + i / 2} {-109 + i / 2} {41 + i / 2}", ["ELEV2020"])
+        for i in range(6)
+    ]
+    jobs, _ = plan_shared_jobs(specs)
+    assert [job.members for job in jobs] == [(0, 1, 2, 3), (4, 5)]
+    assert [job.params["Area_Of_Interest"] for job in jobs] == [
+        "-110.0 40.0 -107.5 42.5",
+        "-108.0 42.0 -106.5 43.5",
+    ]
+    assert [job.members for job in plan_shared_jobs(specs, max_waste=3)[0]] == [
+        (0, 1, 2, 3, 4, 5)
+    ]
+    assert len(plan_shared_jobs(specs, max_waste=0)[0]) == 6
+    with pytest.raises(ValueError, match="max_waste"):
+        plan_shared_jobs(specs, max_waste=-1)
+
+
+def test_plan_shared_jobs_layer_order() -> None:
+    """Test specs with the same layers in a different order share a job."""
+    jobs, _ = plan_shared_jobs(
+        [(DAY_1, ["ELEV2020", "SLPD2020"]), (DAY_2, ["SLPD2020", "ELEV2020"])]
+    )
+    assert [job.members for job in jobs] == [(0, 1)]
+
+
+def test_plan_shared_jobs_invalid() -> None:
+    """Test invalid specs are reported."""
+    jobs, invalid = plan_shared_jobs([(DAY_1, ["NOPE"]), (DAY_1, ["ELEV2020"])])
+    assert [job.members for job in jobs] == [(1,)]
+    assert [result.index for result in invalid] == [0]
+    assert "NOPE" in str(invalid[0].error)
+
+
+def test_clip_result(tmp_path: Path, write_result: Callable[..., None]) -> None:
+    """Test an area is clipped out of the shared result on the original pixel grid."""
+    rasterio = pytest.importorskip("rasterio")
+    shared = tmp_path / "shared.zip"
+    write_result(shared, "-107.7 46.5 -106.5 47.3")
+    output = clip_result(str(shared), BBox.parse(DAY_3), str(tmp_path / "day_3.zip"))
+    with zipfile.ZipFile(output) as archive:
+        assert archive.namelist() == ["day_3.tif"]
+    with rasterio.open(f"/vsizip/{output}/day_3.tif") as src:
+        assert src.width == 40 and src.height == 40
+        assert src.nodata == -9999
+        assert numpy.allclose(src.bounds, BBox.parse(DAY_3).bounds)
+        # First pixel is row 0, column 80 of the 120 columns wide shared raster
+        assert src.read(1)[0, 0] == 80
+
+
+def test_clip_result_outside(tmp_path: Path, write_result: Callable[..., None]) -> None:
+    """Test areas outside of the shared result are rejected."""
+    pytest.importorskip("rasterio")
+    shared = tmp_path / "shared.zip"
+    write_result(shared, DAY_1)
+    with pytest.raises(RuntimeError, match="outside of the shared result"):
+        clip_result(str(shared), BBox.parse(ELSEWHERE), str(tmp_path / "out.zip"))
+
+
+def test_request_merged(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    write_result: Callable[..., None],
+) -> None:
+    """Test shared jobs are requested once and every member is clipped out."""
+    pytest.importorskip("rasterio")
+    requested: List[Any] = []
+
+    def fake_request_many(specs: Any, **kwargs: Any) -> Iterator[BatchResult]:
+        requested.extend(specs)
+        for index, spec in enumerate(specs):
+            write_result(Path(spec["output_path"]), spec["bbox"])
+            yield BatchResult(
+                index, None, Path(spec["output_path"]), f"j{index}", None, 1.0
+            )
+
+    monkeypatch.setattr("landfire.merge.request_many", fake_request_many)
+    specs: List[Any] = [
+        (DAY_1, ["ELEV2020"]),
+        {
+            "bbox": DAY_2,
+            "layers": ["ELEV2020"],
+            "output_path": str(tmp_path / "d2.zip"),
+        },
+        (ELSEWHERE, ["ELEV2020"]),
+        (DAY_1, ["NOPE"]),
+    ]
+    results = sorted(
+        request_merged(specs, output_dir=str(tmp_path)), key=lambda r: r.index
+    )
+    assert len(requested) == 2
+    assert [result.ok for result in results] == [True, True, True, False]
+    assert [result.job_id for result in results[:3]] == ["j0", "j0", "j1"]
+    assert results[0].output_path == tmp_path / "landfire_0.zip"
+    assert results[1].output_path == tmp_path / "d2.zip"
+    assert all(Path(str(result.output_path)).exists() for result in results[:3])
+    # Shared downloads are removed once the members are clipped
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "d2.zip",
+        "landfire_0.zip",
+        "landfire_2.zip",
+    ]
+
+
+def test_request_merged_layer_order(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    write_result: Callable[..., None],
+) -> None:
+    """Test members get the shared bands in their own layer order and output_dir is created."""
+    rasterio = pytest.importorskip("rasterio")
+
+    def fake_request_many(specs: Any, **kwargs: Any) -> Iterator[BatchResult]:
+        for index, spec in enumerate(specs):
+            write_result(Path(spec["output_path"]), spec["bbox"], count=2)
+            yield BatchResult(
+                index, None, Path(spec["output_path"]), f"j{index}", None, 1.0
+            )
+
+    monkeypatch.setattr("landfire.merge.request_many", fake_request_many)
+    output_dir = tmp_path / "new" / "dir"
+    specs = [(DAY_1, ["ELEV2020", "SLPD2020"]), (DAY_2, ["SLPD2020", "ELEV2020"])]
+    results = sorted(
+        request_merged(specs, output_dir=str(output_dir)), key=lambda r: r.index
+    )
+    assert [result.job_id for result in results] == ["j0", "j0"]
+    first_bands = []
+    for result in results:
+        with rasterio.open(
+            f"/vsizip/{result.output_path}/landfire_{result.index}.tif"
+        ) as src:
+            first_bands.append(int(src.read(1).min()) // 1000)
+    # Band 1 is ELEV2020 (values below 1000) for the first spec and SLPD2020 for the second
+    assert first_bands == [0, 1]
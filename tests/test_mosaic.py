@@ -0,0 +1,154 @@
+"""Local mosaic backend tests."""
+import zipfile
+from pathlib import Path
+from typing import Any, Tuple
+
+import numpy
+import pytest
+
+from landfire import Landfire
+from landfire.mosaic import LocalMosaic
+
+
+AOI = "-107.60 46.60 -107.55 46.63"
+
+# Albers grid of the test mosaics, covering AOI with a margin
+LEFT, TOP, SIZE = -895005.0, 2687025.0, 600
+
+
+@pytest.fixture
+def mosaics(tmp_path: Path) -> Path:
+    """Directory with ELEV2020 (int16) and SLPD2020 (uint8) mosaics on a 30 m grid."""
+    rasterio = pytest.importorskip("rasterio")
+    directory = tmp_path / "mosaics"
+    directory.mkdir()
+    rows, cols = numpy.mgrid[0:SIZE, 0:SIZE]
+    for name, data in (("ELEV2020.tif", cols), ("slpd2020.TIF", rows % 200)):
+        dtype = "int16" if name.startswith("ELEV") else "uint8"
+        with rasterio.open(
+            directory / name,
+            "w",
+            driver="GTiff",
+            width=SIZE,
+            height=SIZE,
+            count=1,
+            dtype=dtype,
+            crs="EPSG:5070",
+            transform=rasterio.Affine(30, 0, LEFT, 0, -30, TOP),
+            nodata=0 if dtype == "uint8" else -9999,
+        ) as dst:
+            dst.write(data.astype(dtype), 1)
+    return directory
+
+
+def read_output(path: Path) -> Tuple[Any, Any, Any]:
+    """Open the single GeoTIFF in a zip file, returning its profile and data."""
+    rasterio = pytest.importorskip("rasterio")
+    with zipfile.ZipFile(path) as archive:
+        (name,) = archive.namelist()
+    with rasterio.open(f"/vsizip/{path}/{name}") as src:
+        return src.profile, src.read(), src.descriptions
+
+
+def test_resolve(mosaics: Path, tmp_path: Path) -> None:
+    """Test layer codes resolve through the catalog to local rasters."""
+    mosaic = LocalMosaic(mosaics, paths={"ASP2020": str(tmp_path / "aspect.tif")})
+    assert mosaic.resolve("ELEV2020") == mosaics / "ELEV2020.tif"
+    assert mosaic.resolve("SLPD2020") == mosaics / "slpd2020.TIF"
+    assert mosaic.resolve("ASP2020") == tmp_path / "aspect.tif"
+    with pytest.raises(RuntimeError, match="not in the catalog"):
+        mosaic.resolve("NOPE")
+    with pytest.raises(RuntimeError, match="No local mosaic for layer `220F40_22`"):
+        mosaic.resolve("220F40_22")
+
+
+def test_extract_native(mosaics: Path, tmp_path: Path) -> None:
+    """Test native requests keep the mosaic grid and read only the window."""
+    output = LocalMosaic(mosaics).extract(
+        AOI, ["ELEV2020", "SLPD2020"], str(tmp_path / "out.zip")
+    )
+    profile, data, descriptions = read_output(output)
+    assert descriptions == ("ELEV2020", "SLPD2020")
+    assert profile["count"] == 2 and profile["dtype"] == "int16"
+    transform = profile["transform"]
+    col_off = round((transform.c - LEFT) / 30)
+    row_off = round((TOP - transform.f) / 30)
+    assert 0 < col_off < SIZE and 0 < row_off < SIZE
+    assert profile["width"] < SIZE / 2 and profile["height"] < SIZE / 2
+    assert (data[0] == col_off + numpy.arange(profile["width"])).all()
+    slope = (row_off + numpy.arange(profile["height"])) % 200
+    # Zero is the nodata value of SLPD2020 and becomes the output nodata value
+    assert profile["nodata"] == -9999
+    assert (data[1][:, 0] == numpy.where(slope == 0, -9999, slope)).all()
+
+
+def test_extract_blocks(
+    mosaics: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test layers are read one output block at a time with nodata rewritten."""
+    from rasterio.vrt import WarpedVRT
+
+    windows = []
+    read = WarpedVRT.read
+
+    def windowed_read(self: Any, *args: Any, **kwargs: Any) -> Any:
+        windows.append(kwargs.get("window"))
+        return read(self, *args, **kwargs)
+
+    monkeypatch.setattr(WarpedVRT, "read", windowed_read)
+    # More than one 512 pixel block per row, extending west of the mosaics
+    bbox = "-108.10 46.50 -107.55 46.63"
+    output = LocalMosaic(mosaics).extract(
+        bbox, ["SLPD2020", "ELEV2020"], str(tmp_path / "out.zip"), "5070"
+    )
+    profile, data, _ = read_output(output)
+    assert profile["dtype"] == "int16" and profile["nodata"] == 0
+    assert profile["width"] > 512
+    assert len(windows) > 2 and all(window is not None for window in windows)
+    # Outside of the ELEV2020 mosaic, its nodata (-9999) is written as 0
+    assert (data[1][:, 0] == 0).all() and (data[1] != -9999).all()
+
+
+def test_extract_resampled(mosaics: Path, tmp_path: Path) -> None:
+    """Test resolution and projection are applied locally."""
+    mosaic = LocalMosaic(mosaics)
+    coarse, _, _ = read_output(
+        mosaic.extract(AOI, ["ELEV2020"], str(tmp_path / "a.zip"), resample_res=90)
+    )
+    native, _, _ = read_output(
+        mosaic.extract(AOI, ["ELEV2020"], str(tmp_path / "b.zip"))
+    )
+    assert coarse["transform"].a == 90
+    assert abs(coarse["width"] * 3 - native["width"]) <= 3
+    geographic, _, _ = read_output(
+        mosaic.extract(AOI, ["ELEV2020"], str(tmp_path / "c.zip"), "4326")
+    )
+    assert geographic["crs"].to_epsg() == 4326
+    assert geographic["transform"].a == pytest.approx(30 / 111319.49)
+    with pytest.raises(RuntimeError, match="outside of the local mosaics"):
+        mosaic.extract("-100 40 -99 41", ["ELEV2020"], str(tmp_path / "d.zip"))
+
+
+def test_landfire_mosaic(mosaics: Path, tmp_path: Path) -> None:
+    """Test Landfire requests are served by the local backend without network calls."""
+    landfire = Landfire(bbox=AOI, resample_res=60, mosaic=LocalMosaic(mosaics))
+    landfire.request_data(["ELEV2020"], str(tmp_path / "out.zip"), show_status=False)
+    profile, _, _ = read_output(tmp_path / "out.zip")
+    assert profile["transform"].a == 60
+
+
+def test_landfire_mosaic_invalid(mosaics: Path, tmp_path: Path) -> None:
+    """Test map zones, non-mosaic values and combining mosaics with tiles are rejected."""
+    from landfire.tiles import TileCache
+
+    output = str(tmp_path / "out.zip")
+    with pytest.raises(RuntimeError, match="Unable to extract from local mosaics"):
+        Landfire(bbox="10", mosaic=LocalMosaic(mosaics)).request_data(
+            ["ELEV2020"], output, show_status=False
+        )
+    with pytest.raises(TypeError, match="mosaic"):
+        Landfire(bbox=AOI, mosaic=str(mosaics))  # type: ignore[arg-type]
+    with pytest.raises(RuntimeError, match="only one of `mosaic` and `tiles`"):
+        Landfire(bbox=AOI, mosaic=LocalMosaic(mosaics)).request_data(
+            ["ELEV2020"], output, tiles=TileCache(tmp_path / "tiles")
+        )
@@ -0,0 +1,177 @@
+"""Local resampling pyramid tests."""
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import numpy
+import pytest
+
+from landfire import Landfire
+from landfire.pyramid import aggregate_mean, aggregate_mode, build_pyramid
+
+
+LAYERS = ["220F40_22", "ELEV2020"]
+
+# 5 x 7 pixels: fuel models (categorical) and elevations (continuous) with nodata
+FUEL = numpy.array(
+    [
+        [101, 101, 102, 165, 165, 165, 91],
+        [101, 102, 102, 165, 121, 121, 91],
+        [102, 102, 102, 121, 121, 121, 91],
+        [-9999, -9999, -9999, 101, 102, 101, 91],
+        [-9999, -9999, -9999, 102, 101, 102, 91],
+    ],
+    dtype="int16",
+)
+ELEVATION = numpy.array(
+    [
+        [100, 110, 120, 200, 200, 200, 300],
+        [100, 110, 120, 200, 200, 200, 300],
+        [100, 110, 120, 201, 201, 201, 300],
+        [-9999, 400, -9999, 500, 500, 500, 600],
+        [-9999, -9999, -9999, 500, 500, 500, 600],
+    ],
+    dtype="int16",
+)
+
+
+def test_aggregate_mode() -> None:
+    """Test the most common valid value wins, ties go to the smallest value."""
+    blocks = numpy.array(
+        [[1, 2, 2, 3], [5, 4, 5, 4], [-1, -1, -1, 7], [-1, -1, -1, -1]], dtype="int16"
+    )
+    assert aggregate_mode(blocks, -1).tolist() == [2, 4, 7, -1]
+    assert aggregate_mode(blocks, None).tolist() == [2, 4, -1, -1]
+
+
+def test_aggregate_mean() -> None:
+    """Test means ignore nodata and are rounded for integers."""
+    blocks = numpy.array(
+        [[1, 2, 2, 3], [1, 2, -1, -1], [-1, -1, -1, -1]], dtype="int16"
+    )
+    assert aggregate_mean(blocks, -1).tolist() == [2, 2, -1]
+    floats = numpy.array([[0.5, 1.0], [-1.0, 2.0]], dtype="float32")
+    assert aggregate_mean(floats, -1.0).tolist() == [0.75, 2.0]
+
+
+@pytest.fixture
+def download(tmp_path: Path) -> Path:
+    """Zip file with a two band 30 m GeoTIFF like LFPS downloads."""
+    rasterio = pytest.importorskip("rasterio")
+    tif = tmp_path / "download.tif"
+    with rasterio.open(
+        tif,
+        "w",
+        driver="GTiff",
+        width=7,
+        height=5,
+        count=2,
+        dtype="int16",
+        crs="EPSG:5070",
+        transform=rasterio.Affine(30, 0, -1000005, 0, -30, 2000025),
+        nodata=-9999,
+    ) as dst:
+        dst.write(numpy.stack([FUEL, ELEVATION]))
+    path = tmp_path / "download.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.write(tif, tif.name)
+    tif.unlink()
+    return path
+
+
+@pytest.mark.parametrize("strip_rows", [1, 256])
+def test_build_pyramid(
+    download: Path, monkeypatch: pytest.MonkeyPatch, strip_rows: int
+) -> None:
+    """Test categorical layers take the mode and continuous ones the mean, strip by strip."""
+    rasterio = pytest.importorskip("rasterio")
+    monkeypatch.setattr("landfire.pyramid.STRIP_ROWS", strip_rows)
+    outputs = build_pyramid(str(download), LAYERS, [90, 210])
+    assert outputs == {
+        90: download.with_name("download_90m.zip"),
+        210: download.with_name("download_210m.zip"),
+    }
+    with rasterio.open(f"/vsizip/{outputs[90]}/download_90m.tif") as src:
+        assert (src.width, src.height) == (3, 2)
+        assert src.transform.a == 90 and src.transform.c == -1000005
+        assert src.nodata == -9999
+        fuel, elevation = src.read()
+    assert fuel.tolist() == [[102, 121, 91], [-9999, 101, 91]]
+    assert elevation.tolist() == [[110, 200, 300], [400, 500, 600]]
+    with rasterio.open(f"/vsizip/{outputs[210]}/download_210m.tif") as src:
+        assert (src.width, src.height) == (1, 1)
+
+
+def test_build_pyramid_invalid(download: Path) -> None:
+    """Test resolutions, layers and bands are checked."""
+    pytest.importorskip("rasterio")
+    with pytest.raises(RuntimeError, match="must be a multiple"):
+        build_pyramid(str(download), LAYERS, [100])
+    with pytest.raises(RuntimeError, match="2 bands but 1 layers"):
+        build_pyramid(str(download), LAYERS[:1], [90])
+    with pytest.raises(RuntimeError, match="not in the catalog: NOPE"):
+        build_pyramid(str(download), ["NOPE", "ELEV2020"], [90])
+
+
+def test_request_pyramid(
+    download: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test one download serves every resolution."""
+    pytest.importorskip("rasterio")
+    calls = []
+
+    def fake_request_data(
+        self: Any, layers: Any, output_path: str, **kwargs: Any
+    ) -> None:
+        calls.append(kwargs)
+        Path(output_path).write_bytes(download.read_bytes())
+
+    monkeypatch.setattr(Landfire, "request_data", fake_request_data)
+    landfire = Landfire(bbox="-107.6 46.6 -107.55 46.63")
+    output = tmp_path / "fuels.zip"
+    outputs = landfire.request_pyramid(
+        LAYERS, str(output), [30, 90, 270], show_status=False
+    )
+    assert calls == [{"show_status": False}]
+    assert outputs == {
+        30: output,
+        90: tmp_path / "fuels_90m.zip",
+        270: tmp_path / "fuels_270m.zip",
+    }
+    assert all(path.exists() for path in outputs.values())
+    with pytest.raises(RuntimeError, match="multiples of resample_res"):
+        landfire.request_pyramid(LAYERS, str(output), [45])
+    calls.clear()
+    geographic = Landfire(bbox="-107.6 46.6 -107.55 46.63", output_crs="4326")
+    with pytest.raises(RuntimeError, match="geographic projection `4326`"):
+        geographic.request_pyramid(LAYERS, str(output), [90])
+    assert calls == []
+
+
+def test_build_pyramid_edges_without_nodata(tmp_path: Path) -> None:
+    """Test partial edge blocks of sources without nodata only aggregate real pixels."""
+    rasterio = pytest.importorskip("rasterio")
+    tif = tmp_path / "download.tif"
+    with rasterio.open(
+        tif,
+        "w",
+        driver="GTiff",
+        width=7,
+        height=5,
+        count=2,
+        dtype="int16",
+        crs="EPSG:5070",
+        transform=rasterio.Affine(30, 0, -1000005, 0, -30, 2000025),
+    ) as dst:
+        dst.write(numpy.stack([FUEL, ELEVATION]).clip(0))
+    path = tmp_path / "download.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.write(tif, tif.name)
+    outputs = build_pyramid(str(path), LAYERS, [90])
+    with rasterio.open(f"/vsizip/{outputs[90]}/download_90m.tif") as src:
+        assert src.nodata is None
+        fuel, elevation = src.read()
+    # The 1 x 2 bottom right block is all 91, the 2 x 1 bottom left block of
+    # zeros and 400 is not pulled towards the padding
+    assert fuel.tolist() == [[102, 121, 91], [0, 101, 91]]
+    assert elevation.tolist() == [[110, 200, 300], [67, 500, 600]]
@@ -0,0 +1,185 @@
+"""Result cache tests."""
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import numpy
+import pytest
+
+from landfire import _cache
+from landfire.bbox import BBox
+from landfire.results import RESULTS_INDEX, ResultCache
+
+
+STATE = "-108.0 46.0 -106.0 48.0"
+COUNTY = "-107.5 46.5 -107.0 47.0"
+
+
+@pytest.fixture
+def cache(tmp_path: Path, write_result: Callable[..., None]) -> ResultCache:
+    """Result cache holding a two band statewide result."""
+    pytest.importorskip("rasterio")
+    source = tmp_path / "state.zip"
+    write_result(source, STATE, count=2)
+    cache = ResultCache(tmp_path / "cache")
+    cache.add(str(source), STATE, ["ELEV2020", "SLPD2020"], None, 30)
+    return cache
+
+
+def test_find(cache: ResultCache) -> None:
+    """Test requests within a cached result with compatible parameters match it."""
+    assert cache.find(COUNTY, ["SLPD2020"]) is not None
+    assert cache.find(BBox.parse(COUNTY), ["SLPD2020", "ELEV2020"]) is not None
+    # Not contained, other layers, projection or resolution, map zones
+    assert cache.find("-109.0 46.5 -107.0 47.0", ["ELEV2020"]) is None
+    assert cache.find(COUNTY, ["ASP2020"]) is None
+    assert cache.find(COUNTY, ["ELEV2020"], output_crs="4326") is None
+    assert cache.find(COUNTY, ["ELEV2020"], resample_res=90) is None
+    assert cache.find("10", ["ELEV2020"]) is None
+
+
+def test_find_smallest(
+    cache: ResultCache, tmp_path: Path, write_result: Callable[..., None]
+) -> None:
+    """Test the smallest containing result is used."""
+    source = tmp_path / "region.zip"
+    write_result(source, "-107.6 46.4 -106.9 47.1")
+    region = cache.add(str(source), "-107.6 46.4 -106.9 47.1", ["ELEV2020"])
+    assert cache.find(COUNTY, ["ELEV2020"]) == region
+    assert cache.find(COUNTY, ["SLPD2020"]) != region
+
+
+def test_serve(cache: ResultCache, tmp_path: Path) -> None:
+    """Test requests are clipped out of the cached result with their layers in order."""
+    rasterio = pytest.importorskip("rasterio")
+    output = tmp_path / "county.zip"
+    assert cache.serve(COUNTY, ["SLPD2020"], str(output)) is not None
+    with zipfile.ZipFile(output) as archive:
+        (name,) = archive.namelist()
+    with rasterio.open(f"/vsizip/{output}/{name}") as src:
+        assert src.count == 1
+        assert numpy.allclose(src.bounds, BBox.parse(COUNTY).bounds)
+        # Second band of the statewide result, starting at row 100 and column 50
+        assert src.read(1)[0, 0] == 1000 + 100 * 200 + 50
+    assert cache.serve("-109.0 46.5 -107.0 47.0", ["ELEV2020"], str(output)) is None
+
+
+def test_persistence(cache: ResultCache) -> None:
+    """Test the index is reloaded and cleared."""
+    reloaded = ResultCache(cache.directory)
+    assert reloaded.entries == cache.entries
+    reloaded.clear()
+    assert ResultCache(cache.directory).entries == []
+    assert list(cache.directory.glob("*.zip")) == []
+
+
+def test_prune(
+    cache: ResultCache, tmp_path: Path, write_result: Callable[..., None]
+) -> None:
+    """Test the least recently used results are evicted once the cache is too large."""
+    (state,) = cache.entries
+    source = tmp_path / "region.zip"
+    write_result(source, "-110.0 44.0 -109.0 45.0")
+    region = cache.add(str(source), "-110.0 44.0 -109.0 45.0", ["ELEV2020"])
+    # Serving from the statewide result makes the region the least recently used
+    assert cache.serve(COUNTY, ["ELEV2020"], str(tmp_path / "county.zip")) is not None
+    assert cache.size == state.path.stat().st_size + region.path.stat().st_size
+
+    assert cache.prune(cache.size) == []
+    assert cache.prune(state.path.stat().st_size) == [region]
+    assert not region.path.exists()
+    assert [entry.path for entry in cache.entries] == [state.path]
+    # The most recently used result is kept even if it alone is too large
+    assert cache.prune(0) == []
+    assert [entry.path for entry in ResultCache(cache.directory).entries] == [
+        state.path
+    ]
+
+
+def test_max_bytes(
+    cache: ResultCache, tmp_path: Path, write_result: Callable[..., None]
+) -> None:
+    """Test adding a result to a full cache evicts the oldest one."""
+    (state,) = cache.entries
+    limited = ResultCache(cache.directory, max_bytes=state.path.stat().st_size)
+    source = tmp_path / "region.zip"
+    write_result(source, "-107.6 46.4 -106.9 47.1")
+    region = limited.add(str(source), "-107.6 46.4 -106.9 47.1", ["ELEV2020"])
+    assert limited.entries == [region]
+    assert not state.path.exists()
+
+
+def test_shared_index(
+    cache: ResultCache, tmp_path: Path, write_result: Callable[..., None]
+) -> None:
+    """Test caches of several processes on one directory keep each other's entries."""
+    other = ResultCache(cache.directory)
+    source = tmp_path / "region.zip"
+    write_result(source, "-110.0 44.0 -109.0 45.0")
+    region = other.add(str(source), "-110.0 44.0 -109.0 45.0", ["ELEV2020"])
+    # Saving a stale copy of the index picks up the other entry instead of overwriting it
+    served = cache.serve(COUNTY, ["ELEV2020"], str(tmp_path / "county.zip"))
+    assert served is not None
+    assert cache.entries == [served, region]
+    assert ResultCache(cache.directory).entries == [served, region]
+    # Results evicted by one process are dropped by the others
+    assert other.prune(0) == [region]
+    cache.add(str(source), "-110.0 44.0 -109.0 45.0", ["SLPD2020"])
+    assert region not in ResultCache(cache.directory).entries
+    assert len(ResultCache(cache.directory).entries) == 2
+
+
+def add_results(directory: str, source: str, count: int) -> None:
+    """Add a result to a cache count times."""
+    cache = ResultCache(directory)
+    for _ in range(count):
+        cache.add(source, STATE, ["ELEV2020"])
+
+
+def test_concurrent_processes(cache: ResultCache, tmp_path: Path) -> None:
+    """Test no entries are lost when processes add results at the same time."""
+    source = str(cache.entries[0].path)
+    with ProcessPoolExecutor(4) as pool:
+        for future in [
+            pool.submit(add_results, str(cache.directory), source, 5) for _ in range(4)
+        ]:
+            future.result()
+    assert len(ResultCache(cache.directory).entries) == 21
+    assert len(list(cache.directory.glob("*.zip"))) == 21
+
+
+def test_prune_orphans(cache: ResultCache) -> None:
+    """Test prune() deletes zip files missing from the index and stale partial copies."""
+    (state,) = cache.entries
+    orphan = cache.directory / "orphan.zip"
+    orphan.write_bytes(b"left behind")
+    partial = cache.directory / "copy.zip.part"
+    partial.write_bytes(b"in progress")
+    stale = cache.directory / "crashed.zip.part"
+    stale.write_bytes(b"crashed")
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+    assert cache.prune(cache.size) == []
+    assert not orphan.exists() and not stale.exists()
+    assert partial.exists() and state.path.exists()
+
+
+def test_file_lock(tmp_path: Path) -> None:
+    """Test held locks time out and stale lock files are taken over."""
+    index = tmp_path / RESULTS_INDEX
+    lock = tmp_path / f"{RESULTS_INDEX}.lock"
+    with _cache._file_lock(index):
+        assert lock.exists()
+        with pytest.raises(RuntimeError, match="Timed out"):
+            with _cache._file_lock(index, timeout=0.05):
+                pass
+    assert not lock.exists()
+
+    lock.touch()
+    stale = time.time() - _cache.LOCK_STALE_AFTER - 1
+    os.utime(lock, (stale, stale))
+    with _cache._file_lock(index, timeout=0.05):
+        pass
+    assert not lock.exists()
@@ -0,0 +1,210 @@
+"""Pre-flight validation tests."""
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from landfire.task import (
+    TaskSchema,
+    get_task_schema,
+    validate_params,
+    validate_requests,
+)
+from tests.conftest import StandInService
+
+
+TASK_DESCRIPTION: Dict[str, Any] = {
+    "name": "LandfireProductService",
+    "parameters": [
+        {"name": "Area_Of_Interest", "dataType": "GPString"},
+        {"name": "Layer_List", "choiceList": ["ELEV2020", "SLPD2020"]},
+        {"name": "Output_Projection", "choiceList": ["4326", "5070"]},
+        {
+            "name": "Resample_Resolution",
+            "filter": {"type": "range", "minValue": 30, "maxValue": 9999},
+        },
+    ],
+}
+
+VALID_PARAMS = {
+    "Area_Of_Interest": "-107.70894965 46.56799094 -106.02718124 47.34869094",
+    "Output_Projection": None,
+    "Layer_List": "ELEV2020;SLPD2020",
+    "f": "JSON",
+}
+
+
+@pytest.fixture
+def schema() -> TaskSchema:
+    """Schema fixture built from TASK_DESCRIPTION."""
+    return TaskSchema.from_task(TASK_DESCRIPTION)
+
+
+def test_schema_from_task(schema: TaskSchema) -> None:
+    """Test TaskSchema.from_task() reads choice lists and the resampling domain."""
+    assert schema.layers == frozenset({"ELEV2020", "SLPD2020"})
+    assert schema.output_projections == frozenset({"4326", "5070"})
+    assert schema.resample_range == (30, 9999)
+
+
+def test_schema_from_task_defaults() -> None:
+    """Test TaskSchema.from_task() tolerates missing constraints."""
+    schema = TaskSchema.from_task({"parameters": []})
+    assert schema.layers is None
+    assert schema.output_projections is None
+    assert schema.resample_range == (30, 9999)
+
+
+def test_schema_json_roundtrip(schema: TaskSchema) -> None:
+    """Test TaskSchema survives JSON serialization."""
+    assert TaskSchema(**schema.to_json()) == schema
+
+
+def test_validate_params_valid(schema: TaskSchema) -> None:
+    """Test valid parameters produce no errors."""
+    assert validate_params(VALID_PARAMS, schema) == []
+    assert validate_params({**VALID_PARAMS, "Area_Of_Interest": "12"}, schema) == []
+
+
+@pytest.mark.parametrize(
+    "update,error",
+    [
+        (
+            {"Area_Of_Interest": "a b c d"},
+            "Area_Of_Interest `a b c d` must be four numbers `min_x min_y max_x max_y`.",
+        ),
+        (
+            {"Area_Of_Interest": "-106 46 -107 47"},
+            "Area_Of_Interest `-106 46 -107 47` minimum coordinates must be less than maximum coordinates.",
+        ),
+        (
+            {"Area_Of_Interest": "-200 46 -107 47"},
+            "Area_Of_Interest `-200 46 -107 47` longitudes must be within -180 and 180.",
+        ),
+        (
+            {"Area_Of_Interest": "-108 -95 -107 47"},
+            "Area_Of_Interest `-108 -95 -107 47` latitudes must be within -90 and 90.",
+        ),
+        ({"Layer_List": ""}, "Layer_List must contain at least one layer."),
+        (
+            {"Layer_List": "ELEV2020;BAD"},
+            "Layer_List contains layers not offered by the service: BAD.",
+        ),
+        (
+            {"Output_Projection": "3857"},
+            "Output_Projection `3857` is not offered by the service.",
+        ),
+        (
+            {"Resample_Resolution": 10000},
+            "Resample_Resolution `10000` must be between 30 and 9999 meters.",
+        ),
+        (
+            {"Resample_Resolution": "thirty"},
+            "Resample_Resolution `thirty` must be between 30 and 9999 meters.",
+        ),
+    ],
+)
+def test_validate_params_invalid(
+    schema: TaskSchema, update: Dict[str, Any], error: str
+) -> None:
+    """Test invalid parameters are reported."""
+    assert validate_params({**VALID_PARAMS, **update}, schema) == [error]
+
+
+def test_get_task_schema_cached(
+    stand_in_service: StandInService, tmp_path: Path
+) -> None:
+    """Test get_task_schema() fetches once and then serves from memory and disk."""
+    stand_in_service.document = TASK_DESCRIPTION
+    first = get_task_schema(stand_in_service.url, cache_dir=str(tmp_path))
+    second = get_task_schema(stand_in_service.url, cache_dir=str(tmp_path))
+    assert first is second
+    assert stand_in_service.statuses == [200]
+
+
+def test_get_task_schema_revalidates(
+    stand_in_service: StandInService, tmp_path: Path
+) -> None:
+    """Test a stale schema is revalidated with a conditional request."""
+    stand_in_service.document = TASK_DESCRIPTION
+    first = get_task_schema(stand_in_service.url, cache_dir=str(tmp_path), ttl=0)
+    second = get_task_schema(stand_in_service.url, cache_dir=str(tmp_path), ttl=0)
+    assert first == second
+    assert stand_in_service.statuses == [200, 304]
+
+
+def test_validate_requests_normalizes() -> None:
+    """Test validate_requests() normalizes valid specs to submitJob parameters."""
+    results = validate_requests(
+        [
+            {
+                "bbox": "-107.70894965  46.56799094 -106.02718124 47.34869094",
+                "layers": "ELEV2020; SLPD2020;ELEV2020",
+            },
+            {
+                "bbox": [-107, 46.5, -106, 47],
+                "layers": ["ELEV2020"],
+                "output_crs": 4326,
+                "resample_res": 90,
+                "output_path": "out.zip",
+            },
+        ]
+    )
+    assert all(result.ok for result in results)
+    assert results[0].params == {
+        "Area_Of_Interest": "-107.70894965 46.56799094 -106.02718124 47.34869094",
+        "Output_Projection": None,
+        "Layer_List": "ELEV2020;SLPD2020",
+        "f": "JSON",
+    }
+    assert results[1].params == {
+        "Area_Of_Interest": "-107.0 46.5 -106.0 47.0",
+        "Output_Projection": "4326",
+        "Layer_List": "ELEV2020",
+        "Resample_Resolution": 90,
+        "f": "JSON",
+    }
+
+
+@pytest.mark.parametrize(
+    "update,error",
+    [
+        ({"bbox": "1 2 3"}, "must be four numbers"),
+        ({"layers": ["NOTALAYER"]}, "not available from the LANDFIRE API: NOTALAYER"),
+        ({"layers": []}, "at least one layer"),
+        ({"output_crs": "wgs84"}, "must be an integer WKID"),
+        ({"resample_res": 10}, "must be between 30 and 9999"),
+        ({"resample_res": 30.5}, "must be an integer"),
+        ({"output_path": "out.tif"}, "ends in `.zip`"),
+        ({"bogus": 1}, "Unknown request spec key `bogus`"),
+        (
+            {"bbox": "-150 61 -149 62", "layers": ["ELEV2020", "200F40_19"]},
+            "region(s) of the bounding box (AK): 200F40_19",
+        ),
+        ({"bbox": "0 40 10 50"}, "outside of the LANDFIRE regions"),
+    ],
+)
+def test_validate_requests_invalid(update: Dict[str, Any], error: str) -> None:
+    """Test validate_requests() reports errors per spec."""
+    valid = {"bbox": VALID_PARAMS["Area_Of_Interest"], "layers": ["ELEV2020"]}
+    results = validate_requests([valid, {**valid, **update}])
+    assert results[0].ok
+    assert results[1].params is None
+    assert len(results[1].errors) == 1
+    assert error in results[1].errors[0]
+
+
+def test_validate_requests_schema(schema: TaskSchema) -> None:
+    """Test validate_requests() also checks specs against a TaskSchema."""
+    results = validate_requests(
+        [
+            {"bbox": "-107 46 -106 47", "layers": ["ELEV2020"], "output_crs": "5070"},
+            {"bbox": "-107 46 -106 47", "layers": ["ASP2020"], "output_crs": "3857"},
+        ],
+        schema=schema,
+    )
+    assert results[0].ok
+    assert results[1].errors == (
+        "Layer_List contains layers not available from the LANDFIRE API: ASP2020.",
+        "Output_Projection `3857` is not offered by the service.",
+    )
@@ -0,0 +1,172 @@
+"""Tile-grid cache tests."""
+import zipfile
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import numpy
+import pytest
+
+from landfire import Landfire
+from landfire.batch import BatchResult
+from landfire.tiles import GRID_CRS, TileCache, _rectangles
+
+
+AOI = "-107.60 46.60 -107.55 46.63"
+SHIFTED = "-107.58 46.61 -107.53 46.64"
+INSIDE = "-107.59 46.61 -107.56 46.62"
+
+
+def test_rectangles() -> None:
+    """Test missing tiles are merged into few rectangles."""
+    # Full 3x2 block
+    block = [(col, row) for row in (0, 1) for col in (0, 1, 2)]
+    assert _rectangles(block) == [(0, 0, 2, 1)]
+    # L shape: a row of three and a single tile above its first column
+    assert _rectangles([(0, 0), (1, 0), (2, 0), (0, 1)]) == [(0, 0, 2, 0), (0, 1, 0, 1)]
+    # Gaps in a row and between rows
+    assert _rectangles([(0, 0), (2, 0), (0, 2)]) == [
+        (0, 0, 0, 0),
+        (2, 0, 2, 0),
+        (0, 2, 0, 2),
+    ]
+    assert _rectangles([]) == []
+
+
+def test_tiles() -> None:
+    """Test tiles cover the bounding box on the grid."""
+    pytest.importorskip("rasterio")
+    tiles = TileCache(tile_size=3000)
+    covered = tiles.tiles(AOI)
+    cols = sorted({col for col, _ in covered})
+    rows = sorted({row for _, row in covered})
+    assert len(covered) == len(cols) * len(rows) > 1
+    min_x, min_y, max_x, max_y = tiles.bounds((cols[0], rows[0], cols[-1], rows[-1]))
+    assert (min_x - 15) % 3000 == 0 and (max_y - 15) % 3000 == 0
+
+
+def write_grid_result(path: Path, bbox: str, layers: List[str]) -> None:
+    """Write a zip file with a GeoTIFF on the LANDFIRE grid covering bbox.
+
+    The first band holds the grid column of each pixel, further bands the grid row (y / 30, increasing northward).
+    """
+    rasterio = pytest.importorskip("rasterio")
+    from rasterio.warp import transform_bounds
+
+    from landfire.bbox import BBox
+    from landfire.tiles import _snap
+
+    min_x, min_y, max_x, max_y = _snap(
+        transform_bounds("EPSG:4326", GRID_CRS, *BBox.parse(bbox).bounds), 30
+    )
+    width, height = round((max_x - min_x) / 30), round((max_y - min_y) / 30)
+    cols = numpy.arange(width) + round((min_x - 15) / 30)
+    rows = round((max_y - 15) / 30) - numpy.arange(height)
+    data = [numpy.tile(cols, (height, 1)), numpy.tile(rows[:, None], (1, width))]
+    tif = path.with_suffix(".tif")
+    with rasterio.open(
+        tif,
+        "w",
+        driver="GTiff",
+        width=width,
+        height=height,
+        count=len(layers),
+        dtype="int32",
+        crs=GRID_CRS,
+        transform=rasterio.Affine(30, 0, min_x, 0, -30, max_y),
+    ) as dst:
+        for band in range(len(layers)):
+            dst.write(data[min(band, 1)].astype("int32"), band + 1)
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.write(tif, "result.tif")
+    tif.unlink()
+
+
+@pytest.fixture
+def jobs(monkeypatch: pytest.MonkeyPatch) -> List[Any]:
+    """Replace request_many() with a fake writing grid results, recording specs."""
+    requested: List[Any] = []
+
+    def fake_request_many(
+        specs: Any, output_dir: str, **kwargs: Any
+    ) -> Iterator[BatchResult]:
+        for index, (bbox, layers, _, _) in enumerate(specs):
+            requested.append((bbox, layers))
+            path = Path(output_dir) / f"landfire_{index}.zip"
+            write_grid_result(path, bbox, layers)
+            yield BatchResult(index, None, path, f"j{index}", None, 1.0)
+
+    monkeypatch.setattr("landfire.tiles.request_many", fake_request_many)
+    return requested
+
+
+def test_request(jobs: List[Any], tmp_path: Path) -> None:
+    """Test only missing tiles are fetched and areas are assembled on the grid."""
+    rasterio = pytest.importorskip("rasterio")
+    tiles = TileCache(tmp_path / "tiles", tile_size=3000)
+    layers = ["ELEV2020", "SLPD2020"]
+
+    first = tiles.request(AOI, layers, str(tmp_path / "aoi.zip"))
+    assert first.cached == 0 and first.jobs == 1 and len(jobs) == 1
+
+    shifted = tiles.request(SHIFTED, layers, str(tmp_path / "shifted.zip"))
+    assert 0 < shifted.cached < shifted.tiles
+    assert 0 < shifted.hit_rate < 1
+
+    inside = tiles.request(INSIDE, layers, str(tmp_path / "inside.zip"))
+    assert inside.hit_rate == 1.0 and inside.jobs == 0
+    assert len(jobs) == 1 + shifted.jobs
+
+    output = tmp_path / "shifted.zip"
+    with rasterio.open(f"/vsizip/{output}/shifted.tif") as src:
+        assert src.count == 2 and src.descriptions == tuple(layers)
+        assert (src.bounds.left - 15) % 30 == 0 and (src.bounds.top - 15) % 30 == 0
+        col = round((src.bounds.left - 15) / 30)
+        row = round((src.bounds.top - 15) / 30)
+        band_cols, band_rows = src.read(1), src.read(2)
+        assert (band_cols == col + numpy.arange(src.width)).all()
+        assert (band_rows == row - numpy.arange(src.height)[:, None]).all()
+
+
+def test_request_missing_layers(jobs: List[Any], tmp_path: Path) -> None:
+    """Test only the missing layers of cached tiles are fetched."""
+    rasterio = pytest.importorskip("rasterio")
+    tiles = TileCache(tmp_path / "tiles", tile_size=3000)
+    tiles.request(AOI, ["ELEV2020"], str(tmp_path / "elev.zip"))
+    covered = tiles.tiles(AOI)
+    assert tiles.missing(covered, ["ELEV2020", "SLPD2020"]) == {("SLPD2020",): covered}
+
+    both = tiles.request(AOI, ["ELEV2020", "SLPD2020"], str(tmp_path / "aoi.zip"))
+    assert both.cached == 0 and both.jobs == 1
+    assert [layers for _, layers in jobs] == [["ELEV2020"], ["SLPD2020"]]
+    assert tiles.missing(covered, ["ELEV2020", "SLPD2020"]) == {}
+
+    output = tmp_path / "aoi.zip"
+    with rasterio.open(f"/vsizip/{output}/aoi.tif") as src:
+        assert src.count == 2
+        col = round((src.bounds.left - 15) / 30)
+        assert (src.read(1) == col + numpy.arange(src.width)).all()
+
+
+def test_request_outside_conus(tmp_path: Path) -> None:
+    """Test tile-grid requests are limited to CONUS bounding boxes and grid compatible resolutions."""
+    tiles = TileCache(tmp_path / "tiles", tile_size=3000)
+    with pytest.raises(RuntimeError, match="only available within CONUS"):
+        tiles.request("-150.0 61.0 -149.9 61.1", ["ELEV2020"], str(tmp_path / "a.zip"))
+    with pytest.raises(RuntimeError, match="Unable to request tiles"):
+        tiles.request("10", ["ELEV2020"], str(tmp_path / "a.zip"))
+    with pytest.raises(RuntimeError, match="must divide the tile size"):
+        tiles.request(AOI, ["ELEV2020"], str(tmp_path / "a.zip"), resample_res=70)
+
+
+def test_landfire_tiles(jobs: List[Any], tmp_path: Path) -> None:
+    """Test Landfire requests in tile-grid mode."""
+    pytest.importorskip("rasterio")
+    tiles = TileCache(tmp_path / "tiles", tile_size=3000)
+    Landfire(bbox=AOI).request_data(
+        ["ELEV2020"], str(tmp_path / "aoi.zip"), show_status=False, tiles=tiles
+    )
+    assert (tmp_path / "aoi.zip").exists() and len(jobs) == 1
+    with pytest.raises(RuntimeError, match="native LANDFIRE projection"):
+        Landfire(bbox=AOI, output_crs="4326").request_data(
+            ["ELEV2020"], str(tmp_path / "aoi.zip"), tiles=tiles
+        )